@@ -0,0 +1,102 @@
+"""Amounts in words for rupees and paisa, Indian numbering.
+
+    amount_in_words(150000.5)  -> "One lakh, fifty thousand rupees and fifty paisa"
+    amount_in_words(1001)      -> "One thousand and one rupees"
+
+Wording follows the en_IN style the templates used from num2words:
+crore/lakh/thousand groups separated by commas and "and" before a final
+part below one hundred. Words for 0-999 are built once at import, and
+conversions are memoized, so payroll runs that repeat the same totals
+pay for each distinct amount only once.
+"""
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Iterable, List
+
+_ONES = [
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+    "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen",
+    "seventeen", "eighteen", "nineteen",
+]
+_TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+
+# (size, name) from largest; counts of crore may themselves be large
+_GROUPS = ((10 ** 7, "crore"), (10 ** 5, "lakh"), (1000, "thousand"))
+
+
+def _below_thousand(n: int) -> str:
+    if n < 20:
+        return _ONES[n]
+    if n < 100:
+        tens, ones = divmod(n, 10)
+        return _TENS[tens] + (f"-{_ONES[ones]}" if ones else "")
+    hundreds, rest = divmod(n, 100)
+    text = f"{_ONES[hundreds]} hundred"
+    return f"{text} and {_below_thousand(rest)}" if rest else text
+
+
+_SMALL = [_below_thousand(n) for n in range(1000)]
+
+
+@lru_cache(maxsize=65536)
+def number_to_words(n: int) -> str:
+    """Lower-case words for a non-negative integer ("twelve lakh, thirty-four thousand")."""
+    if n < 0:
+        raise ValueError("number_to_words expects a non-negative integer")
+    if n < 1000:
+        return _SMALL[n]
+
+    parts = []
+    for size, name in _GROUPS:
+        count, n = divmod(n, size)
+        if count:
+            parts.append(f"{number_to_words(count)} {name}")
+            if n < 100:
+                break
+    text = ", ".join(parts)
+    if n:
+        text += (" and " if n < 100 else ", ") + _SMALL[n]
+    return text
+
+
+def _to_paisa(amount: float) -> int:
+    try:
+        value = Decimal(str(amount)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        raise ValueError(f"Cannot convert {amount!r} to words")
+    if not value.is_finite():
+        raise ValueError(f"Cannot convert {amount!r} to words")
+    return int(value * 100)
+
+
+@lru_cache(maxsize=65536)
+def _paisa_in_words(total_paisa: int, rupees: str, paisa: str) -> str:
+    sign = "minus " if total_paisa < 0 else ""
+    whole, fraction = divmod(abs(total_paisa), 100)
+    if whole == 1 and rupees.lower() == "rupees":
+        rupees = rupees[:-1]
+    if whole and fraction:
+        text = f"{number_to_words(whole)} {rupees} and {number_to_words(fraction)} {paisa}"
+    elif fraction:
+        text = f"{number_to_words(fraction)} {paisa}"
+    else:
+        text = f"{number_to_words(whole)} {rupees}"
+    text = sign + text
+    return text[0].upper() + text[1:]
+
+
+def amount_in_words(amount: float, rupees: str = "rupees", paisa: str = "paisa") -> str:
+    """Capitalized words for an amount, rounded half-up to the nearest paisa."""
+    return _paisa_in_words(_to_paisa(amount), rupees, paisa)
+
+
+def amounts_in_words(amounts: Iterable[float], rupees: str = "rupees", paisa: str = "paisa") -> List[str]:
+    """Convert many amounts at once; repeated amounts are converted only once."""
+    converted = {}
+    results = []
+    for amount in amounts:
+        total_paisa = _to_paisa(amount)
+        if total_paisa not in converted:
+            converted[total_paisa] = _paisa_in_words(total_paisa, rupees, paisa)
+        results.append(converted[total_paisa])
+    return results
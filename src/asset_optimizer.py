@@ -0,0 +1,237 @@
+"""Print-ready derivatives of letterheads, signatures and stamps.
+
+Every generated PDF embeds the letterhead and, when chosen, a signature
+and a stamp, so their encoded size is paid once per document. Derivatives
+are built once per version of a source file and kept under
+``generated_docs/.asset_cache``; a source whose mtime or size changes gets
+a new derivative on next use.
+
+    letterheads   resampled to at most LETTERHEAD_DPI across an A4 page and
+                  re-encoded as optimized JPEG; the source is kept when that
+                  would not make it smaller
+    overlays      signatures and stamps: fully transparent borders trimmed,
+                  alpha dropped when every pixel is opaque, colours reduced
+                  to a palette (per-colour transparency is kept); the
+                  source is kept when that would not make it smaller
+
+Images with an embedded ICC profile are converted to sRGB and saved
+without one, so no profile is embedded in every document.
+
+Build every derivative ahead of time and report the savings:
+
+    python src/asset_optimizer.py
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageCms
+
+from output_writer import write_atomic
+
+ROOT_DIR = Path(__file__).parent.parent
+ASSETS_DIR = ROOT_DIR / "assets"
+DEFAULT_CACHE_DIR = ROOT_DIR / "generated_docs" / ".asset_cache"
+
+# Bump when derivatives would come out differently for the same settings
+OPTIMIZER_VERSION = 3
+
+A4_MM = (210, 297)
+LETTERHEAD_DPI = 150
+JPEG_QUALITY = 80
+OVERLAY_COLORS = 256
+
+
+class Derivative(NamedTuple):
+    """An optimized image file and the part of its source it holds.
+
+    ``size`` and ``box`` are None when ``path`` is the source file itself.
+    """
+    path: str
+    size: Optional[Tuple[int, int]]  # source size in pixels
+    box: Optional[Tuple[int, int, int, int]]  # (left, top, right, bottom) of the source kept in ``path``
+
+
+def _unchanged(path: str) -> Derivative:
+    return Derivative(path, None, None)
+
+
+_SRGB = ImageCms.createProfile("sRGB")
+
+
+def _to_srgb(img: Image.Image) -> Image.Image:
+    """Convert an image carrying an ICC profile to plain sRGB (RGB or RGBA)."""
+    icc_profile = img.info.get("icc_profile")
+    mode = "RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB"
+    img = img.convert(mode)
+    if not icc_profile:
+        return img
+    try:
+        source_profile = ImageCms.ImageCmsProfile(BytesIO(icc_profile))
+        return ImageCms.profileToProfile(img, source_profile, _SRGB, outputMode=mode)
+    except (ImageCms.PyCMSError, OSError, ValueError) as e:
+        # An unreadable profile is dropped; the pixels are used as they are
+        print(f"Ignoring ICC profile: {e}")
+        return img
+
+
+class AssetOptimizer:
+    """Builds and caches optimized copies of the images placed on documents."""
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        letterhead_dpi: int = LETTERHEAD_DPI,
+        jpeg_quality: int = JPEG_QUALITY,
+        overlay_colors: int = OVERLAY_COLORS
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.letterhead_dpi = letterhead_dpi
+        self.jpeg_quality = jpeg_quality
+        self.overlay_colors = overlay_colors
+        self._entries: Dict[Tuple, Derivative] = {}
+        self._lock = threading.Lock()
+
+    def letterhead(self, path: str) -> str:
+        """Path of the file to draw as a full-page A4 letterhead."""
+        return self._derive("letterhead", path).path
+
+    def overlay(self, path: str) -> Derivative:
+        """Trimmed, palette-reduced copy of a signature or stamp."""
+        return self._derive("overlay", path)
+
+    def _derive(self, kind: str, path: str) -> Derivative:
+        source = os.path.abspath(path)
+        stat = os.stat(source)
+        key = (kind, source, stat.st_mtime_ns, stat.st_size)
+        derivative = self._entries.get(key)
+        if derivative is not None:
+            return derivative
+
+        with self._lock:
+            derivative = self._entries.get(key)
+            if derivative is None:
+                try:
+                    derivative = self._load_or_build(kind, path, key)
+                except Exception as e:
+                    print(f"Error optimizing {path}: {e}")
+                    derivative = _unchanged(path)
+                self._entries[key] = derivative
+        return derivative
+
+    def _load_or_build(self, kind: str, path: str, key: Tuple) -> Derivative:
+        settings = (self.letterhead_dpi, self.jpeg_quality) if kind == "letterhead" else (self.overlay_colors,)
+        digest = hashlib.sha256(repr(key + settings + (OPTIMIZER_VERSION,)).encode("utf-8")).hexdigest()[:32]
+        manifest_path = self.cache_dir / f"{digest}.json"
+
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            derivative = self._from_manifest(path, manifest)
+            if os.path.exists(derivative.path):
+                return derivative
+        except (OSError, ValueError, KeyError):
+            pass
+
+        data, suffix, size, box = self._build_letterhead(path) if kind == "letterhead" else self._build_overlay(path)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        file_name = None
+        if data is not None:
+            file_name = f"{digest}{suffix}"
+            write_atomic(self.cache_dir / file_name, data)
+        manifest = {"file": file_name, "size": size and list(size), "box": box and list(box)}
+        # The manifest is written last, so its presence means the derivative is complete
+        write_atomic(manifest_path, json.dumps(manifest).encode("utf-8"))
+        return self._from_manifest(path, manifest)
+
+    def _from_manifest(self, path: str, manifest: Dict) -> Derivative:
+        if manifest["file"] is None:
+            return _unchanged(path)
+        size = tuple(manifest["size"]) if manifest["size"] else None
+        box = tuple(manifest["box"]) if manifest["box"] else None
+        return Derivative(str(self.cache_dir / manifest["file"]), size, box)
+
+    def _build_letterhead(self, path: str):
+        with Image.open(path) as img:
+            size = img.size
+            # Letterheads are stretched over the whole page; never upsample either axis
+            target = tuple(
+                min(pixels, round(mm / 25.4 * self.letterhead_dpi)) for pixels, mm in zip(size, A4_MM)
+            )
+            has_profile = bool(img.info.get("icc_profile"))
+            if has_profile:
+                img = _to_srgb(img)
+            if img.mode in ("RGBA", "LA", "P", "PA"):
+                rgba = img.convert("RGBA")
+                img = Image.new("RGB", size, "white")
+                img.paste(rgba, mask=rgba.getchannel("A"))
+            elif img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            if target != size:
+                img = img.resize(target, Image.LANCZOS)
+            buffer = BytesIO()
+            img.save(buffer, "JPEG", quality=self.jpeg_quality, optimize=True, dpi=(self.letterhead_dpi,) * 2)
+
+        data = buffer.getvalue()
+        # A profiled source is never kept, even when the JPEG is no smaller
+        if target == size and not has_profile and len(data) >= os.path.getsize(path):
+            return None, None, None, None
+        return data, ".jpg", None, None
+
+    def _build_overlay(self, path: str):
+        with Image.open(path) as source:
+            has_profile = bool(source.info.get("icc_profile"))
+            img = _to_srgb(source).convert("RGBA")
+        size = img.size
+        alpha = img.getchannel("A")
+        # A fully transparent image has no bbox; keep it whole
+        box = alpha.getbbox() or (0, 0) + size
+        if box != (0, 0) + size:
+            img = img.crop(box)
+        if alpha.getextrema()[0] == 255:
+            img = img.convert("RGB")
+        if self.overlay_colors:
+            img = img.quantize(self.overlay_colors, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+        buffer = BytesIO()
+        img.save(buffer, "PNG", optimize=True)
+
+        data = buffer.getvalue()
+        # As for letterheads, a profiled source is never kept
+        if not has_profile and len(data) >= os.path.getsize(path):
+            return None, None, None, None
+        return data, ".png", size, box
+
+
+# Shared by every PDFGenerator in the process
+shared_asset_optimizer = AssetOptimizer()
+
+
+def optimize_all(assets_dir: Path = ASSETS_DIR, optimizer: AssetOptimizer = shared_asset_optimizer) -> None:
+    """Build derivatives for every letterhead, signature and stamp and print the size change."""
+    kinds = (("letterheads", optimizer.letterhead), ("signatures", optimizer.overlay), ("stamps", optimizer.overlay))
+    for folder, derive in kinds:
+        for path in sorted((assets_dir / folder).glob("*")):
+            if path.suffix.lower() not in (".jpg", ".jpeg", ".png"):
+                continue
+            result = derive(str(path))
+            optimized = result if isinstance(result, str) else result.path
+            before = path.stat().st_size / 1024
+            after = os.path.getsize(optimized) / 1024
+            print(f"{folder}/{path.name}: {before:.1f} KB -> {after:.1f} KB")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Prebuild optimized letterheads, signatures and stamps.")
+    parser.add_argument("--assets", default=str(ASSETS_DIR), help="Assets directory to scan")
+    args = parser.parse_args(argv)
+    optimize_all(Path(args.assets))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""Headless batch generation from a JSONL or CSV manifest.
+
+Each manifest row names a company, a document type and the field data for
+that type. Rows are fanned out across a pool of worker processes, each with
+its own DocumentManager, and every result or failure is appended to a JSONL
+report as soon as it finishes.
+
+    python src/batch.py manifest.jsonl --report report.jsonl --workers 4
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+from document_manager import OUTPUT_DIR, DocumentManager
+from instrumentation import Recorder
+from render_cache import RenderCache
+
+# CSV cells for these fields hold JSON lists rather than plain text
+JSON_COLUMNS = ("line_items", "Earnings", "Deductions")
+
+_manager: Optional[DocumentManager] = None
+
+
+def _init_worker(
+    signature_path: Optional[str],
+    stamp_path: Optional[str],
+    use_cache: bool = True,
+    timings: bool = False,
+    output_dir: Path = OUTPUT_DIR
+) -> None:
+    """Create the per-process DocumentManager used by every row in this worker."""
+    global _manager
+    if timings:
+        _manager = DocumentManager(use_render_cache=use_cache, recorder=Recorder(), output_dir=output_dir)
+    else:
+        _manager = DocumentManager(use_render_cache=use_cache, output_dir=output_dir)
+    _manager.signature_path = signature_path
+    _manager.stamp_path = stamp_path
+
+
+def _generate_row(row_no: int, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Render a single manifest row and describe the outcome."""
+    started = time.perf_counter()
+    result = {"row": row_no, "company": row.get("company"), "doc_type": row.get("doc_type")}
+    try:
+        path = _manager.generate_document(
+            company=row["company"],
+            doc_type=row["doc_type"],
+            data=row["data"]
+        )
+        result.update(status="ok", path=path)
+    except Exception as e:
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - started, 4)
+    if _manager.recorder.enabled and _manager.recorder.records:
+        result["timings"] = _manager.recorder.records.pop()
+    return result
+
+
+def _normalize_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Split a manifest record into company, doc_type and template data."""
+    raw = dict(raw)
+    company = raw.pop("company", None)
+    doc_type = raw.pop("doc_type", None)
+    if not company or not doc_type:
+        raise ValueError("Row must provide both 'company' and 'doc_type'")
+
+    data = raw.pop("data", None)
+    if data is None:
+        data = raw
+    elif not isinstance(data, dict):
+        raise ValueError("'data' must be an object")
+    else:
+        data = dict(data)
+        data.update(raw)  # top-level extras such as line_items
+    return {"company": company, "doc_type": doc_type, "data": data}
+
+
+def _parse_csv_row(raw: Dict[str, str]) -> Dict[str, Any]:
+    row = {}
+    for key, value in raw.items():
+        if key is None:
+            raise ValueError("Row has more cells than the header")
+        value = (value or "").strip()
+        if key in JSON_COLUMNS or key == "data":
+            row[key] = json.loads(value) if value else []
+        else:
+            row[key] = value
+    return row
+
+
+def read_manifest(path: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (row number, normalized row or exception) for every manifest record."""
+    if Path(path).suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row_no, raw in enumerate(csv.DictReader(f), 1):
+                try:
+                    yield row_no, _normalize_row(_parse_csv_row(raw))
+                except (ValueError, json.JSONDecodeError) as e:
+                    yield row_no, e
+        return
+
+    with open(path, encoding="utf-8-sig") as f:
+        row_no = 0
+        for line in f:
+            if not line.strip():
+                continue
+            row_no += 1
+            try:
+                raw = json.loads(line)
+                if not isinstance(raw, dict):
+                    raise ValueError("Each line must be a JSON object")
+                yield row_no, _normalize_row(raw)
+            except (ValueError, json.JSONDecodeError) as e:
+                yield row_no, e
+
+
+def run_batch(
+    manifest_path: str,
+    report_path: str,
+    workers: Optional[int] = None,
+    signature_path: Optional[str] = None,
+    stamp_path: Optional[str] = None,
+    use_cache: bool = True,
+    recorder: Optional[Recorder] = None,
+    output_dir: Path = OUTPUT_DIR
+) -> Dict[str, int]:
+    """Generate every manifest row in a process pool, streaming results to the report.
+
+    When a recorder is given, each row's per-phase timings are added to its
+    report line and merged into the recorder.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 4  # keeps memory flat for very large manifests
+    counts = {"ok": 0, "error": 0}
+
+    with open(report_path, "w", encoding="utf-8") as report, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(signature_path, stamp_path, use_cache, recorder is not None, output_dir)
+    ) as pool:
+
+        def record(result: Dict[str, Any]) -> None:
+            counts[result["status"]] += 1
+            if recorder is not None and "timings" in result:
+                recorder.add(result["timings"])
+            report.write(json.dumps(result) + "\n")
+            report.flush()
+
+        pending = set()
+        for row_no, row in read_manifest(manifest_path):
+            if isinstance(row, Exception):
+                record({"row": row_no, "status": "error", "error": f"Invalid manifest row: {row}"})
+                continue
+            pending.add(pool.submit(_generate_row, row_no, row))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(future.result())
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record(future.result())
+
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate documents in bulk from a JSONL or CSV manifest.")
+    parser.add_argument("manifest", help="Path to a .jsonl or .csv manifest")
+    parser.add_argument("--report", default="batch_report.jsonl", help="JSONL file receiving one line per row")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--signature", default=None, help="Signature image added to every document")
+    parser.add_argument("--stamp", default=None, help="Stamp image added to every document")
+    parser.add_argument("--output-dir", default=str(OUTPUT_DIR), help="Directory receiving the documents")
+    parser.add_argument("--no-cache", action="store_true", help="Re-render every row instead of reusing cached PDFs")
+    parser.add_argument("--timings", default=None, help="Record per-phase timings to this JSONL file and print a summary")
+    args = parser.parse_args(argv)
+
+    recorder = Recorder() if args.timings else None
+    started = time.perf_counter()
+    output_dir = Path(args.output_dir)
+    counts = run_batch(
+        args.manifest, args.report, args.workers, args.signature, args.stamp, not args.no_cache, recorder, output_dir
+    )
+    if not args.no_cache:
+        RenderCache(output_dir / ".render_cache").prune()
+    elapsed = time.perf_counter() - started
+    print(f"Generated {counts['ok']} document(s), {counts['error']} failure(s) "
+          f"in {elapsed:.1f}s. Report: {args.report}")
+    if recorder is not None:
+        recorder.write_jsonl(args.timings)
+        print(recorder.format_table())
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Apply a saved signature/stamp placement preset to many PDFs in parallel.
+
+    python src/batch_sign.py preset.json                      # every PDF in generated_docs/
+    python src/batch_sign.py preset.json "exports/*.pdf" --out-dir signed --workers 8
+
+Each worker process loads the preset images once and signs its share of
+the files with PyMuPDF. Signed copies are written atomically to the output
+directory as ``<name>_signed.pdf``; inputs from different directories that
+share a name get ``<name>_<n>_signed.pdf`` instead of overwriting each
+other. The originals are left untouched.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from signing import PresetSigner, load_preset
+
+GENERATED_DIR = Path(__file__).parent.parent / "generated_docs"
+SIGNED_SUFFIX = "_signed"
+
+_signer: Optional[PresetSigner] = None
+
+
+def _init_worker(preset_path: str) -> None:
+    global _signer
+    _signer = PresetSigner(load_preset(preset_path))
+
+
+def _sign_file(src: str, dest: str) -> Dict[str, str]:
+    try:
+        _signer.sign(src, dest)
+        return {"src": src, "status": "ok", "path": dest}
+    except Exception as e:
+        return {"src": src, "status": "error", "error": f"{type(e).__name__}: {e}"}
+
+
+def collect_inputs(patterns: List[str]) -> List[str]:
+    """Expand globs into a sorted list of PDFs, skipping copies that are already signed."""
+    paths = set()
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            if path.lower().endswith(".pdf") and not Path(path).stem.endswith(SIGNED_SUFFIX):
+                paths.add(os.path.abspath(path))
+    return sorted(paths)
+
+
+def output_paths(inputs: List[str], out_dir: str) -> Dict[str, str]:
+    """Map every input to its own signed file in ``out_dir``, numbering clashing names."""
+    taken = set()
+    outputs = {}
+    for src in inputs:
+        stem = Path(src).stem
+        name = f"{stem}{SIGNED_SUFFIX}.pdf"
+        n = 1
+        # Compared case-insensitively: a.pdf and A.pdf clash on Windows and macOS
+        while name.lower() in taken:
+            n += 1
+            name = f"{stem}_{n}{SIGNED_SUFFIX}.pdf"
+        taken.add(name.lower())
+        outputs[src] = os.path.join(out_dir, name)
+    return outputs
+
+
+def sign_all(
+    preset_path: str,
+    inputs: List[str],
+    out_dir: str,
+    workers: Optional[int] = None
+) -> Dict[str, int]:
+    """Sign every input into ``out_dir`` using a process pool."""
+    load_preset(preset_path)  # fail fast on a broken preset before starting workers
+    os.makedirs(out_dir, exist_ok=True)
+    counts = {"ok": 0, "error": 0}
+
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        initializer=_init_worker,
+        initargs=(preset_path,)
+    ) as pool:
+        futures = [pool.submit(_sign_file, src, dest) for src, dest in output_paths(inputs, out_dir).items()]
+        for future in as_completed(futures):
+            result = future.result()
+            counts[result["status"]] += 1
+            if result["status"] == "error":
+                print(f"FAILED {result['src']}: {result['error']}", file=sys.stderr)
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a signature/stamp preset to many PDFs.")
+    parser.add_argument("preset", help="Preset JSON saved from the signature tool")
+    parser.add_argument("inputs", nargs="*", help="PDF files or glob patterns (default: generated_docs/*.pdf)")
+    parser.add_argument("--out-dir", default=str(GENERATED_DIR / "signed"), help="Directory for signed copies")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    inputs = collect_inputs(args.inputs or [str(GENERATED_DIR / "*.pdf")])
+    if not inputs:
+        print("No PDFs matched.", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    counts = sign_all(args.preset, inputs, args.out_dir, args.workers)
+    print(f"Signed {counts['ok']} PDF(s), {counts['error']} failure(s) "
+          f"in {time.perf_counter() - started:.1f}s -> {args.out_dir}")
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""Rendering benchmarks for every document template.
+
+Each scenario builds synthetic but realistic field data, renders it
+``--repeat`` times through PDFGenerator (no render cache, no file output)
+and reports throughput, latency percentiles, peak RSS, output size and
+the mean time spent in each rendering phase.
+Every scenario runs in a fresh worker process so its peak RSS and import
+costs are its own.
+
+    python src/benchmark.py --repeat 20 --output bench.json
+    python src/benchmark.py --compare bench.json
+
+Results are JSON so runs from different commits can be diffed; --compare
+prints the change in docs/sec and p95 latency against an earlier run.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from fpdf import FPDF_VERSION
+
+from document_manager import DocumentManager
+from instrumentation import Recorder
+from pdf_generator import PDFGenerator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DESCRIPTIONS = [
+    "Billboard",
+    "Digital screen rotation, 10 second slot",
+    "Streamer on main boulevard",
+    "Backlit pole sign, both faces",
+    "SMD screen with prime-time loop",
+]
+LONG_DESCRIPTION = (
+    "Premium roadside billboard placement on the main arterial route, including "
+    "flex printing, mounting and weekly maintenance visits. Illumination runs from "
+    "dusk until midnight and the site is photographed on installation and removal."
+)
+
+
+def invoice_data(items: int, long_descriptions: bool = False) -> Dict[str, Any]:
+    line_items = []
+    for i in range(items):
+        description = LONG_DESCRIPTION if long_descriptions else DESCRIPTIONS[i % len(DESCRIPTIONS)]
+        line_items.append({
+            "Description": f"{description} #{i + 1}",
+            "Campaign Start Date": "2025-08-01",
+            "Campaign End Date": "2025-08-31",
+            "Size": "20x10",
+            "Duration": "1 month",
+            "Amount": f"{(i % 50 + 1) * 12500:,}.50",
+        })
+    return {
+        "M/s": "ABC Traders (Private) Limited",
+        "Campaign": "Summer Campaign 2025",
+        "Date": "2025-08-01",
+        "Invoice No": "INV-1043",
+        "Invoice Month": "August 2025",
+        "line_items": line_items,
+    }
+
+
+def sales_tax_data(items: int) -> Dict[str, Any]:
+    return {
+        "M/s.": "ABC Traders",
+        "Campaign": "Summer Campaign 2025",
+        "PO Number": "PO-7781",
+        "NTN": "1234567-8",
+        "STRN": "17-00-1234-567-89",
+        "Date": "2025-08-01",
+        "Invoice No": "STI-2231",
+        "Company NTN": "7654321-0",
+        "Company STN": "17-00-7654-321-00",
+        "GST Percentage": "15",
+        "line_items": [{
+            "Description": DESCRIPTIONS[i % len(DESCRIPTIONS)],
+            "Size": "20x10",
+            "Duration": "1 month",
+            "Start Date": "2025-08-01",
+            "End Date": "2025-08-31",
+            "Amount": str((i % 50 + 1) * 10000),
+        } for i in range(items)],
+    }
+
+
+def salary_data() -> Dict[str, Any]:
+    """A payroll slip with every earning and deduction row the template offers."""
+    schema = DocumentManager().templates["Salary Slip"]
+    return {
+        "Employee Name": "Muhammad Ali Khan",
+        "Employee No": "EMP-0042",
+        "Designation": "Senior Account Manager",
+        "Department": "Sales",
+        "CNIC": "35202-1234567-1",
+        "Month": "August 2025",
+        "Earnings": [{"Particulars": row["name"], "Amount": f"{25000 + 1500 * i:,}.75"}
+                     for i, row in enumerate(schema["earnings_inputs"])],
+        "Deductions": [{"Particulars": row["name"], "Amount": f"{800 + 350 * i:,}"}
+                       for i, row in enumerate(schema["deductions_inputs"])],
+    }
+
+
+def letter_data(paragraphs: int = 6) -> Dict[str, Any]:
+    return {
+        "Date": "2025-08-01",
+        "To": "The Branch Manager, City Bank",
+        "Subject": "Payment adjustment for the summer campaign",
+        "content": "\n".join([LONG_DESCRIPTION] * paragraphs),
+    }
+
+
+# name -> (document type, data builder)
+SCENARIOS: Dict[str, Any] = {
+    "invoice_1": ("Invoice", lambda: invoice_data(1)),
+    "invoice_10": ("Invoice", lambda: invoice_data(10)),
+    "invoice_100": ("Invoice", lambda: invoice_data(100)),
+    "invoice_1000": ("Invoice", lambda: invoice_data(1000)),
+    "invoice_long_descriptions": ("Invoice", lambda: invoice_data(25, long_descriptions=True)),
+    "sales_tax_10": ("Sales Tax Invoice", lambda: sales_tax_data(10)),
+    "sales_tax_100": ("Sales Tax Invoice", lambda: sales_tax_data(100)),
+    "salary_full": ("Salary Slip", salary_data),
+    "letter": ("Request Letter", letter_data),
+}
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(
+    name: str,
+    repeat: int,
+    company: str,
+    signature_path: Optional[str] = None,
+    stamp_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """Render one scenario ``repeat`` times after a warm-up and summarize the timings."""
+    # Every template asks for "Arial"; fpdf warns about the core-font substitution each time
+    warnings.filterwarnings("ignore", message="Substituting font")
+    doc_type, build = SCENARIOS[name]
+    manager = DocumentManager(use_render_cache=False)
+    template = manager.templates[doc_type]
+    letterhead = manager.get_letterhead_path(company)
+    data = build()
+    recorder = Recorder()
+
+    def render_once() -> Dict[str, Any]:
+        pdf_gen = PDFGenerator(recorder=recorder)
+        started = time.perf_counter()
+        pdf_bytes = pdf_gen.render(company, doc_type, template, letterhead, data, signature_path, stamp_path)
+        return {"seconds": time.perf_counter() - started, "pages": pdf_gen.pdf.page, "bytes": len(pdf_bytes)}
+
+    render_once()  # template import, font metrics and image parsing
+    recorder.records.clear()
+    runs = [render_once() for _ in range(repeat)]
+    latencies = [run["seconds"] for run in runs]
+    total = sum(latencies)
+    pages = runs[-1]["pages"]
+    return {
+        "scenario": name,
+        "doc_type": doc_type,
+        "repeat": repeat,
+        "pages": pages,
+        "output_bytes": runs[-1]["bytes"],
+        "docs_per_sec": round(repeat / total, 3),
+        "pages_per_sec": round(repeat * pages / total, 3),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "phases_mean_ms": {phase: row["mean_ms"] for phase, row in recorder.summary().items()},
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    names: List[str],
+    repeat: int,
+    company: str,
+    signature_path: Optional[str] = None,
+    stamp_path: Optional[str] = None,
+    progress: Callable[[Dict[str, Any]], None] = lambda result: None
+) -> Dict[str, Any]:
+    results = []
+    for name in names:
+        # A fresh process per scenario keeps peak RSS and warm caches independent
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(run_scenario, name, repeat, company, signature_path, stamp_path).result()
+        progress(result)
+        results.append(result)
+    return {
+        "commit": _git_commit(),
+        "fpdf": FPDF_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "company": company,
+        "results": results,
+    }
+
+
+def _format_row(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    rss = result["peak_rss_bytes"]
+    row = (f"{result['scenario']:<26} {result['pages']:>5} {result['docs_per_sec']:>9.2f} "
+           f"{result['pages_per_sec']:>9.2f} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+           f"{(rss / 2**20 if rss else 0):>8.1f} {result['output_bytes'] / 1024:>9.1f}")
+    if baseline:
+        speedup = result["docs_per_sec"] / baseline["docs_per_sec"] - 1
+        p95 = result["p95_ms"] / baseline["p95_ms"] - 1
+        row += f" {speedup:>+8.1%} {p95:>+8.1%}"
+    return row
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PDF rendering for every template.")
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed renders per scenario")
+    parser.add_argument("--company", default="GoFar Media", help="Company whose letterhead is used")
+    parser.add_argument("--signature", default=None, help="Signature image added to every document")
+    parser.add_argument("--stamp", default=None, help="Stamp image added to every document")
+    parser.add_argument("--output", default=None, help="Write the JSON results to this file")
+    parser.add_argument("--compare", default=None, help="Earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenario(s): {', '.join(unknown)}")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = {r["scenario"]: r for r in json.load(f)["results"]}
+
+    header = f"{'scenario':<26} {'pages':>5} {'docs/s':>9} {'pages/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'RSS MB':>8} {'size KB':>9}"
+    if baseline:
+        header += f" {'docs/s':>8} {'p95':>8}"
+    print(header, file=sys.stderr)
+
+    report = run_benchmarks(
+        names, args.repeat, args.company, args.signature, args.stamp,
+        progress=lambda result: print(_format_row(result, baseline.get(result["scenario"])), file=sys.stderr)
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
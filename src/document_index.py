@@ -0,0 +1,288 @@
+"""SQLite index of generated documents.
+
+Every document written by DocumentManager gets a row per record holding
+what people search by (company, type, number, party, date) plus totals,
+file path and content hash, so lookups and reports never open a PDF.
+
+    number   invoice no (employee no for salary slips)
+    party    client "M/s" (employee for salary slips, addressee for letters)
+
+The database lives next to the documents in ``generated_docs/index.sqlite3``
+and runs in WAL mode, so batch workers can write while the GUI or CLI reads.
+
+    python src/document_index.py search 1043
+    python src/document_index.py search --party "client x" --type Invoice
+    python src/document_index.py totals --by month --since 2026-01-01
+"""
+import argparse
+import re
+import sqlite3
+import sys
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dateutil import parser as date_parser
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "generated_docs" / "index.sqlite3"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    company TEXT NOT NULL,
+    doc_type TEXT NOT NULL,
+    number TEXT COLLATE NOCASE,
+    party TEXT COLLATE NOCASE,
+    doc_date TEXT,
+    date_text TEXT,
+    total REAL,
+    tax REAL,
+    path TEXT NOT NULL,
+    record INTEGER NOT NULL DEFAULT 0,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    UNIQUE (path, record)
+);
+CREATE INDEX IF NOT EXISTS documents_number ON documents (number);
+CREATE INDEX IF NOT EXISTS documents_party ON documents (party);
+CREATE INDEX IF NOT EXISTS documents_type_date ON documents (doc_type, doc_date);
+CREATE INDEX IF NOT EXISTS documents_company_created ON documents (company, created_at);
+CREATE INDEX IF NOT EXISTS documents_sha256 ON documents (sha256);
+"""
+
+GROUPINGS = {
+    "type": "doc_type",
+    "company": "company",
+    "party": "party",
+    "month": "substr(doc_date, 1, 7)",
+}
+
+
+def normalize_date(value: Any) -> Optional[str]:
+    """ISO date for "2026-10-17", "2026/10/17", "17/10/2026", "October 2026" (first of the month), else None.
+
+    Dates starting with a four-digit year are read year-month-day, as the
+    GUI writes them; other numeric dates are read day first. A date without
+    a year ("August") is None: guessing one would misfile it in searches
+    and monthly totals, and its text is still kept in ``date_text``.
+    """
+    if not value:
+        return None
+    text = str(value).strip()
+    try:
+        return date.fromisoformat(text).isoformat()
+    except ValueError:
+        pass
+    year_first = re.match(r"\d{4}\D", text) is not None
+    try:
+        # Parsed against two default years: a result that follows the default had no year of its own
+        parsed, probe = (
+            date_parser.parse(text, dayfirst=not year_first, yearfirst=year_first, default=datetime(year, 1, 1))
+            for year in (2000, 2004)
+        )
+    except (ValueError, OverflowError):
+        return None
+    if parsed.year != probe.year:
+        return None
+    return parsed.date().isoformat()
+
+
+class DocumentIndex:
+    """Records and queries document metadata; safe to share between threads."""
+
+    def __init__(self, path: Path = DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def add(
+        self,
+        company: str,
+        doc_type: str,
+        path: str,
+        sha256: str,
+        size: int,
+        summaries: Iterable[Dict[str, Any]]
+    ) -> None:
+        """Record one file; a bundle passes one summary per record."""
+        created_at = datetime.now().isoformat(timespec="seconds")
+        rows = [
+            (
+                created_at, company, doc_type,
+                _text(summary.get("number")), _text(summary.get("party")),
+                normalize_date(summary.get("date")), _text(summary.get("date")),
+                summary.get("total"), summary.get("tax"),
+                path, record, sha256, size,
+            )
+            for record, summary in enumerate(summaries)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO documents (created_at, company, doc_type, number, party, doc_date,"
+                " date_text, total, tax, path, record, sha256, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        company: Optional[str] = None,
+        doc_type: Optional[str] = None,
+        number: Optional[str] = None,
+        party: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Newest matching documents first.
+
+        ``number`` matches exactly and ``party`` by prefix (both ignore case),
+        which the indexes serve directly; ``text`` looks for a substring of
+        either. ``since``/``until`` bound the document date, inclusive.
+        """
+        where, params = _filters(company, doc_type, since, until)
+        if number:
+            where.append("number = ?")
+            params.append(number)
+        if party:
+            where.append("party LIKE ? ESCAPE '\\'")
+            params.append(_escape_like(party) + "%")
+        if text:
+            where.append("(number LIKE ? ESCAPE '\\' OR party LIKE ? ESCAPE '\\')")
+            params.extend([f"%{_escape_like(text)}%"] * 2)
+        sql = "SELECT * FROM documents"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def totals(
+        self,
+        by: str = "type",
+        company: Optional[str] = None,
+        doc_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Document count, summed totals and tax per type, company, party or month."""
+        if by not in GROUPINGS:
+            raise ValueError(f"Cannot group by {by!r}; choose one of {', '.join(GROUPINGS)}")
+        where, params = _filters(company, doc_type, since, until)
+        sql = (
+            f"SELECT {GROUPINGS[by]} AS grp, COUNT(*) AS documents,"
+            " COALESCE(SUM(total), 0) AS total, COALESCE(SUM(tax), 0) AS tax FROM documents"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " GROUP BY grp ORDER BY grp"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def find_by_hash(self, sha256: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute("SELECT * FROM documents WHERE sha256 = ?", (sha256,))]
+
+    def prune_missing(self) -> int:
+        """Forget documents whose files were deleted; returns how many rows went."""
+        with self._lock:
+            paths = [row[0] for row in self._conn.execute("SELECT DISTINCT path FROM documents")]
+            missing = [(path,) for path in paths if not Path(path).exists()]
+            with self._conn:
+                self._conn.executemany("DELETE FROM documents WHERE path = ?", missing)
+        return len(missing)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _text(value: Any) -> Optional[str]:
+    return str(value).strip() if value not in (None, "") else None
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _filters(
+    company: Optional[str],
+    doc_type: Optional[str],
+    since: Optional[str],
+    until: Optional[str]
+) -> Tuple[List[str], List[Any]]:
+    where: List[str] = []
+    params: List[Any] = []
+    for column, value in (("company", company), ("doc_type", doc_type)):
+        if value:
+            where.append(f"{column} = ?")
+            params.append(value)
+    if since:
+        where.append("doc_date >= ?")
+        params.append(normalize_date(since))
+    if until:
+        where.append("doc_date <= ?")
+        params.append(normalize_date(until))
+    return where, params
+
+
+def _format_amount(value: Optional[float]) -> str:
+    # Imported here so the CLI does not pull in the PDF stack for a lookup
+    from formatting import format_amount
+    return "" if value is None else format_amount(value)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Search and report on generated documents.")
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="Index database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="List matching documents, newest first")
+    search.add_argument("text", nargs="?", help="Substring of the document number or party")
+    search.add_argument("--number", help="Exact invoice/employee number")
+    search.add_argument("--party", help="Client, employee or addressee name prefix")
+    search.add_argument("--limit", type=int, default=50)
+
+    totals = commands.add_parser("totals", help="Counts and summed totals")
+    totals.add_argument("--by", choices=sorted(GROUPINGS), default="type")
+
+    commands.add_parser("prune", help="Remove entries whose PDF no longer exists")
+
+    for sub in (search, totals):
+        sub.add_argument("--company")
+        sub.add_argument("--type", dest="doc_type")
+        sub.add_argument("--since", help="Earliest document date")
+        sub.add_argument("--until", help="Latest document date")
+    args = parser.parse_args(argv)
+
+    index = DocumentIndex(Path(args.db))
+    if args.command == "search":
+        rows = index.search(args.text, args.company, args.doc_type, args.number, args.party,
+                            args.since, args.until, args.limit)
+        for row in rows:
+            print(f"{row['doc_date'] or row['date_text'] or '':<10}  {row['doc_type']:<18}  "
+                  f"{row['number'] or '':<12}  {row['party'] or '':<30}  {_format_amount(row['total']):>14}  {row['path']}")
+        print(f"{len(rows)} document(s)")
+    elif args.command == "totals":
+        for row in index.totals(args.by, args.company, args.doc_type, args.since, args.until):
+            print(f"{row['grp'] or '-':<30}  {row['documents']:>6}  {_format_amount(row['total']):>16}  "
+                  f"{_format_amount(row['tax']):>14}")
+    else:
+        print(f"Removed {index.prune_missing()} index entries for deleted files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
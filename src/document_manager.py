@@ -1,43 +1,47 @@
-import os
-import importlib
-import sys
+import hashlib
+import sqlite3
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Union
+from document_index import DocumentIndex
+from fonts import shared_fonts
+from instrumentation import NullRecorder, Recorder, null_recorder
+from output_writer import OutputWriter
 from pdf_generator import PDFGenerator
+from render_cache import RenderCache, file_digest
+from template_registry import TemplateRegistry
+
+OUTPUT_DIR = Path(__file__).parent.parent / "generated_docs"
+
+
+class InvalidDataError(ValueError):
+    """The request names an unknown document type or data its template rejects."""
 
 
 class DocumentManager:
     """Manages document templates and generation process."""
     
-    def __init__(self):
-        """Initialize with loaded templates."""
-        self.templates = self._load_templates()
+    def __init__(
+        self,
+        use_render_cache: bool = True,
+        recorder: Union[Recorder, NullRecorder] = null_recorder,
+        use_index: bool = True,
+        output_dir: Path = OUTPUT_DIR
+    ):
+        """Initialize with the lazily loaded template registry.
+
+        Documents, the render cache and the index all live under ``output_dir``.
+        """
+        self.recorder = recorder
+        self.templates = TemplateRegistry()
+        self.output_writer = OutputWriter(output_dir)
+        self.render_cache: Optional[RenderCache] = (
+            RenderCache(self.output_writer.output_dir / ".render_cache") if use_render_cache else None
+        )
+        self.use_index = use_index
+        self._index: Optional[DocumentIndex] = None
         self.signature_path: Optional[str] = None
         self.stamp_path: Optional[str] = None
 
-    def _load_templates(self) -> Dict[str, Dict[str, Any]]:
-        """Load all templates from the templates directory."""
-        templates = {}
-        templates_dir = Path(__file__).parent / "templates"
-
-        # Ensure current directory is in Python path
-        if str(Path(__file__).parent) not in sys.path:
-            sys.path.insert(0, str(Path(__file__).parent))
-
-        for filename in os.listdir(templates_dir):
-            if filename.endswith(".py") and filename not in ("__init__.py", "base_template.py"):
-                try:
-                    module_name = f"templates.{filename[:-3]}"
-                    module = importlib.import_module(module_name)
-                    template_class = module.get_template_class()
-                    template_data = template_class.get_template()
-                    template_data["template_class"] = template_class  # Attach the class instance
-                    templates[template_data["type"]] = template_data
-                except (ImportError, AttributeError) as e:
-                    print(f"Error loading template {filename}: {e}")
-        return templates
-
     def get_letterhead_path(self, company: str) -> Optional[str]:
         """Find the appropriate letterhead image for a company."""
         base_name = company.lower().replace(' ', '_')
@@ -49,6 +53,40 @@ class DocumentManager:
                 return str(path)
         return None
 
+    @property
+    def index(self) -> DocumentIndex:
+        """Metadata index of generated documents, opened on first use."""
+        if self._index is None:
+            self._index = DocumentIndex(self.output_writer.output_dir / "index.sqlite3")
+        return self._index
+
+    def render_document(
+        self,
+        company: str,
+        doc_type: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> bytes:
+        """Render a complete document and return the PDF bytes without writing a file."""
+        data = data or {}
+        with self.recorder.document(company=company, doc_type=doc_type):
+            template = self._get_validated_template(doc_type, [data])
+            letterhead = self._require_letterhead(company)
+
+            def render() -> bytes:
+                # Create and configure PDF generator
+                pdf_gen = PDFGenerator(recorder=self.recorder)
+                return pdf_gen.render(
+                    company=company,
+                    doc_type=doc_type,
+                    template=template,
+                    letterhead_path=letterhead,
+                    data=data,
+                    signature_path=self.signature_path,
+                    stamp_path=self.stamp_path
+                )
+
+            return self._render_cached(self._cache_key(company, doc_type, letterhead, data=data), render)
+
     def generate_document(
         self,
         company: str,
@@ -56,15 +94,93 @@ class DocumentManager:
         data: Optional[Dict[str, Any]] = None
     ) -> str:
         """Generate a complete document with the given parameters."""
+        with self.recorder.document(company=company, doc_type=doc_type):
+            pdf_bytes = self.render_document(company, doc_type, data)
+            with self.recorder.span("write"):
+                filename = self.output_writer.write_bytes(self._output_prefix(company, doc_type), pdf_bytes)
+            self._index_file(company, doc_type, [data or {}], filename, pdf_bytes)
+        return str(filename.absolute())
+
+    def render_bundle(
+        self,
+        company: str,
+        doc_type: str,
+        records: List[Dict[str, Any]]
+    ) -> bytes:
+        """Render one PDF holding a document per record, sharing a single letterhead."""
+        if not records:
+            raise ValueError("No records provided for bundle.")
+        with self.recorder.document(company=company, doc_type=doc_type, records=len(records)):
+            template = self._get_validated_template(doc_type, records)
+            letterhead = self._require_letterhead(company)
+
+            def render() -> bytes:
+                pdf_gen = PDFGenerator(recorder=self.recorder)
+                return pdf_gen.render_bundle(
+                    company=company,
+                    doc_type=doc_type,
+                    template=template,
+                    letterhead_path=letterhead,
+                    records=records,
+                    signature_path=self.signature_path,
+                    stamp_path=self.stamp_path
+                )
+
+            return self._render_cached(self._cache_key(company, doc_type, letterhead, records=records), render)
+
+    def generate_bundle(
+        self,
+        company: str,
+        doc_type: str,
+        records: List[Dict[str, Any]]
+    ) -> str:
+        """Generate one PDF file holding a document per record."""
+        with self.recorder.document(company=company, doc_type=doc_type, records=len(records)):
+            pdf_bytes = self.render_bundle(company, doc_type, records)
+            with self.recorder.span("write"):
+                filename = self.output_writer.write_bytes(self._output_prefix(company, f"{doc_type} Bundle"), pdf_bytes)
+            self._index_file(company, doc_type, records, filename, pdf_bytes)
+        return str(filename.absolute())
+
+    def _index_file(
+        self,
+        company: str,
+        doc_type: str,
+        records: List[Dict[str, Any]],
+        filename: Path,
+        pdf_bytes: bytes
+    ) -> None:
+        """Record a written file in the index; a failure here never fails generation."""
+        if not self.use_index:
+            return
+        with self.recorder.span("index"):
+            try:
+                template_class = self.templates.get(doc_type)["template_class"]
+                summaries = [template_class.summarize(data) if template_class else {} for data in records]
+                self.index.add(
+                    company, doc_type, str(filename.absolute()),
+                    hashlib.sha256(pdf_bytes).hexdigest(), len(pdf_bytes), summaries
+                )
+            except (sqlite3.Error, OSError, ValueError) as e:
+                print(f"Could not index {filename.name}: {e}")
+
+    def _get_validated_template(self, doc_type: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
         template = self.templates.get(doc_type)
         if not template:
-            raise ValueError(f"Unknown document type: {doc_type}")
-        
-        # Validate using the class
-        template_class = template.get("template_class")
-        if template_class and not template_class.validate_data(data or {}):
-            raise ValueError("Invalid data provided for template.")
+            raise InvalidDataError(f"Unknown document type: {doc_type}")
+
+        # Validate using the class; the first lookup imports the template module
+        with self.recorder.span("template_import"):
+            template_class = template["template_class"]
+        if template_class:
+            for index, data in enumerate(records):
+                if not template_class.validate_data(data):
+                    if len(records) == 1:
+                        raise InvalidDataError("Invalid data provided for template.")
+                    raise InvalidDataError(f"Invalid data provided for template in record {index + 1}.")
+        return template
 
+    def _require_letterhead(self, company: str) -> str:
         letterhead = self.get_letterhead_path(company)
         if not letterhead:
             raise FileNotFoundError(
@@ -72,24 +188,36 @@ class DocumentManager:
                 f"Please add an image to assets/letterheads/ as either: "
                 f"{company.lower().replace(' ', '_')}.jpg, .jpeg, or .png"
             )
+        return letterhead
 
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_dir = Path(__file__).parent.parent / "generated_docs"
-        output_dir.mkdir(exist_ok=True)
-        filename = output_dir / f"{company.replace(' ', '_')}_{doc_type.replace(' ', '_')}_{timestamp}.pdf"
+    def _output_prefix(self, company: str, doc_type: str) -> str:
+        # The writer appends a timestamp (and a sequence number on clashes)
+        return f"{company.replace(' ', '_')}_{doc_type.replace(' ', '_')}"
 
-        # Create and configure PDF generator
-        pdf_gen = PDFGenerator()
-        pdf_gen.generate(
+    def _cache_key(self, company: str, doc_type: str, letterhead: str, **payload: Any) -> str:
+        return RenderCache.key(
             company=company,
             doc_type=doc_type,
-            template=template,
-            letterhead_path=letterhead,
-            output_path=str(filename),
-            data=data or {},
-            signature_path=self.signature_path,
-            stamp_path=self.stamp_path
+            template=self.templates.digest(doc_type),
+            letterhead=file_digest(letterhead),
+            signature=file_digest(self.signature_path),
+            stamp=file_digest(self.stamp_path),
+            fonts=[file_digest(str(path)) for path in shared_fonts.files()],
+            **payload
         )
 
-        return str(filename.absolute())
+    def _render_cached(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """Return previously rendered bytes for identical inputs, rendering only on a miss."""
+        if self.render_cache is None:
+            return render()
+
+        with self.recorder.span("cache"):
+            pdf_bytes = self.render_cache.get(key)
+        if pdf_bytes is None:
+            self.recorder.count("cache_misses")
+            pdf_bytes = render()
+            with self.recorder.span("cache"):
+                self.render_cache.put(key, pdf_bytes)
+        else:
+            self.recorder.count("cache_hits")
+        return pdf_bytes
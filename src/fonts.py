@@ -0,0 +1,300 @@
+"""TrueType fonts for generated documents, parsed once and shared.
+
+Fonts dropped into ``assets/fonts`` (``<Family>-Regular.ttf``,
+``<Family>-Bold.ttf``, ``-Italic``, ``-BoldItalic``; a plain
+``<Family>.ttf`` counts as regular) replace the core "Arial" the templates
+ask for, so Urdu names and symbols such as "₨" can be printed. Without
+that directory documents keep using fpdf's core fonts.
+
+fpdf pays for a TrueType font twice per document: ``add_font`` parses the
+whole file, and ``output`` parses it again to embed a subset of the glyphs
+used. Both are cached here, in memory and under ``generated_docs/.font_cache``
+so that worker processes share them:
+
+    metrics   glyph widths, descriptor values and cmap, stored as JSON and
+              turned into fpdf's font entry without touching the file
+    subsets   small font files holding printable ASCII plus every character
+              of each 128-codepoint block a document used, so documents in
+              the same scripts share one; fpdf embeds from one of those
+              instead of the full font, with the same glyphs and outlines.
+              The oldest are deleted once they exceed MAX_CACHE_BYTES.
+
+Every document still gets its own descriptor object and glyph subset map,
+because fpdf fills those in while writing the PDF. The font entries mirror
+what fpdf2 2.7.4 (pinned in requirements.txt) builds in ``add_font``.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import defaultdict
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fpdf import FPDF, FPDF_VERSION
+from fpdf.enums import FontDescriptorFlags, TextEmphasis
+from fpdf.fpdf import SubsetMap
+from fpdf.output import PDFFontDescriptor
+
+from output_writer import write_atomic
+
+ROOT_DIR = Path(__file__).parent.parent
+DEFAULT_FONT_DIR = ROOT_DIR / "assets" / "fonts"
+DEFAULT_CACHE_DIR = ROOT_DIR / "generated_docs" / ".font_cache"
+
+FONT_EXTENSIONS = (".ttf", ".otf")
+STYLE_SUFFIXES = {
+    "regular": "", "bold": "B", "italic": "I", "oblique": "I",
+    "bolditalic": "BI", "boldoblique": "BI",
+}
+# Styles a family may lack are filled from the closest one it has
+STYLE_FALLBACKS = {"": ("",), "B": ("B", ""), "I": ("I", ""), "BI": ("BI", "B", "I", "")}
+# Core family names used by the templates that a TrueType family replaces
+ALIASED_FAMILIES = ("arial", "helvetica")
+# Always present in a cached subset, so plain-English documents share one file
+BASE_CODEPOINTS = frozenset(range(0x20, 0x7F))
+# Subsets cover whole blocks of this many codepoints
+BLOCK_SIZE = 0x80
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+# Tables fpdf drops when embedding; dropping them up front keeps subsets small
+DROPPED_TABLES = ["FFTM", "GDEF", "GPOS", "GSUB", "MATH", "hdmx"]
+
+
+def _split_font_name(stem: str) -> Tuple[str, str]:
+    """"DejaVuSans-Bold" -> ("DejaVuSans", "B"); "DejaVuSans" -> ("DejaVuSans", "")."""
+    family, _, suffix = stem.rpartition("-")
+    if family and suffix.lower() in STYLE_SUFFIXES:
+        return family, STYLE_SUFFIXES[suffix.lower()]
+    return stem, ""
+
+
+def _file_key(path: Path) -> Tuple[str, int, int]:
+    stat = path.stat()
+    return (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+class FontLibrary:
+    """Discovers font files and registers them with FPDF documents from cached data."""
+
+    def __init__(
+        self,
+        font_dir: Path = DEFAULT_FONT_DIR,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_cache_bytes: int = MAX_CACHE_BYTES
+    ):
+        self.font_dir = Path(font_dir)
+        self.cache_dir = Path(cache_dir)
+        self.max_cache_bytes = max_cache_bytes
+        self._families: Optional[Dict[str, Dict[str, Path]]] = None
+        self._metrics: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+        self._subsets: Dict[Tuple, Path] = {}
+        self._sources: Set[Path] = set()
+        self._lock = threading.Lock()
+
+    def families(self) -> Dict[str, Dict[str, Path]]:
+        """Family name -> {style: font file}, scanned once."""
+        if self._families is None:
+            families: Dict[str, Dict[str, Path]] = {}
+            if self.font_dir.is_dir():
+                for path in sorted(self.font_dir.iterdir()):
+                    if path.suffix.lower() in FONT_EXTENSIONS:
+                        family, style = _split_font_name(path.stem)
+                        families.setdefault(family, {}).setdefault(style, path)
+            self._families = families
+        return self._families
+
+    def text_family(self) -> Optional[str]:
+        """The family used in place of Arial: the first one with a regular face."""
+        for family, styles in self.families().items():
+            if "" in styles:
+                return family
+        return None
+
+    def files(self) -> List[Path]:
+        return [path for styles in self.families().values() for path in styles.values()]
+
+    def resolve_style(self, family: str, style: str) -> str:
+        """The style of ``family`` drawn for ``style``: itself, or the closest one the family has."""
+        styles = self.families()[family]
+        return next(s for s in STYLE_FALLBACKS[style] if s in styles)
+
+    def register(self, pdf: FPDF, family: str, style: str = "") -> None:
+        """Add one style of ``family`` to ``pdf``, as ``pdf.add_font`` would.
+
+        ``style`` must be one the family has (see ``resolve_style``).
+        """
+        fontkey = f"{family.lower()}{style}"
+        if fontkey in pdf.fonts:
+            return
+        path = self.families()[family][style]
+        metrics = self._load_metrics(path)
+
+        # desc and subset are per document because output fills them in
+        desc = dict(metrics["desc"])
+        desc["flags"] = FontDescriptorFlags(desc["flags"])
+        sbarr = "\x00 "
+        if pdf.str_alias_nb_pages:
+            sbarr += "0123456789" + pdf.str_alias_nb_pages
+        pdf.fonts[fontkey] = {
+            "i": len(pdf.fonts) + 1,
+            "type": "TTF",
+            "name": metrics["name"],
+            "desc": PDFFontDescriptor(**desc),
+            "up": metrics["up"],
+            "ut": metrics["ut"],
+            "cw": metrics["cw"],
+            "ttffile": path,
+            "fontkey": fontkey,
+            "emphasis": TextEmphasis.coerce(style),
+            "subset": SubsetMap(map(ord, sbarr)),
+            "cmap": metrics["cmap"],
+        }
+
+    def prepare_output(self, pdf: FPDF) -> None:
+        """Point each registered font at a cached subset covering the characters ``pdf`` used."""
+        for font in pdf.fonts.values():
+            if font["type"] != "TTF" or font["ttffile"] not in self._sources:
+                continue
+            try:
+                blocks = {char // BLOCK_SIZE for char in font["subset"].dict() if char not in BASE_CODEPOINTS}
+                font["ttffile"] = self._subset_file(font["ttffile"], blocks - {0})
+            except Exception as e:
+                # The full font still works, it is just slower to embed
+                print(f"Error preparing font subset: {e}")
+
+    def prune(self, keep: Optional[Path] = None) -> int:
+        """Delete the least recently used subsets, except ``keep``, until they fit in max_cache_bytes.
+
+        Returns how many files were removed.
+        """
+        try:
+            files = [
+                (entry.stat().st_mtime_ns, entry.stat().st_size, Path(entry.path))
+                for entry in os.scandir(self.cache_dir)
+                if entry.is_file() and entry.name.endswith(FONT_EXTENSIONS)
+            ]
+        except OSError:
+            return 0
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_cache_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def _cache_path(self, *parts: Any) -> Path:
+        digest = hashlib.sha256("|".join(map(str, parts + (FPDF_VERSION,))).encode("utf-8")).hexdigest()
+        return self.cache_dir / digest[:32]
+
+    def _load_metrics(self, path: Path) -> Dict[str, Any]:
+        """Metrics for one font file: from memory, the JSON cache, or a fresh parse."""
+        key = _file_key(path)
+        metrics = self._metrics.get(key)
+        if metrics is not None:
+            return metrics
+
+        with self._lock:
+            metrics = self._metrics.get(key)
+            if metrics is None:
+                cache_path = self._cache_path(*key).with_suffix(".json")
+                try:
+                    raw = json.loads(cache_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    raw = self._parse(path)
+                    try:
+                        self.cache_dir.mkdir(parents=True, exist_ok=True)
+                        write_atomic(cache_path, json.dumps(raw).encode("utf-8"))
+                    except OSError as e:
+                        print(f"Could not write font cache entry: {e}")
+                metrics = self._from_raw(raw)
+                self._metrics[key] = metrics
+                self._sources.add(path)
+        return metrics
+
+    def _subset_file(self, path: Path, blocks: Set[int]) -> Path:
+        """A copy of ``path`` cut down to printable ASCII and the given codepoint blocks."""
+        key = (_file_key(path), tuple(sorted(blocks)))
+        char_widths = self._load_metrics(path)["cw"]
+        subset_path = self._subsets.get(key)
+        if subset_path is not None and subset_path.exists():
+            return subset_path
+
+        with self._lock:
+            subset_path = self._subsets.get(key)
+            if subset_path is None or not subset_path.exists():
+                subset_path = self._cache_path(*key).with_suffix(path.suffix)
+                if subset_path.exists():
+                    # Mark it recently used so pruning keeps it
+                    os.utime(subset_path)
+                else:
+                    # Imported here: only needed the first time a subset is built
+                    from fontTools import subset as ftsubset
+                    from fontTools import ttLib
+
+                    font = ttLib.TTFont(str(path), recalcTimestamp=False, lazy=True)
+                    # Keep glyph names and name records so fpdf subsets it exactly like the original
+                    options = ftsubset.Options(
+                        notdef_outline=True,
+                        recommended_glyphs=True,
+                        glyph_names=True,
+                        name_IDs=["*"],
+                        name_languages=["*"],
+                        layout_features=[],
+                    )
+                    options.drop_tables += DROPPED_TABLES
+                    codepoints = set(BASE_CODEPOINTS)
+                    codepoints.update(char for char in char_widths if char // BLOCK_SIZE in blocks)
+                    subsetter = ftsubset.Subsetter(options)
+                    subsetter.populate(unicodes=codepoints)
+                    subsetter.subset(font)
+                    buffer = BytesIO()
+                    font.save(buffer)
+                    self.cache_dir.mkdir(parents=True, exist_ok=True)
+                    write_atomic(subset_path, buffer.getvalue())
+                    self.prune(keep=subset_path)
+                self._subsets[key] = subset_path
+        return subset_path
+
+    @staticmethod
+    def _parse(path: Path) -> Dict[str, Any]:
+        """Let fpdf parse the font once on a scratch document and keep the serializable parts."""
+        scratch = FPDF()
+        scratch.add_font("scratch", "", str(path))
+        entry = scratch.fonts["scratch"]
+        desc = entry["desc"]
+        return {
+            "name": entry["name"],
+            "up": entry["up"],
+            "ut": entry["ut"],
+            "cw": {str(char): width for char, width in entry["cw"].items()},
+            "cmap": list(entry["cmap"]),
+            "desc": {
+                "ascent": desc.ascent,
+                "descent": desc.descent,
+                "cap_height": desc.cap_height,
+                "flags": desc.flags.value,
+                "font_b_box": desc.font_b_box,
+                "italic_angle": desc.italic_angle,
+                "stem_v": desc.stem_v,
+                "missing_width": desc.missing_width,
+            },
+        }
+
+    @staticmethod
+    def _from_raw(raw: Dict[str, Any]) -> Dict[str, Any]:
+        missing_width = raw["desc"]["missing_width"]
+        char_widths = defaultdict(lambda: missing_width)
+        char_widths.update((int(char), width) for char, width in raw["cw"].items())
+        return dict(raw, cw=char_widths, cmap=tuple(raw["cmap"]))
+
+
+shared_fonts = FontLibrary()
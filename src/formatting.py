@@ -0,0 +1,69 @@
+"""Locale-free number formatting for PKR amounts.
+
+``locale.setlocale`` is process-global and not thread-safe, and
+``locale.currency`` output depends on the host machine. Formatters here
+use only Python's format mini-language, so the same amount renders the
+same way in every thread and on every host.
+
+Two digit groupings are supported:
+
+    western    1,234,567.50
+    indian     12,34,567.50   (lakh / crore)
+"""
+from typing import Any
+
+WESTERN = "western"
+INDIAN = "indian"
+
+
+def _group_indian(digits: str) -> str:
+    """Insert lakh/crore separators: last three digits, then pairs."""
+    if len(digits) <= 3:
+        return digits
+    head, tail = digits[:-3], digits[-3:]
+    pairs = []
+    while len(head) > 2:
+        pairs.append(head[-2:])
+        head = head[:-2]
+    if head:
+        pairs.append(head)
+    return ",".join(reversed(pairs)) + "," + tail
+
+
+class AmountFormatter:
+    """Formats amounts with a fixed grouping style and number of decimals."""
+
+    def __init__(self, grouping: str = WESTERN, decimals: int = 2, prefix: str = "", suffix: str = ""):
+        if grouping not in (WESTERN, INDIAN):
+            raise ValueError(f"Unknown grouping: {grouping}")
+        self.grouping = grouping
+        self.decimals = decimals
+        self.prefix = prefix
+        self.suffix = suffix
+        # Western grouping is what format() does natively; Indian regroups the plain digits
+        self._spec = f",.{decimals}f" if grouping == WESTERN else f".{decimals}f"
+
+    def format(self, amount: float) -> str:
+        text = format(amount, self._spec)
+        if self.grouping == INDIAN:
+            sign = "-" if text.startswith("-") else ""
+            whole, dot, fraction = text.lstrip("-").partition(".")
+            text = f"{sign}{_group_indian(whole)}{dot}{fraction}"
+        return f"{self.prefix}{text}{self.suffix}"
+
+    __call__ = format
+
+
+def parse_amount(value: Any, default: float = 0.0) -> float:
+    """Read an amount typed as text ("1,50,000.50", " 2000 ") or a number."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(",", "").strip())
+    except ValueError:
+        return default
+
+
+# Shared, ready-made formatters used by the templates
+format_amount = AmountFormatter()
+format_whole_amount = AmountFormatter(decimals=0)
@@ -0,0 +1,130 @@
+"""Process-wide cache of decoded letterhead, signature and stamp images.
+
+fpdf2 keeps parsed image info (decoded pixel data, alpha SMask, palette)
+only for the lifetime of one FPDF instance. This cache holds that parsed
+info for the whole process, keyed by path and file mtime, and seeds it into
+every new document so each image is decoded once per process.
+
+fpdf moves an image's ICC profile out of its info into the document's
+``icc_profiles`` table, so cached entries carry the profile bytes
+themselves and register them again in each document they are seeded into.
+"""
+import copy
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fpdf import FPDF
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _info_size(info: Dict[str, Any]) -> int:
+    return len(info.get("data") or b"") + len(info.get("smask") or b"") + len(info.get("iccp") or b"")
+
+
+def _icc_profile(pdf: FPDF, info: Dict[str, Any]) -> Optional[bytes]:
+    """The ICC profile bytes fpdf filed under ``info["iccp_i"]`` in this document."""
+    iccp_i = info.get("iccp_i")
+    if iccp_i is None:
+        return None
+    return next((profile for profile, i in pdf.icc_profiles.items() if i == iccp_i), None)
+
+
+class ImageCache:
+    """Size-bounded LRU cache of parsed fpdf image info."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any], int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def image(self, pdf: FPDF, path: str, **kwargs) -> None:
+        """Place ``path`` on the current page of ``pdf``, decoding it at most once per process."""
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        images = pdf.images
+
+        missed = False
+        if path not in images:
+            info = self._get(key, stamp)
+            if info is not None:
+                images[path] = self._seed(info, images, pdf.icc_profiles)
+            else:
+                missed = True
+
+        pdf.image(path, **kwargs)
+
+        if missed and path in images:
+            self._put(key, stamp, images[path], _icc_profile(pdf, images[path]))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _get(self, key: str, stamp: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != stamp:
+                # Source changed on disk since it was decoded
+                self._total_bytes -= entry[2]
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _put(self, key: str, stamp: Tuple[int, int], info: Dict[str, Any], iccp: Optional[bytes]) -> None:
+        info = copy.copy(info)
+        info["iccp"] = iccp
+        size = _info_size(info)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[2]
+            self._entries[key] = (stamp, info, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted
+
+    @staticmethod
+    def _seed(
+        info: Dict[str, Any],
+        images: Dict[str, Any],
+        icc_profiles: Dict[bytes, int]
+    ) -> Dict[str, Any]:
+        """Copy cached info into a document, renumbering the per-document fields."""
+        info = copy.copy(info)
+        info["i"] = len(images) + 1
+        info["usages"] = 0
+        info.pop("obj_id", None)
+        # Register the profile the way FPDF.preload_image does, zero-based
+        iccp = info.pop("iccp", None)
+        info["iccp"] = None
+        info["iccp_i"] = None
+        if iccp:
+            if iccp not in icc_profiles:
+                icc_profiles[iccp] = len(icc_profiles)
+            info["iccp_i"] = icc_profiles[iccp]
+        return info
+
+
+# Shared by every PDFGenerator in the process
+shared_image_cache = ImageCache()
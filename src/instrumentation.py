@@ -0,0 +1,158 @@
+"""Optional per-phase timing of document generation.
+
+A Recorder collects one record per document: wall time spent in each
+named phase (template import, letterhead, content, signature, output,
+...) plus counters such as pages and output bytes. Records can be
+exported as JSON lines or aggregated into a summary table.
+
+Instrumentation is off unless a Recorder is passed in. The default
+``null_recorder`` hands back shared no-op context managers, so the
+disabled hot path costs one method call per phase.
+"""
+import json
+import statistics
+import time
+from typing import Any, Dict, List, TextIO, Union
+
+PHASES = ("template_import", "cache", "letterhead", "content", "signature", "output", "write", "index")
+
+
+class _NullContext:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class NullRecorder:
+    """Recorder stand-in used when instrumentation is disabled."""
+
+    enabled = False
+
+    def document(self, **labels: Any) -> _NullContext:
+        return _NULL_CONTEXT
+
+    def span(self, name: str) -> _NullContext:
+        return _NULL_CONTEXT
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+
+null_recorder = NullRecorder()
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "started")
+
+    def __init__(self, recorder: "Recorder", name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.recorder._add_span(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _Document:
+    __slots__ = ("recorder", "labels", "record", "started")
+
+    def __init__(self, recorder: "Recorder", labels: Dict[str, Any]):
+        self.recorder = recorder
+        self.labels = labels
+        self.record = None
+
+    def __enter__(self) -> Dict[str, Any]:
+        current = self.recorder._current
+        if current is not None:
+            # Nested call (e.g. generate_document -> render): join the open record
+            return current
+        self.record = {**self.labels, "spans": {}, "counters": {}}
+        self.recorder._current = self.record
+        self.started = time.perf_counter()
+        return self.record
+
+    def __exit__(self, *exc) -> bool:
+        if self.record is not None:
+            self.record["total"] = time.perf_counter() - self.started
+            self.recorder._current = None
+            self.recorder.records.append(self.record)
+        return False
+
+
+class Recorder:
+    """Collects span timings and counters, one record per document."""
+
+    enabled = True
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._current = None
+
+    def document(self, **labels: Any) -> _Document:
+        """Context manager grouping every span inside it into one document record."""
+        return _Document(self, labels)
+
+    def span(self, name: str) -> _Span:
+        """Context manager adding its wall time to phase ``name`` of the open document."""
+        return _Span(self, name)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        if self._current is not None:
+            counters = self._current["counters"]
+            counters[name] = counters.get(name, 0) + amount
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Merge a record produced elsewhere, e.g. in a worker process."""
+        self.records.append(record)
+
+    def _add_span(self, name: str, seconds: float) -> None:
+        if self._current is not None:
+            spans = self._current["spans"]
+            spans[name] = spans.get(name, 0.0) + seconds
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-phase totals, means and p95 (milliseconds) across every record."""
+        samples: Dict[str, List[float]] = {}
+        for record in self.records:
+            for name, seconds in record["spans"].items():
+                samples.setdefault(name, []).append(seconds)
+            samples.setdefault("total", []).append(record.get("total", 0.0))
+
+        grand_total = sum(samples.get("total", [])) or 1.0
+        ordered = [p for p in PHASES if p in samples] + sorted(set(samples) - set(PHASES))
+        summary = {}
+        for name in ordered:
+            values = sorted(samples[name])
+            summary[name] = {
+                "documents": len(values),
+                "total_ms": round(sum(values) * 1000, 3),
+                "mean_ms": round(statistics.mean(values) * 1000, 3),
+                "p95_ms": round(values[min(len(values) - 1, round(0.95 * (len(values) - 1)))] * 1000, 3),
+                "share": round(sum(values) / grand_total, 4),
+            }
+        return summary
+
+    def format_table(self) -> str:
+        lines = [f"{'phase':<18} {'docs':>6} {'total ms':>11} {'mean ms':>9} {'p95 ms':>9} {'share':>7}"]
+        for name, row in self.summary().items():
+            lines.append(f"{name:<18} {row['documents']:>6} {row['total_ms']:>11.1f} "
+                         f"{row['mean_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['share']:>7.1%}")
+        return "\n".join(lines)
+
+    def write_jsonl(self, output: Union[str, TextIO]) -> None:
+        """Write one JSON line per document record to a path or text stream."""
+        lines = "".join(json.dumps(record) + "\n" for record in self.records)
+        if hasattr(output, "write"):
+            output.write(lines)
+        else:
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(lines)
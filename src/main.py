@@ -1,88 +1,47 @@
+import json
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 from datetime import datetime
+from PIL import ImageTk
 from document_manager import DocumentManager
+from preview import PreviewRenderer
 from signer import PDFSignatureApp
 
-class DocumentApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Document Generator")
-
-        self.doc_manager = DocumentManager()
-        self.entry_widgets = {}
-        self.line_item_entries = []
-        self.error_labels = {}
-
-        self._setup_styles()
-        self._setup_ui()
-
-    def _setup_styles(self):
-        style = ttk.Style()
-        style.configure('TLabel', font=('Helvetica', 10))
-        style.configure('TButton', font=('Helvetica', 10))
-        style.configure('Error.TLabel', foreground='red', font=('Helvetica', 8))
-
-    def _setup_ui(self):
-        # Company Selection
-        self.company_var = tk.StringVar()
-        ttk.Label(self.root, text="Select Company:").pack(anchor='w', padx=10, pady=(10, 0))
-        self.company_menu = ttk.Combobox(
-            self.root,
-            textvariable=self.company_var,
-            values=["GoFar Media", "Glory Enterprises"],
-            state="readonly"
-        )
-        self.company_menu.pack(fill=tk.X, padx=10)
-        self.company_menu.current(0)
-
-        # Document Type Selection
-        self.doc_type_var = tk.StringVar()
-        ttk.Label(self.root, text="Document Type:").pack(anchor='w', padx=10, pady=(10, 0))
-        self.doc_type_menu = ttk.Combobox(
-            self.root,
-            textvariable=self.doc_type_var,
-            values=list(self.doc_manager.templates.keys()),
-            state="readonly"
-        )
-        self.doc_type_menu.pack(fill=tk.X, padx=10)
-        self.doc_type_menu.bind("<<ComboboxSelected>>", lambda e: self.load_form_fields())
-
-        # Scrollable Form Area
-        self.canvas = tk.Canvas(self.root)
-        self.scrollable_frame = ttk.Frame(self.canvas)
-        self.scrollable_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
-        self.scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=self.canvas.yview)
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor='nw')
-        self.canvas.pack(side="left", fill="both", expand=True)
-        self.scrollbar.pack(side="right", fill="y")
+# How often the Tk loop checks for finished documents
+POLL_INTERVAL_MS = 100
+# Quiet time after the last edit before the preview is re-rendered
+PREVIEW_DELAY_MS = 400
+PREVIEW_GAP_PX = 10
 
-        self.generate_button = ttk.Button(self.root, text="Generate Document", command=self.generate_document)
-        self.generate_button.pack(pady=10)
+class FormPanel:
+    """The entry form for one document type, built once and shown on demand.
 
-    def load_form_fields(self):
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+    Widgets (DateEntry especially) are slow to create, so switching document
+    types hides one panel and shows another instead of rebuilding, which also
+    keeps whatever was typed into each form.
+    """
 
-        self.entry_widgets.clear()
-        self.error_labels.clear()
-        self.line_item_entries.clear()
-
-        doc_type = self.doc_type_var.get()
-        template = self.doc_manager.templates.get(doc_type, {})
+    def __init__(self, parent, doc_type: str, template: dict):
+        self.doc_type = doc_type
+        self.template = template
+        self.frame = ttk.Frame(parent)
+        self.entry_widgets = {}
+        self.error_labels = {}
+        self.line_item_entries = []
+        self.content_text = None
 
         for field, field_type in template.get("header_fields", []):
             self._add_form_field(field, field_type)
 
         if doc_type in ["Invoice", "Sales Tax Invoice"]:
-            self._add_line_items_section(template)
+            self._add_line_items_section()
         elif doc_type == "Request Letter":
             self._add_letter_content_field()
 
     def _add_form_field(self, field: str, field_type: str) -> None:
-        frame = ttk.Frame(self.scrollable_frame)
+        frame = ttk.Frame(self.frame)
         frame.pack(fill=tk.X, pady=3)
 
         ttk.Label(frame, text=f"{field}:", width=20, anchor='w').pack(side=tk.LEFT)
@@ -99,20 +58,19 @@ class DocumentApp:
         self.entry_widgets[field] = entry
 
     def _add_letter_content_field(self):
-        frame = ttk.Frame(self.scrollable_frame)
+        frame = ttk.Frame(self.frame)
         frame.pack(fill=tk.BOTH, expand=True, pady=5)
 
         ttk.Label(frame, text="Content:").pack(anchor='w')
         self.content_text = tk.Text(frame, height=6, font=("Helvetica", 10))
         self.content_text.pack(fill=tk.BOTH, expand=True)
 
-    def _add_line_items_section(self, template):
-        ttk.Label(self.scrollable_frame, text="Line Items:", font=('Helvetica', 10, 'bold')).pack(anchor='w', pady=(10, 2))
-        line_item_frame = ttk.Frame(self.scrollable_frame)
+    def _add_line_items_section(self):
+        ttk.Label(self.frame, text="Line Items:", font=('Helvetica', 10, 'bold')).pack(anchor='w', pady=(10, 2))
+        line_item_frame = ttk.Frame(self.frame)
         line_item_frame.pack(fill=tk.X)
 
-        columns = template.get("line_items", {}).get("columns", [])
-        self.line_item_entries = []
+        columns = self.template.get("line_items", {}).get("columns", [])
 
         header_frame = ttk.Frame(line_item_frame)
         header_frame.pack(fill=tk.X)
@@ -123,16 +81,16 @@ class DocumentApp:
         self.items_container = ttk.Frame(line_item_frame)
         self.items_container.pack(fill=tk.X, pady=5)
 
-        self._add_line_item_row(template)
+        self._add_line_item_row()
 
-        ttk.Button(line_item_frame, text="Add Item", command=lambda: self._add_line_item_row(template)).pack(anchor='w', pady=5)
+        ttk.Button(line_item_frame, text="Add Item", command=self._add_line_item_row).pack(anchor='w', pady=5)
 
-    def _add_line_item_row(self, template):
+    def _add_line_item_row(self):
         row = ttk.Frame(self.items_container)
         row.pack(fill=tk.X, pady=2)
 
         entry_list = []
-        for col in template["line_items"]["columns"]:
+        for col in self.template["line_items"]["columns"]:
             if "Date" in col:
                 entry = DateEntry(row, date_pattern='yyyy-mm-dd')
             else:
@@ -147,13 +105,193 @@ class DocumentApp:
         frame.destroy()
         self.line_item_entries.remove(entry_list)
 
-    def collect_form_data(self) -> dict:
+
+class DocumentApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Document Generator")
+
+        self.doc_manager = DocumentManager()
+        self.form_panels = {}
+        self.current_panel = None
+
+        # One worker: documents are produced in the order they were submitted
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="generate")
+        self.pending = {}  # submission key -> Future
+        self.polling = False
+
+        self.previewer = PreviewRenderer()
+        self.preview_job = None       # after() id of the debounce timer
+        self.preview_future = None
+        # Bumped whenever the canvas content is superseded; older renders are dropped
+        self.preview_generation = 0
+        self.preview_future_generation = 0
+        self.preview_images = []      # PhotoImages must stay referenced while shown
+
+        self._setup_styles()
+        self._setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+    def _setup_styles(self):
+        style = ttk.Style()
+        style.configure('TLabel', font=('Helvetica', 10))
+        style.configure('TButton', font=('Helvetica', 10))
+        style.configure('Error.TLabel', foreground='red', font=('Helvetica', 8))
+
+    def _setup_ui(self):
+        # Company Selection
+        self.company_var = tk.StringVar()
+        ttk.Label(self.root, text="Select Company:").pack(anchor='w', padx=10, pady=(10, 0))
+        self.company_menu = ttk.Combobox(
+            self.root,
+            textvariable=self.company_var,
+            values=["GoFar Media", "Glory Enterprises"],
+            state="readonly"
+        )
+        self.company_menu.pack(fill=tk.X, padx=10)
+        self.company_menu.current(0)
+
+        # Document Type Selection
+        self.doc_type_var = tk.StringVar()
+        ttk.Label(self.root, text="Document Type:").pack(anchor='w', padx=10, pady=(10, 0))
+        self.doc_type_menu = ttk.Combobox(
+            self.root,
+            textvariable=self.doc_type_var,
+            values=list(self.doc_manager.templates.keys()),
+            state="readonly"
+        )
+        self.doc_type_menu.pack(fill=tk.X, padx=10)
+        self.doc_type_menu.bind("<<ComboboxSelected>>", lambda e: self.load_form_fields())
+
+        self._setup_preview()
+
+        # Scrollable Form Area
+        self.canvas = tk.Canvas(self.root)
+        self.scrollable_frame = ttk.Frame(self.canvas)
+        self.scrollable_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor='nw')
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.generate_button = ttk.Button(self.root, text="Generate Document", command=self.generate_document)
+        self.generate_button.pack(pady=10)
+
+        self.status_var = tk.StringVar()
+        ttk.Label(self.root, textvariable=self.status_var).pack(anchor='w', padx=10)
+        self.progress = ttk.Progressbar(self.root, mode="indeterminate")
+
+    def _setup_preview(self):
+        frame = ttk.LabelFrame(self.root, text="Preview")
+        frame.pack(side="right", fill="both", padx=10, pady=10)
+        self.preview_canvas = tk.Canvas(frame, width=420, background="#808080", highlightthickness=0)
+        preview_scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.preview_canvas.yview)
+        self.preview_canvas.configure(yscrollcommand=preview_scrollbar.set)
+        self.preview_canvas.pack(side="left", fill="both", expand=True)
+        preview_scrollbar.pack(side="right", fill="y")
+        self._show_preview_message("Choose a document type to see a preview.")
+
+        # Any edit anywhere in the form restarts the debounce timer
+        for sequence in ("<KeyRelease>", "<ButtonRelease-1>", "<<ComboboxSelected>>", "<<DateEntrySelected>>"):
+            self.root.bind_all(sequence, self._schedule_preview, add="+")
+
+    def _schedule_preview(self, event=None):
+        if event is not None and isinstance(event.widget, tk.Misc) and event.widget.winfo_toplevel() is not self.root:
+            return  # typing in a signature window
+        if self.preview_job is not None:
+            self.root.after_cancel(self.preview_job)
+        self.preview_job = self.root.after(PREVIEW_DELAY_MS, self._refresh_preview)
+
+    def _refresh_preview(self):
+        self.preview_job = None
+        panel = self.current_panel
+        company = self.company_var.get()
+        if panel is None or not company:
+            return
+        try:
+            data = self.collect_form_data()
+            template_class = self.doc_manager.templates[panel.doc_type]["template_class"]
+            if not template_class.validate_data(data):
+                self.previewer.invalidate()
+                self._show_preview_message("Fill in the required fields to see a preview.")
+                return
+        except Exception as e:
+            self.previewer.invalidate()
+            self._show_preview_message(str(e))
+            return
+
+        future = self.previewer.request(company, panel.doc_type, data)
+        if future is None:
+            return  # nothing changed since the last preview
+        if self.preview_future is None:
+            self.root.after(POLL_INTERVAL_MS, self._poll_preview)
+        self.preview_generation += 1
+        self.preview_future = future
+        self.preview_future_generation = self.preview_generation
+
+    def _poll_preview(self):
+        future = self.preview_future
+        if not future.done():
+            self.root.after(POLL_INTERVAL_MS, self._poll_preview)
+            return
+        self.preview_future = None
+        if self.preview_future_generation != self.preview_generation:
+            return  # a message or a newer request replaced it while it rendered
+        try:
+            pages = future.result()
+        except Exception as e:
+            self.previewer.invalidate()
+            self._show_preview_message(str(e))
+            return
+        if pages is not None:
+            self._show_preview_pages(pages)
+
+    def _show_preview_pages(self, pages):
+        canvas = self.preview_canvas
+        canvas.delete("all")
+        self.preview_images = []
+        y = PREVIEW_GAP_PX
+        for img in pages:
+            tk_img = ImageTk.PhotoImage(img)
+            canvas.create_image(PREVIEW_GAP_PX, y, anchor="nw", image=tk_img)
+            self.preview_images.append(tk_img)
+            y += img.height + PREVIEW_GAP_PX
+        canvas.configure(scrollregion=(0, 0, pages[0].width + 2 * PREVIEW_GAP_PX, y))
+
+    def _show_preview_message(self, message: str):
+        self.preview_generation += 1
+        canvas = self.preview_canvas
+        canvas.delete("all")
+        self.preview_images = []
+        canvas.create_text(
+            PREVIEW_GAP_PX, PREVIEW_GAP_PX, anchor="nw", text=message, fill="white", width=400
+        )
+        canvas.configure(scrollregion=(0, 0, 0, 0))
+
+    def load_form_fields(self):
         doc_type = self.doc_type_var.get()
-        template = self.doc_manager.templates.get(doc_type, {})
+        panel = self.form_panels.get(doc_type)
+        if panel is self.current_panel:
+            return
+        if panel is None:
+            template = self.doc_manager.templates.get(doc_type, {})
+            panel = self.form_panels[doc_type] = FormPanel(self.scrollable_frame, doc_type, template)
+
+        if self.current_panel is not None:
+            self.current_panel.frame.pack_forget()
+        panel.frame.pack(fill=tk.BOTH, expand=True)
+        self.current_panel = panel
+        self.canvas.yview_moveto(0)
+
+    def collect_form_data(self) -> dict:
+        panel = self.current_panel
+        doc_type = panel.doc_type
+        template = panel.template
         data = {}
 
         for field, _ in template.get("header_fields", []):
-            widget = self.entry_widgets[field]
+            widget = panel.entry_widgets[field]
             if isinstance(widget, DateEntry):
                 data[field] = widget.get_date().strftime('%Y-%m-%d')
             else:
@@ -168,12 +306,12 @@ class DocumentApp:
                 data["Invoice Month"] = ""
 
         if doc_type == "Request Letter":
-            data["content"] = self.content_text.get("1.0", "end").strip()
+            data["content"] = panel.content_text.get("1.0", "end").strip()
 
         if doc_type in ["Invoice", "Sales Tax Invoice"]:
             columns = template["line_items"]["columns"]
             data["line_items"] = []
-            for entry_row in self.line_item_entries:
+            for entry_row in panel.line_item_entries:
                 row = {}
                 for idx, col in enumerate(columns):
                     val = entry_row[idx].get().strip()
@@ -201,17 +339,73 @@ class DocumentApp:
                 messagebox.showerror("Validation Error", "Required fields are missing or incorrect.")
                 return
 
-            filepath = self.doc_manager.generate_document(company=company, doc_type=doc_type, data=data)
+            # Clicking again before the same form has been produced must not make a second copy
+            key = json.dumps([company, doc_type, data], sort_keys=True, default=str)
+            if key in self.pending:
+                self.status_var.set("This document is already being generated.")
+                return
 
-            result = messagebox.askyesno("Success", f"Document generated:\n{filepath}\n\nDo you want to add a signature?")
-            if result:
-                # Launch signature window
-                sig_root = tk.Toplevel(self.root)
-                PDFSignatureApp(sig_root, filepath)
+            self.pending[key] = self.executor.submit(
+                self.doc_manager.generate_document, company=company, doc_type=doc_type, data=data
+            )
+            self._update_progress()
+            if not self.polling:
+                self.polling = True
+                self.root.after(POLL_INTERVAL_MS, self._poll_jobs)
 
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
+    def _poll_jobs(self):
+        """Runs on the Tk loop: hands finished documents to the user, then reschedules itself."""
+        done = [(key, future) for key, future in self.pending.items() if future.done()]
+        for key, _ in done:
+            del self.pending[key]
+        self._update_progress()
+        if self.pending:
+            self.root.after(POLL_INTERVAL_MS, self._poll_jobs)
+        else:
+            self.polling = False
+
+        for _, future in done:
+            if future.cancelled():
+                continue
+            try:
+                filepath = future.result()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+                continue
+            self._document_ready(filepath)
+
+    def _document_ready(self, filepath: str):
+        result = messagebox.askyesno("Success", f"Document generated:\n{filepath}\n\nDo you want to add a signature?")
+        if result:
+            # Launch signature window
+            sig_root = tk.Toplevel(self.root)
+            PDFSignatureApp(sig_root, filepath)
+
+    def _update_progress(self):
+        count = len(self.pending)
+        if count:
+            self.status_var.set(f"Generating {count} document(s)...")
+            if not self.progress.winfo_ismapped():
+                self.progress.pack(fill=tk.X, padx=10, pady=(0, 10))
+                self.progress.start(10)
+        else:
+            self.status_var.set("")
+            self.progress.stop()
+            self.progress.pack_forget()
+
+    def close(self):
+        if self.pending and not messagebox.askyesno(
+            "Documents Pending", f"{len(self.pending)} document(s) are still being generated. Quit anyway?"
+        ):
+            return
+        # The document being written is finished; queued ones are dropped
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.previewer.shutdown()
+        self.root.destroy()
+
 
 if __name__ == "__main__":
     root = tk.Tk()
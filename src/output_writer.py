@@ -0,0 +1,92 @@
+"""Collision-free, atomic writing of generated documents.
+
+Every document is first written to a hidden temp file in the output
+directory and then published under its final name in one step, so readers
+never see a half-written PDF. Names are ``<prefix>_<YYYYmmdd_HHMMSS_ffffff>``
+and, if another writer (thread or process) claimed the same name first, a
+``_<n>`` sequence is appended; publishing never overwrites an existing file.
+"""
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Callable, Union
+
+MAX_ATTEMPTS = 10000
+
+
+def _temp_file(directory: Union[str, Path]):
+    """Create a hidden temp file in ``directory`` and open it for writing.
+
+    Unlike mkstemp (always 0600) the file is created with mode 0666, so the
+    kernel applies the process umask and published documents get the same
+    permissions as any file the user writes.
+    """
+    for _ in range(MAX_ATTEMPTS):
+        temp_path = os.path.join(directory, f".{os.urandom(8).hex()}.tmp")
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+        except FileExistsError:
+            continue
+        return os.fdopen(fd, "wb"), temp_path
+    raise FileExistsError(f"Could not create a temp file in {directory}")
+
+
+def _publish(temp_path: str, final_path: Path) -> bool:
+    """Move temp_path to final_path unless it already exists; False on a name clash."""
+    try:
+        os.link(temp_path, final_path)
+    except FileExistsError:
+        return False
+    except OSError:
+        # No hard links on this filesystem: claim the name first, then replace it
+        try:
+            os.close(os.open(final_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return False
+        os.replace(temp_path, final_path)
+        return True
+    os.unlink(temp_path)
+    return True
+
+
+def write_atomic(dest: Union[str, Path], data: bytes) -> None:
+    """Write ``data`` to ``dest`` via a temp file and rename, replacing any existing file."""
+    f, temp_path = _temp_file(os.path.dirname(os.path.abspath(dest)))
+    try:
+        with f:
+            f.write(data)
+        os.replace(temp_path, dest)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+class OutputWriter:
+    """Writes documents into one directory under unique, time-sortable names."""
+
+    def __init__(self, output_dir: Union[str, Path], extension: str = ".pdf"):
+        self.output_dir = Path(output_dir)
+        self.extension = extension
+
+    def write(self, prefix: str, write: Callable[[BinaryIO], None]) -> Path:
+        """Call ``write`` with a temp binary file, then publish it under a fresh name."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        f, temp_path = _temp_file(self.output_dir)
+        try:
+            with f:
+                write(f)
+
+            stem = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+            for attempt in range(MAX_ATTEMPTS):
+                name = stem if attempt == 0 else f"{stem}_{attempt}"
+                final_path = self.output_dir / f"{name}{self.extension}"
+                if _publish(temp_path, final_path):
+                    return final_path
+            raise FileExistsError(f"Could not find a free file name for {stem}")
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def write_bytes(self, prefix: str, data: bytes) -> Path:
+        return self.write(prefix, lambda f: f.write(data))
@@ -0,0 +1,95 @@
+"""In-process PDF page rasterization for the signature tool and the form preview."""
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+# Zoom 1.0 renders at screen resolution (96 DPI) rather than PDF points (72 DPI)
+SCREEN_DPI = 96
+POINTS_PER_INCH = 72
+DEFAULT_MAX_BYTES = 96 * 1024 * 1024
+TILE_PX = 512
+
+
+class PageRenderer:
+    """Renders pages (or tiles of pages) of one PDF with PyMuPDF behind an LRU cache.
+
+    The cache is bounded by decoded bitmap size, so a long document costs
+    about as much memory as the pages recently looked at.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES, data: Optional[bytes] = None):
+        """Open the PDF at ``path``, or the in-memory PDF ``data`` when given."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.doc = fitz.open(stream=data, filetype="pdf") if data is not None else fitz.open(path)
+        self._cache: "OrderedDict[Tuple, Image.Image]" = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def page_count(self) -> int:
+        return self.doc.page_count
+
+    @staticmethod
+    def scale(zoom: float) -> float:
+        """Pixels per PDF point at the given zoom."""
+        return zoom * SCREEN_DPI / POINTS_PER_INCH
+
+    def page_rect(self, page_no: int) -> fitz.Rect:
+        return self.doc[page_no].rect
+
+    def page_size_px(self, page_no: int, zoom: float) -> Tuple[int, int]:
+        rect = self.page_rect(page_no)
+        scale = self.scale(zoom)
+        return round(rect.width * scale), round(rect.height * scale)
+
+    def render(self, page_no: int, zoom: float) -> Image.Image:
+        """Rasterize ``page_no`` at exactly the pixel size for ``zoom``."""
+        zoom = round(zoom, 2)
+        return self._cached((page_no, zoom), lambda: self._rasterize(page_no, zoom))
+
+    def render_tile(self, page_no: int, zoom: float, col: int, row: int, tile_px: int = TILE_PX) -> Image.Image:
+        """Rasterize one ``tile_px`` square of ``page_no`` at ``zoom``.
+
+        Only the clipped area is rendered, so the cost of a tile does not
+        grow with the zoom level. Edge tiles are cropped to the page.
+        """
+        zoom = round(zoom, 2)
+        scale = self.scale(zoom)
+        page_rect = self.page_rect(page_no)
+        x0 = page_rect.x0 + col * tile_px / scale
+        y0 = page_rect.y0 + row * tile_px / scale
+        clip = fitz.Rect(x0, y0, x0 + tile_px / scale, y0 + tile_px / scale) & page_rect
+        return self._cached((page_no, zoom, col, row, tile_px), lambda: self._rasterize(page_no, zoom, clip))
+
+    def _rasterize(self, page_no: int, zoom: float, clip: Optional[fitz.Rect] = None) -> Image.Image:
+        scale = self.scale(zoom)
+        pix = self.doc[page_no].get_pixmap(matrix=fitz.Matrix(scale, scale), clip=clip, alpha=False)
+        return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+    def _cached(self, key: Tuple, produce: Callable[[], Image.Image]) -> Image.Image:
+        with self._lock:
+            img = self._cache.get(key)
+            if img is not None:
+                self._cache.move_to_end(key)
+                return img
+
+            img = produce()
+            self._cache[key] = img
+            self._cache_bytes += img.width * img.height * 3
+            while self._cache_bytes > self.max_bytes and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted.width * evicted.height * 3
+            return img
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    def close(self) -> None:
+        self.clear()
+        self.doc.close()
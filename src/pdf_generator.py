@@ -1,45 +1,129 @@
 ﻿from fpdf import FPDF
-from PIL import Image
 from pathlib import Path
-from typing import Dict, Any, Optional, Type
-import locale
+from typing import Dict, Any, BinaryIO, List, Optional, Union
+
+from asset_optimizer import AssetOptimizer, shared_asset_optimizer
+from fonts import ALIASED_FAMILIES, FontLibrary, shared_fonts
+from formatting import format_amount
+from image_cache import ImageCache, shared_image_cache
+from instrumentation import NullRecorder, Recorder, null_recorder
+
+# Content stops above the letterheads' printed footer band (address bar)
+BOTTOM_MARGIN = 35
+
+
+def write_output(output: Union[str, BinaryIO], pdf_bytes: bytes) -> None:
+    """Write rendered PDF bytes to a file path or a writable binary stream."""
+    if hasattr(output, "write"):
+        output.write(pdf_bytes)
+    else:
+        Path(output).write_bytes(pdf_bytes)
+
+
+class DocumentPDF(FPDF):
+    """FPDF that draws the company letterhead at the top of every page.
+
+    Because the letterhead lives in ``header()``, pages started by automatic
+    page breaks (long tables, a signature that does not fit) get it too.
+    When TrueType fonts are installed, requests for Arial use them instead.
+    """
+
+    def __init__(
+        self,
+        image_cache: ImageCache = shared_image_cache,
+        fonts: FontLibrary = shared_fonts,
+        assets: AssetOptimizer = shared_asset_optimizer
+    ):
+        super().__init__()
+        self.shared_images = image_cache  # not fpdf's own image_cache (absent in 2.7.4); named to avoid it
+        self.assets = assets
+        self.letterhead_path: Optional[str] = None
+        self.font_library = fonts
+        self.text_family = fonts.text_family()
+
+    def set_font(self, family: Optional[str] = None, style: str = "", size: float = 0) -> None:
+        requested = (family or self.font_family).lower()
+        if self.text_family and (requested in ALIASED_FAMILIES or requested == self.text_family.lower()):
+            family = self.text_family
+            # A style the family lacks is drawn with the closest one, so that face is embedded once
+            underline = "U" if "U" in style.upper() else ""
+            style = self.font_library.resolve_style(family, "".join(sorted(set(style.upper()) - {"U"})))
+            # Register styles on first use so unused ones are not embedded
+            self.font_library.register(self, family, style)
+            style += underline
+        super().set_font(family, style, size)
+
+    def output(self, *args, **kwargs):
+        if not self.buffer:
+            self.font_library.prepare_output(self)
+        return super().output(*args, **kwargs)
+
+    def header(self) -> None:
+        if self.letterhead_path:
+            try:
+                self.shared_images.image(self, self.assets.letterhead(self.letterhead_path), x=0, y=0, w=210, h=297)  # A4 size in mm
+                self.set_y(60)  # Move below the letterhead header space
+                return
+            except Exception as e:
+                print(f"Error loading letterhead: {e}")
+                self.letterhead_path = None
+        self.set_y(50)
 
-from templates.base_template import BaseTemplate
-from templates import (
-    invoice_template,
-    letter_template,
-    salary_template,
-    sales_tax_template
-)
 
 class PDFGenerator:
     """Handles PDF document generation with professional formatting."""
 
-    def __init__(self):
-        self.pdf = FPDF()
-        self.pdf.set_auto_page_break(auto=True, margin=15)
+    def __init__(
+        self,
+        image_cache: ImageCache = shared_image_cache,
+        recorder: Union[Recorder, NullRecorder] = null_recorder,
+        assets: AssetOptimizer = shared_asset_optimizer
+    ):
+        self.image_cache = image_cache
+        self.recorder = recorder
+        self.assets = assets
+        self.pdf = DocumentPDF(image_cache, assets=assets)
+        self.pdf.set_auto_page_break(auto=True, margin=BOTTOM_MARGIN)
         self.pdf.set_left_margin(15)
         self.pdf.set_right_margin(15)
-        self._initialize_locale()
-
-    def _initialize_locale(self) -> None:
-        try:
-            locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
-            self._locale_available = True
-        except locale.Error:
-            try:
-                locale.setlocale(locale.LC_ALL, '')
-                self._locale_available = True
-            except locale.Error:
-                self._locale_available = False
 
     def format_currency(self, amount: float) -> str:
-        try:
-            if self._locale_available:
-                return locale.currency(amount, grouping=True, symbol=False)
-            return "{:,.2f}".format(amount)
-        except:
-            return str(amount)
+        return format_amount(amount)
+
+    def render(
+        self,
+        company: str,
+        doc_type: str,
+        template: Dict[str, Any],
+        letterhead_path: str,
+        data: Dict[str, Any],
+        signature_path: Optional[str] = None,
+        stamp_path: Optional[str] = None
+    ) -> bytes:
+        """Render one document and return the PDF bytes without touching the filesystem."""
+        with self.recorder.document(company=company, doc_type=doc_type):
+            self._render_record(company, template, letterhead_path, data, signature_path, stamp_path)
+            return self._output()
+
+    def render_bundle(
+        self,
+        company: str,
+        doc_type: str,
+        template: Dict[str, Any],
+        letterhead_path: str,
+        records: List[Dict[str, Any]],
+        signature_path: Optional[str] = None,
+        stamp_path: Optional[str] = None
+    ) -> bytes:
+        """Render many records into a single PDF, each starting on a new page.
+
+        Every page references the same letterhead image object, so the
+        letterhead is read and embedded once for the whole bundle.
+        """
+        with self.recorder.document(company=company, doc_type=doc_type, records=len(records)):
+            for data in records:
+                self._render_record(company, template, letterhead_path, data, signature_path, stamp_path)
+            return self._output()
 
     def generate(
         self,
@@ -47,41 +131,91 @@ class PDFGenerator:
         doc_type: str,
         template: Dict[str, Any],
         letterhead_path: str,
-        output_path: str,
+        output_path: Union[str, BinaryIO],
         data: Dict[str, Any],
         signature_path: Optional[str] = None,
         stamp_path: Optional[str] = None
     ) -> None:
-        self._create_page_with_letterhead(letterhead_path)
+        """Render one document to ``output_path``, a file path or writable binary stream."""
+        pdf_bytes = self.render(company, doc_type, template, letterhead_path, data, signature_path, stamp_path)
+        write_output(output_path, pdf_bytes)
+
+    def generate_bundle(
+        self,
+        company: str,
+        doc_type: str,
+        template: Dict[str, Any],
+        letterhead_path: str,
+        output_path: Union[str, BinaryIO],
+        records: List[Dict[str, Any]],
+        signature_path: Optional[str] = None,
+        stamp_path: Optional[str] = None
+    ) -> None:
+        """Render a bundle (see render_bundle) to a file path or writable binary stream."""
+        pdf_bytes = self.render_bundle(company, doc_type, template, letterhead_path, records, signature_path, stamp_path)
+        write_output(output_path, pdf_bytes)
 
-        template_class = self._get_template_class(doc_type)
-        if template_class:
-            template_instance = template_class()
-            template_instance.generate_pdf_content(self.pdf, data)  # FIXED
+    def _render_record(
+        self,
+        company: str,
+        template: Dict[str, Any],
+        letterhead_path: str,
+        data: Dict[str, Any],
+        signature_path: Optional[str],
+        stamp_path: Optional[str]
+    ) -> None:
+        with self.recorder.span("letterhead"):
+            self._create_page_with_letterhead(letterhead_path)
 
-        self._add_signature_stamp(company, signature_path, stamp_path)
-        self.pdf.output(output_path)
+        # Resolving the class imports the template module on first use
+        with self.recorder.span("template_import"):
+            template_instance = template["template_class"]
+        if template_instance:
+            with self.recorder.span("content"):
+                template_instance.generate_pdf_content(self.pdf, data)
 
-    def _get_template_class(self, doc_type: str) -> Optional[Type[BaseTemplate]]:
-        return {
-            "Invoice": invoice_template.InvoiceTemplate,
-            "Request Letter": letter_template.LetterTemplate,
-            "Salary Slip": salary_template.SalaryTemplate,
-            "Sales Tax Invoice": sales_tax_template.SalesTaxTemplate
-        }.get(doc_type)
+        with self.recorder.span("signature"):
+            self._add_signature_stamp(company, signature_path, stamp_path)
 
-    def _create_page_with_letterhead(self, letterhead_path: str) -> None:
-        self.pdf.add_page()
+    def _output(self) -> bytes:
+        with self.recorder.span("output"):
+            pdf_bytes = bytes(self.pdf.output())
+        self.recorder.count("pages", self.pdf.page)
+        self.recorder.count("output_bytes", len(pdf_bytes))
+        return pdf_bytes
 
+    def _create_page_with_letterhead(self, letterhead_path: str) -> None:
         if letterhead_path and Path(letterhead_path).exists():
-            try:
-                self.pdf.image(letterhead_path, x=0, y=0, w=210, h=297)  # A4 size in mm
-                self.pdf.set_y(60)  # Move below the letterhead header space
-            except Exception as e:
-                print(f"Error loading letterhead: {e}")
-                self.pdf.set_y(50)
+            self.pdf.letterhead_path = letterhead_path
         else:
-            self.pdf.set_y(50)
+            self.pdf.letterhead_path = None
+        self.pdf.add_page()  # DocumentPDF.header() draws the letterhead
+
+    def _place_overlay(self, path: str, x: float, w: float) -> None:
+        """Place a signature or stamp in the flow, sized and positioned as its source image.
+
+        Trimmed borders are added back as offsets, so documents lay out the
+        same whether or not the optimized copy is smaller than the source.
+        """
+        pdf = self.pdf
+        derivative = self.assets.overlay(path)
+        if derivative.size is None:
+            # Not optimized: place the source as is and let fpdf size it
+            self.image_cache.image(pdf, derivative.path, x=x, w=w)
+            return
+        source_w, source_h = derivative.size
+        left, top, right, bottom = derivative.box
+        h = w * source_h / source_w
+        if pdf.will_page_break(h):
+            pdf.add_page(same=True)
+        y = pdf.get_y()
+        scale = w / source_w
+        self.image_cache.image(
+            pdf, derivative.path,
+            x=x + left * scale, y=y + top * scale,
+            w=(right - left) * scale, h=(bottom - top) * scale
+        )
+        pdf.set_xy(pdf.get_x(), y + h)
 
     def _add_signature_stamp(
         self,
@@ -93,14 +227,14 @@ class PDFGenerator:
 
         if signature_path and Path(signature_path).exists():
             try:
-                self.pdf.image(signature_path, x=120, w=60)
+                self._place_overlay(signature_path, x=120, w=60)
                 self.pdf.ln(20)
             except Exception as e:
                 print(f"Error adding signature: {e}")
 
         if stamp_path and Path(stamp_path).exists():
             try:
-                self.pdf.image(stamp_path, x=140, w=40)
+                self._place_overlay(stamp_path, x=140, w=40)
             except Exception as e:
                 print(f"Error adding stamp: {e}")
 
@@ -0,0 +1,73 @@
+"""Background rendering for the live preview next to the entry form.
+
+The GUI asks for a preview whenever the form settles after typing. Work is
+skipped when the form hashes the same as the last request, and a newer
+request supersedes an older one: a render that has not started is
+cancelled, one that has started is not rasterized. Previews are rendered
+in memory by a DocumentManager of their own that bypasses the render
+cache and the document index, so no documents, cached renders or index
+rows are written. Optimized letterheads and font subsets are still cached
+under generated_docs, as for any render.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from PIL import Image
+
+from document_manager import DocumentManager
+from page_renderer import PageRenderer
+from render_cache import RenderCache
+
+PREVIEW_ZOOM = 0.5
+
+
+class PreviewRenderer:
+    """Renders form data to page images on one background thread, newest request wins."""
+
+    def __init__(self, manager: Optional[DocumentManager] = None, zoom: float = PREVIEW_ZOOM):
+        self.manager = manager or DocumentManager(use_render_cache=False, use_index=False)
+        self.zoom = zoom
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preview")
+        self.last_key: Optional[str] = None
+        self._future: Optional[Future] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def request(self, company: str, doc_type: str, data: Dict[str, Any]) -> Optional[Future]:
+        """Start a render of the form; None when it is unchanged since the last request.
+
+        The future resolves to one image per page, or None if it was superseded.
+        """
+        key = RenderCache.key(company=company, doc_type=doc_type, data=data)
+        with self._lock:
+            if key == self.last_key:
+                return None
+            self.last_key = key
+            if self._future is not None:
+                self._future.cancel()
+            self._generation += 1
+            self._future = self.executor.submit(self._render, self._generation, company, doc_type, data)
+            return self._future
+
+    def invalidate(self) -> None:
+        """Forget the last request so the next one renders even if unchanged."""
+        with self._lock:
+            self.last_key = None
+
+    def _render(self, generation: int, company: str, doc_type: str, data: Dict[str, Any]) -> Optional[List[Image.Image]]:
+        pdf_bytes = self.manager.render_document(company, doc_type, data)
+        renderer = PageRenderer(data=pdf_bytes)
+        try:
+            pages = []
+            for page_no in range(renderer.page_count):
+                # Typing moved on while this ran; the pages would be thrown away
+                if generation != self._generation:
+                    return None
+                pages.append(renderer.render(page_no, self.zoom))
+            return pages
+        finally:
+            renderer.close()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
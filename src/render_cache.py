@@ -0,0 +1,131 @@
+"""Content-addressed cache of rendered PDFs.
+
+A document's cache key is a hash of everything that affects its bytes:
+company, document type, the normalized field data, digests of the
+letterhead/signature/stamp files, the template module source and the
+rendering code itself. On a hit the stored PDF is reused without running
+fpdf at all.
+
+Every process that writes to the cache prunes it to ``max_bytes`` on its
+first write and again after each ``max_bytes / PRUNE_FRACTION`` it writes.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from fpdf import FPDF_VERSION
+
+from output_writer import write_atomic
+
+SRC_DIR = Path(__file__).parent
+DEFAULT_CACHE_DIR = SRC_DIR.parent / "generated_docs" / ".render_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+PRUNE_FRACTION = 16
+
+# Source files whose changes alter rendered output for every document type
+RENDER_MODULES = (
+    "pdf_generator.py", "formatting.py", "amount_words.py", "table_layout.py", "text_metrics.py",
+    "fonts.py", "asset_optimizer.py",
+)
+
+_file_digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_renderer_digest: Optional[str] = None
+
+
+def file_digest(path: Optional[str]) -> Optional[str]:
+    """SHA-256 of a file's bytes, memoized on (path, mtime, size)."""
+    if not path or not os.path.exists(path):
+        return None
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_digests.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    _file_digests[path] = (stamp, digest)
+    return digest
+
+
+def renderer_digest() -> str:
+    """Digest of the shared rendering code and fpdf version, computed once per process."""
+    global _renderer_digest
+    if _renderer_digest is None:
+        sha = hashlib.sha256(FPDF_VERSION.encode())
+        for name in RENDER_MODULES:
+            sha.update((SRC_DIR / name).read_bytes())
+        _renderer_digest = sha.hexdigest()
+    return _renderer_digest
+
+
+class RenderCache:
+    """On-disk store of rendered PDF bytes addressed by input hash."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._written_since_prune: Optional[int] = None  # None until the first write prunes
+
+    @staticmethod
+    def key(**inputs: Any) -> str:
+        """Stable hash of the rendering inputs (any JSON-serializable values)."""
+        inputs["renderer"] = renderer_digest()
+        payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pdf"
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # keeps recently used entries at the back of prune()
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, data)
+        except OSError as e:
+            print(f"Could not write render cache entry: {e}")
+            return
+
+        written = self._written_since_prune
+        if written is None or written + len(data) >= self.max_bytes / PRUNE_FRACTION:
+            self._written_since_prune = 0
+            self.prune()
+        else:
+            self._written_since_prune = written + len(data)
+
+    def prune(self) -> int:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for path in self.cache_dir.glob("*/*.pdf"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
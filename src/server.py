@@ -0,0 +1,260 @@
+"""Local HTTP service for document generation.
+
+    python src/server.py --port 8765 --workers 4 --max-queue 32 --timeout 30
+
+Endpoints:
+    GET  /health      pool status and current load
+    GET  /templates   schema of every document type (from the template manifest)
+    POST /render      {"company": ..., "doc_type": ..., "data": {...}} -> application/pdf
+
+Rendering runs in a bounded pool of warm worker processes that have
+DocumentManager and every template already loaded. When the pool and its
+queue are full, new requests are rejected with 429 instead of piling up,
+and a request that takes longer than the timeout gets 504. Data is checked
+against its template before it is queued and gets 422 when rejected; any
+other failure is logged and gets a JSON 500.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from document_manager import OUTPUT_DIR, DocumentManager, InvalidDataError
+
+MAX_BODY_BYTES = 5 * 1024 * 1024
+HEADER_TIMEOUT = 10
+CHUNK_SIZE = 64 * 1024
+
+_manager: Optional[DocumentManager] = None
+
+
+def _init_worker(output_dir: Path) -> None:
+    """Load DocumentManager and import every template up front so requests start warm."""
+    global _manager
+    _manager = DocumentManager(output_dir=output_dir)
+    for doc_type in _manager.templates:
+        _manager.templates.get_template_class(doc_type)
+
+
+def _render(company: str, doc_type: str, data: Dict[str, Any]) -> bytes:
+    return _manager.render_document(company=company, doc_type=doc_type, data=data)
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class GenerationServer:
+    """asyncio front end that admits requests up to a fixed capacity."""
+
+    def __init__(self, workers: int, max_queue: int, timeout: float, output_dir: Path = OUTPUT_DIR):
+        self.workers = workers
+        self.capacity = workers + max_queue
+        self.timeout = timeout
+        self.in_flight = 0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # Only used to check requests; rendering happens in the workers
+        self.manager = DocumentManager(use_render_cache=False, use_index=False, output_dir=output_dir)
+        self.templates = self.manager.templates
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(output_dir,))
+
+    async def serve(self, host: str, port: int) -> None:
+        # Spin the workers up before accepting traffic
+        self.loop = asyncio.get_running_loop()
+        await asyncio.gather(*(self.loop.run_in_executor(self.pool, os.getpid) for _ in range(self.workers)))
+
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving on http://{host}:{port} with {self.workers} worker(s)")
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, path, body = await asyncio.wait_for(self._read_request(reader), HEADER_TIMEOUT)
+                await self._route(method, path, body, writer)
+            except HTTPError as e:
+                headers = {"Retry-After": "1"} if e.status == HTTPStatus.TOO_MANY_REQUESTS else None
+                await self._send_json(writer, e.status, {"error": str(e)}, headers)
+            except asyncio.TimeoutError:
+                await self._send_json(writer, HTTPStatus.REQUEST_TIMEOUT, {"error": "Request not received in time"})
+            except (ConnectionError, asyncio.IncompleteReadError):
+                raise
+            except Exception as e:
+                print(f"Error handling request: {e!r}")
+                traceback.print_exc()
+                await self._send_json(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        if path == "/health" and method == "GET":
+            await self._send_json(writer, HTTPStatus.OK, {
+                "status": "ok",
+                "workers": self.workers,
+                "in_flight": self.in_flight,
+                "capacity": self.capacity,
+            })
+        elif path == "/templates" and method == "GET":
+            await self._send_json(writer, HTTPStatus.OK, {t: dict(self.templates[t]) for t in self.templates})
+        elif path == "/render" and method == "POST":
+            pdf_bytes = await self._render(body)
+            await self._send(writer, HTTPStatus.OK, pdf_bytes, "application/pdf")
+        elif path in ("/health", "/templates", "/render"):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+        else:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+    async def _render(self, body: bytes) -> bytes:
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+
+        company = payload.get("company")
+        doc_type = payload.get("doc_type")
+        data = payload.get("data")
+        if not company or not isinstance(company, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'company' is required")
+        if doc_type not in self.templates:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown document type: {doc_type}")
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'data' must be an object")
+        try:
+            self._validate(company, doc_type, data)
+        except InvalidDataError as e:
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, f"Cannot render this data: {e}")
+
+        if self.in_flight >= self.capacity:
+            raise HTTPError(HTTPStatus.TOO_MANY_REQUESTS, "Server is busy, retry shortly")
+
+        # A job keeps its slot until the worker finishes, even if the client timed out
+        self.in_flight += 1
+        future = self.pool.submit(_render, company, doc_type, data)
+        future.add_done_callback(lambda _: self._release())
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPError(HTTPStatus.GATEWAY_TIMEOUT, f"Rendering took longer than {self.timeout:g}s")
+        except BrokenProcessPool:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Worker pool is unavailable")
+        except InvalidDataError as e:
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, f"Cannot render this data: {e}")
+        except Exception as e:
+            # Data that passed validation should render; anything else is a bug
+            print(f"Error rendering {doc_type}: {e!r}")
+            traceback.print_exc()
+            raise HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, "Rendering failed")
+
+    def _validate(self, company: str, doc_type: str, data: Dict[str, Any]) -> None:
+        """Reject data the worker would refuse, without taking a worker slot."""
+        if not self.manager.get_letterhead_path(company):
+            raise InvalidDataError(f"No letterhead for {company}")
+        template_class = self.templates.get_template_class(doc_type)
+        if template_class and not template_class.validate_data(data):
+            raise InvalidDataError(f"Invalid data provided for {doc_type}")
+
+    def _release(self) -> None:
+        # Called from the pool's thread; hop back onto the event loop
+        self.loop.call_soon_threadsafe(self._decrement)
+
+    def _decrement(self) -> None:
+        self.in_flight -= 1
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Headers too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Body too large")
+        body = await reader.readexactly(length) if length > 0 else b""
+        return method.upper(), target.split("?", 1)[0], body
+
+    async def _send_json(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Any,
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        await self._send(writer, status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    async def _send(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        status = HTTPStatus(status)
+        head = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        view = memoryview(body)
+        for offset in range(0, len(body), CHUNK_SIZE):
+            writer.write(view[offset:offset + CHUNK_SIZE])
+            await writer.drain()
+        await writer.drain()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve document generation over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--max-queue", type=int, default=32, help="Requests allowed to wait for a worker")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds before a render gets 504")
+    args = parser.parse_args(argv)
+
+    server = GenerationServer(args.workers, args.max_queue, args.timeout)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,17 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog, Menu
+from bisect import bisect_right
+import math
 from PIL import Image, ImageTk
-from pdf2image import convert_from_path
 import fitz  # PyMuPDF
-import os
-import tempfile
 
-POPPLER_PATH = r"D:\GoFarMediaAutomation\poppler-24.02.0\Library\bin"
+from page_renderer import PageRenderer, TILE_PX
+from signing import SAVE_OPTIONS, ImageInserter, image_digest, save_preset
+
 A4_WIDTH_PX = 794
 A4_HEIGHT_PX = 1123
+PAGE_GAP_PX = 12
+PRELOAD_TILES = 1  # extra rings of tiles rendered around the visible area
 
 class PDFSignatureApp:
     def __init__(self, root, pdf_path=None):
@@ -16,6 +19,11 @@ class PDFSignatureApp:
         self.root.title("PDF Signature Tool")
         self.pdf_path = pdf_path
         self.zoom_factor = 1.0
+        self.renderer = None
+        self.page_offsets = []  # canvas y of each page's top edge at the current zoom
+        self.page_sizes = []    # (width, height) of each page in canvas px at the current zoom
+        self.tiles = {}         # (page, col, row) -> (canvas id, PhotoImage) for tiles currently drawn
+        self._visible_job = None
         self.signature_items = []
         self.selected_item = None
         self.dragging = False
@@ -23,12 +31,19 @@ class PDFSignatureApp:
         self.canvas_frame = tk.Frame(root)
         self.canvas_frame.pack(fill=tk.BOTH, expand=True)
 
-        self.canvas = tk.Canvas(self.canvas_frame, bg="white", scrollregion=(0, 0, A4_WIDTH_PX, A4_HEIGHT_PX), cursor="arrow")
+        self.canvas = tk.Canvas(self.canvas_frame, bg="gray80", scrollregion=(0, 0, A4_WIDTH_PX, A4_HEIGHT_PX), cursor="arrow")
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         self.scroll_y = tk.Scrollbar(self.canvas_frame, orient=tk.VERTICAL, command=self.canvas.yview)
         self.scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
-        self.canvas.configure(yscrollcommand=self.scroll_y.set)
+        self.scroll_x = tk.Scrollbar(root, orient=tk.HORIZONTAL, command=self.canvas.xview)
+        self.scroll_x.pack(fill=tk.X)
+        self.canvas.configure(yscrollcommand=self._on_yscroll, xscrollcommand=self._on_xscroll)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_visible_update())
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Shift-MouseWheel>", self._on_shift_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_by(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_by(1))
 
         btn_frame = tk.Frame(root)
         btn_frame.pack(fill=tk.X, pady=5)
@@ -37,6 +52,7 @@ class PDFSignatureApp:
         tk.Button(btn_frame, text="Zoom Out", command=self.zoom_out).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Add Signature/Stamp", command=self.add_image).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Save PDF", command=self.save_pdf).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Save Preset", command=self.save_preset).pack(side=tk.LEFT, padx=5)
 
         self.root.bind("<Delete>", self.delete_selected)
 
@@ -45,31 +61,112 @@ class PDFSignatureApp:
 
     def load_pdf(self, path):
         self.pdf_path = path
-        self.original_pdf_img = convert_from_path(path, poppler_path=POPPLER_PATH)[0]
+        if self.renderer:
+            self.renderer.close()
+        self.renderer = PageRenderer(path)
+        self.signature_items = []
         self.render_pdf()
 
     def render_pdf(self):
-        img = self.original_pdf_img.copy()
-        w, h = int(A4_WIDTH_PX * self.zoom_factor), int(A4_HEIGHT_PX * self.zoom_factor)
-        img = img.resize((w, h))
-        self.pdf_img = img
-        self.tk_pdf = ImageTk.PhotoImage(img)
-
+        """Lay out every page at the current zoom and draw only the tiles near the viewport."""
         self.canvas.delete("all")
-        self.canvas.create_image(0, 0, anchor="nw", image=self.tk_pdf)
+        self.tiles.clear()
+        self.page_offsets = []
+        self.page_sizes = []
+
+        y = 0
+        for page_no in range(self.renderer.page_count):
+            w, h = self.renderer.page_size_px(page_no, self.zoom_factor)
+            self.page_offsets.append(y)
+            self.page_sizes.append((w, h))
+            y += h + PAGE_GAP_PX
+
+        width = max((w for w, _ in self.page_sizes), default=0)
+        self.canvas.config(scrollregion=(0, 0, width, max(0, y - PAGE_GAP_PX)))
 
+        self.update_visible_pages()
         for item in self.signature_items:
             self.place_on_canvas(item)
 
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+    def schedule_visible_update(self):
+        # Coalesce bursts of scroll/resize events into one update
+        if self._visible_job is None:
+            self._visible_job = self.root.after_idle(self.update_visible_pages)
+
+    def update_visible_pages(self):
+        """Draw the page tiles in or near the viewport and drop every other tile.
+
+        Pages are drawn as fixed-size tiles clipped to the visible area, so
+        memory and render time stay bounded however far the user zooms in.
+        """
+        self._visible_job = None
+        if not self.renderer:
+            return
+
+        pad = TILE_PX * PRELOAD_TILES
+        left = self.canvas.canvasx(0) - pad
+        right = self.canvas.canvasx(self.canvas.winfo_width()) + pad
+        top = self.canvas.canvasy(0) - pad
+        bottom = self.canvas.canvasy(self.canvas.winfo_height()) + pad
+
+        wanted = set()
+        page_no = self.page_at(top)
+        while page_no < len(self.page_offsets) and self.page_offsets[page_no] <= bottom:
+            page_w, page_h = self.page_sizes[page_no]
+            page_top = self.page_offsets[page_no]
+            first_col = max(0, int(left // TILE_PX))
+            last_col = min(math.ceil(page_w / TILE_PX) - 1, int(right // TILE_PX))
+            first_row = max(0, int((top - page_top) // TILE_PX))
+            last_row = min(math.ceil(page_h / TILE_PX) - 1, int((bottom - page_top) // TILE_PX))
+            for row in range(first_row, last_row + 1):
+                for col in range(first_col, last_col + 1):
+                    wanted.add((page_no, col, row))
+            page_no += 1
+
+        for key in list(self.tiles):
+            if key not in wanted:
+                canvas_id, _ = self.tiles.pop(key)
+                self.canvas.delete(canvas_id)
+
+        for key in sorted(wanted - set(self.tiles)):
+            page_no, col, row = key
+            img = self.renderer.render_tile(page_no, self.zoom_factor, col, row)
+            tk_img = ImageTk.PhotoImage(img)
+            canvas_id = self.canvas.create_image(
+                col * TILE_PX, self.page_offsets[page_no] + row * TILE_PX,
+                anchor="nw", image=tk_img, tags=("page",)
+            )
+            self.canvas.tag_lower(canvas_id)  # keep signatures above the page
+            self.tiles[key] = (canvas_id, tk_img)
+
+    def page_at(self, canvas_y):
+        """Index of the page whose area (including the gap below it) contains canvas_y."""
+        return max(0, bisect_right(self.page_offsets, canvas_y) - 1)
+
+    def _on_yscroll(self, first, last):
+        self.scroll_y.set(first, last)
+        self.schedule_visible_update()
+
+    def _on_xscroll(self, first, last):
+        self.scroll_x.set(first, last)
+        self.schedule_visible_update()
+
+    def _on_mousewheel(self, event):
+        self._scroll_by(-1 if event.delta > 0 else 1)
+
+    def _on_shift_mousewheel(self, event):
+        self.canvas.xview_scroll(-3 if event.delta > 0 else 3, "units")
+
+    def _scroll_by(self, units):
+        self.canvas.yview_scroll(units * 3, "units")
 
     def zoom_in(self):
-        self.zoom_factor += 0.1
+        self.zoom_factor = round(self.zoom_factor + 0.1, 1)
         self.render_pdf()
 
     def zoom_out(self):
         if self.zoom_factor > 0.3:
-            self.zoom_factor -= 0.1
+            self.zoom_factor = round(self.zoom_factor - 0.1, 1)
             self.render_pdf()
 
     def add_image(self):
@@ -77,14 +174,19 @@ class PDFSignatureApp:
         if not path:
             return
         pil_img = Image.open(path).convert("RGBA")
+
+        # Drop the new item near the top of whichever page is in view
+        view_top = self.canvas.canvasy(0)
+        page_no = self.page_at(view_top)
+        page_y = max(0, view_top - self.page_offsets[page_no]) / self.zoom_factor
         item = {
             "path": path,
+            "digest": image_digest(path),
             "image": pil_img,
             "rotation": 0,
+            "page": page_no,
             "x": 100,
-            "y": 100,
-            "canvas_x_px": 100 * self.zoom_factor,
-            "canvas_y_px": 100 * self.zoom_factor,
+            "y": page_y + 100,
             "width": pil_img.width,
             "height": pil_img.height,
             "id": None
@@ -99,10 +201,9 @@ class PDFSignatureApp:
         )
         item["tk_img"] = ImageTk.PhotoImage(img)
 
+        # Item positions are stored per page at zoom 1.0
         x = int(item["x"] * self.zoom_factor)
-        y = int(item["y"] * self.zoom_factor)
-        item["canvas_x_px"] = x
-        item["canvas_y_px"] = y
+        y = int(self.page_offsets[item["page"]] + item["y"] * self.zoom_factor)
 
         if item.get("id"):
             self.canvas.delete(item["id"])
@@ -130,10 +231,12 @@ class PDFSignatureApp:
 
     def stop_drag(self, event, item):
         coords = self.canvas.coords(item["id"])
-        item["canvas_x_px"] = coords[0]
-        item["canvas_y_px"] = coords[1]
-        # item["x"] = coords[0] / self.zoom_factor
-        # item["y"] = coords[1] / self.zoom_factor
+        # Re-home the item on the page under its centre so it can be dragged across pages
+        center_y = coords[1] + item["height"] * self.zoom_factor / 2
+        page_no = self.page_at(center_y)
+        item["page"] = page_no
+        item["x"] = coords[0] / self.zoom_factor
+        item["y"] = (coords[1] - self.page_offsets[page_no]) / self.zoom_factor
         self.canvas.config(cursor="arrow")
         self.dragging = False
 
@@ -151,16 +254,17 @@ class PDFSignatureApp:
             ratio = new_width / item["width"]
             item["width"] = new_width
             item["height"] = int(item["height"] * ratio)
-            self.render_pdf()
+            self.place_on_canvas(item)
 
     def rotate(self, item):
         item["rotation"] = (item["rotation"] + 45) % 360
-        self.render_pdf()
+        self.place_on_canvas(item)
 
     def delete_item(self, item):
         if item in self.signature_items:
             self.signature_items.remove(item)
-        self.render_pdf()
+        if item.get("id"):
+            self.canvas.delete(item["id"])
 
     def delete_selected(self, event=None):
         if self.selected_item:
@@ -173,47 +277,14 @@ class PDFSignatureApp:
             return
 
         doc = fitz.open(self.pdf_path)
-        page = doc[0]
-
-        # PDF size in points (72 DPI)
-        pdf_width_pt = page.rect.width
-        pdf_height_pt = page.rect.height
-
-        # Canvas/rendered image size in pixels (after zoom)
-        canvas_width = self.pdf_img.width
-        canvas_height = self.pdf_img.height
-
-        # Scale factors: canvas px → PDF points
-        scale_x = pdf_width_pt / canvas_width
-        scale_y = pdf_height_pt / canvas_height
+        inserter = ImageInserter(doc)
 
         for item in self.signature_items:
             try:
-                rotated_img = item["image"].rotate(item["rotation"], expand=True)
-
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp_file:
-                    temp_path = temp_file.name
-                    rotated_img.save(temp_path, format="PNG")
-
-                # Get canvas coordinates in pixels
-                x_canvas = item["canvas_x_px"]
-                y_canvas = item["canvas_y_px"]
-
-                # Get width & height on canvas (in pixels), accounting for zoom
-                w = item["width"] * self.zoom_factor
-                h = item["height"] * self.zoom_factor
-
-                # Convert to PDF points
-                x_pt = x_canvas * scale_x
-                y_pt = y_canvas * scale_y
-                w_pt = w * scale_x
-                h_pt = h * scale_y
-
-                # Insert image at correct location
-                rect = fitz.Rect(x_pt, y_pt, x_pt + w_pt, y_pt + h_pt)
-                page.insert_image(rect, filename=temp_path)
+                page = doc[item["page"]]
 
-                os.unlink(temp_path)
+                # Insert image at correct location; repeats of the same image share one xref
+                inserter.insert(page, self.item_rect(item), item["image"], item["digest"], item["rotation"])
 
             except Exception as e:
                 print(f"Error inserting image: {e}")
@@ -227,6 +298,41 @@ class PDFSignatureApp:
         )
 
         if save_path:
-            doc.save(save_path)
-            doc.close()
+            doc.save(save_path, **SAVE_OPTIONS)
+        doc.close()
+        if save_path:
             messagebox.showinfo("Success", f"PDF saved to:\n{save_path}")
+
+    def item_rect(self, item):
+        """Item geometry in PDF points (72 DPI); items are kept in zoom-1.0 canvas px."""
+        px_per_pt = PageRenderer.scale(1.0)
+        x_pt = item["x"] / px_per_pt
+        y_pt = item["y"] / px_per_pt
+        w_pt = item["width"] / px_per_pt
+        h_pt = item["height"] / px_per_pt
+        return fitz.Rect(x_pt, y_pt, x_pt + w_pt, y_pt + h_pt)
+
+    def save_preset(self):
+        """Save the current placements so batch_sign.py can apply them to other PDFs."""
+        if not self.signature_items:
+            messagebox.showerror("Error", "No images added.")
+            return
+
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("Placement preset", "*.json")],
+            title="Save Placement Preset"
+        )
+        if not save_path:
+            return
+
+        save_preset(save_path, [
+            {
+                "image": item["path"],
+                "page": item["page"],
+                "rect": tuple(self.item_rect(item)),
+                "rotation": item["rotation"]
+            }
+            for item in self.signature_items
+        ])
+        messagebox.showinfo("Success", f"Preset saved to:\n{save_path}")
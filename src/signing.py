@@ -0,0 +1,138 @@
+"""Placing signature and stamp images into existing PDFs with PyMuPDF.
+
+Placements can be saved as a JSON preset from the signer and replayed
+headlessly, e.g. by batch_sign.py. A preset looks like::
+
+    {"version": 1, "placements": [
+        {"image": "../assets/stamps/gofar_stamp.png", "page": -1,
+         "rect": [380.0, 620.0, 500.0, 740.0], "rotation": 0}
+    ]}
+
+``rect`` is in PDF points, ``page`` may be negative to count from the end
+and relative image paths are resolved against the preset's directory.
+"""
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from output_writer import write_atomic
+
+# Compress inserted images and drop objects nothing refers to when writing
+SAVE_OPTIONS = {"garbage": 3, "deflate": True}
+
+
+def image_digest(path: str) -> str:
+    """SHA-1 of an image file's bytes, used to recognise repeated placements.
+
+    Not to be confused with render_cache.file_digest (SHA-256, memoized).
+    """
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class ImageInserter:
+    """Inserts images into one fitz document, embedding each distinct image only once.
+
+    Images are encoded in memory and handed to PyMuPDF as a stream. The
+    first placement of a (source digest, rotation) pair embeds the image;
+    later placements on any page reference the same xref.
+    """
+
+    def __init__(self, doc: fitz.Document):
+        self.doc = doc
+        self._xrefs: Dict[Tuple[str, int], int] = {}
+
+    def insert(self, page: fitz.Page, rect: fitz.Rect, image: Image.Image, digest: str, rotation: int = 0) -> int:
+        key = (digest, rotation % 360)
+        xref = self._xrefs.get(key)
+        if xref:
+            page.insert_image(rect, xref=xref)
+            return xref
+
+        rotated = image.rotate(rotation, expand=True) if rotation else image
+        buffer = io.BytesIO()
+        rotated.save(buffer, format="PNG")
+        xref = page.insert_image(rect, stream=buffer.getvalue())
+        self._xrefs[key] = xref
+        return xref
+
+
+PRESET_VERSION = 1
+
+
+def save_preset(path: str, placements: List[Dict[str, Any]]) -> None:
+    """Write placements to a preset file, storing image paths relative to it when possible."""
+    base = Path(path).resolve().parent
+    entries = []
+    for placement in placements:
+        image = os.path.abspath(placement["image"])
+        try:
+            image = os.path.relpath(image, base)
+        except ValueError:  # different drive on Windows
+            pass
+        entries.append({
+            "image": Path(image).as_posix(),
+            "page": int(placement["page"]),
+            "rect": [round(float(v), 2) for v in placement["rect"]],
+            "rotation": int(placement.get("rotation", 0)) % 360,
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": PRESET_VERSION, "placements": entries}, f, indent=2)
+
+
+def load_preset(path: str) -> List[Dict[str, Any]]:
+    """Read a preset, resolving image paths and checking every placement."""
+    with open(path, encoding="utf-8") as f:
+        preset = json.load(f)
+    if preset.get("version") != PRESET_VERSION:
+        raise ValueError(f"Unsupported preset version: {preset.get('version')}")
+
+    base = Path(path).resolve().parent
+    placements = []
+    for entry in preset.get("placements", []):
+        rect = entry.get("rect")
+        if not isinstance(rect, list) or len(rect) != 4:
+            raise ValueError(f"Placement needs a [x0, y0, x1, y1] rect: {entry}")
+        placements.append({
+            "image": str((base / entry["image"]).resolve()),
+            "page": int(entry.get("page", 0)),
+            "rect": [float(v) for v in rect],
+            "rotation": int(entry.get("rotation", 0)),
+        })
+    if not placements:
+        raise ValueError("Preset has no placements.")
+    return placements
+
+
+class PresetSigner:
+    """Applies one preset to many PDFs, decoding each preset image only once."""
+
+    def __init__(self, placements: List[Dict[str, Any]]):
+        self.placements = placements
+        self._images: Dict[str, Tuple[Image.Image, str]] = {}
+        for placement in placements:
+            path = placement["image"]
+            if path not in self._images:
+                self._images[path] = (Image.open(path).convert("RGBA"), image_digest(path))
+
+    def sign(self, src: str, dest: str) -> None:
+        """Write a signed copy of ``src`` to ``dest`` atomically."""
+        doc = fitz.open(src)
+        try:
+            inserter = ImageInserter(doc)
+            for placement in self.placements:
+                page_no = placement["page"]
+                if not -doc.page_count <= page_no < doc.page_count:
+                    raise ValueError(f"Page {page_no} is out of range for a {doc.page_count}-page PDF")
+                image, digest = self._images[placement["image"]]
+                inserter.insert(doc[page_no], fitz.Rect(placement["rect"]), image, digest, placement["rotation"])
+            data = doc.tobytes(**SAVE_OPTIONS)
+        finally:
+            doc.close()
+        write_atomic(dest, data)
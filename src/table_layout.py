@@ -0,0 +1,205 @@
+"""Paginated table layout for fpdf documents.
+
+Every cell of a row is measured once (wrapped into lines for its column
+width), the row height is taken from the tallest cell, and the lines are
+then drawn directly with ``cell`` — no second ``multi_cell`` pass. Before
+a row is drawn the table checks whether it fits above the page break; if
+not it closes the table on the current page, starts a new page (whose
+``header()`` draws the letterhead) and repeats the column headers.
+
+Two border styles match the existing documents:
+
+    GRID     every cell boxed (sales tax invoice, salary slip)
+    COLUMNS  vertical rules between columns only, with one closing line
+             under the last row on each page (invoice line items)
+"""
+from typing import List, Optional, Sequence, Tuple
+
+from fpdf import FPDF
+
+from text_metrics import TextMetrics, shared_text_metrics
+
+GRID = "grid"
+COLUMNS = "columns"
+
+
+class Column:
+    """One table column: header text, width in mm and how its cells are drawn."""
+
+    def __init__(
+        self,
+        header: str,
+        width: float,
+        align: str = "L",
+        header_align: str = "C",
+        style: str = "",
+        valign: Optional[str] = None
+    ):
+        self.header = header
+        self.width = width
+        self.align = align
+        self.header_align = header_align
+        self.style = style
+        self.valign = valign
+
+
+class Table:
+    """Draws rows of wrapped text under repeated column headers, page by page."""
+
+    def __init__(
+        self,
+        pdf: FPDF,
+        columns: Sequence[Column],
+        x: Optional[float] = None,
+        font: Tuple[str, float] = ("Arial", 10),
+        line_height: float = 5,
+        min_row_height: float = 8,
+        padding_top: float = 0,
+        padding_bottom: float = 0,
+        valign: str = "top",
+        borders: str = GRID,
+        show_header: bool = True,
+        header_height: float = 8,
+        header_font: Tuple[str, str, float] = ("Arial", "B", 10),
+        header_fill: Optional[Tuple[int, int, int]] = None,
+        metrics: TextMetrics = shared_text_metrics
+    ):
+        self.pdf = pdf
+        self.columns = list(columns)
+        self.x = pdf.l_margin if x is None else x
+        self.width = sum(c.width for c in self.columns)
+        self.font = font
+        self.line_height = line_height
+        self.min_row_height = min_row_height
+        self.padding_top = padding_top
+        self.padding_bottom = padding_bottom
+        self.valign = valign
+        self.borders = borders
+        self.show_header = show_header
+        self.header_height = header_height
+        self.header_font = header_font
+        self.header_fill = header_fill
+        self.metrics = metrics
+        self._header_drawn = False
+        self._fresh_page = False
+        self._family_key = None
+
+    def draw_header(self) -> None:
+        """Draw the column headers at the current position (done automatically per page)."""
+        pdf = self.pdf
+        self._header_drawn = True
+        if not self.show_header:
+            return
+        pdf.set_font(*self.header_font)
+        if self.header_fill:
+            pdf.set_fill_color(*self.header_fill)
+        pdf.set_x(self.x)
+        for column in self.columns:
+            pdf.cell(column.width, self.header_height, column.header, 1, 0,
+                     align=column.header_align, fill=bool(self.header_fill))
+        pdf.set_xy(self.x, pdf.get_y() + self.header_height)
+
+    def measure(self, cells: Sequence[str]) -> Tuple[List[Sequence[str]], float]:
+        """Wrap every cell to its column width; return the lines and the row height."""
+        lines = []
+        for column, text in zip(self.columns, cells):
+            self._use_font(column.style)
+            lines.append(self.metrics.split_lines(self.pdf, str(text), column.width))
+        tallest = max(len(cell_lines) for cell_lines in lines) * self.line_height
+        height = max(self.min_row_height, self.padding_top + tallest + self.padding_bottom)
+        return lines, height
+
+    def add_row(self, cells: Sequence[str], aligns: Optional[Sequence[str]] = None) -> float:
+        """Draw one row, breaking the page first if it does not fit. Returns its height."""
+        lines, height = self.measure(cells)
+        self._reserve(height)
+        self._draw_row(lines, height, aligns)
+        return height
+
+    def add_rows(self, rows: Sequence[Sequence[str]]) -> None:
+        for cells in rows:
+            self.add_row(cells)
+
+    def add_blank_rows(self, count: int, height: Optional[float] = None) -> None:
+        """Empty ruled rows, e.g. to give a short invoice its usual table height.
+
+        Filler is cosmetic, so it stops at the page break instead of starting a page.
+        """
+        height = height or self.min_row_height
+        for _ in range(count):
+            if self.pdf.get_y() + height > self.pdf.page_break_trigger:
+                break
+            self._reserve(height)
+            self._draw_row([[] for _ in self.columns], height)
+
+    def close(self) -> None:
+        """Finish the table on the current page; an empty table still shows its headers."""
+        if not self._header_drawn:
+            self.draw_header()
+        if self.borders == COLUMNS:
+            y = self.pdf.get_y()
+            self.pdf.line(self.x, y, self.x + self.width, y)
+
+    def _use_font(self, style: str) -> None:
+        # set_font is comparatively slow and a row switches styles per column
+        pdf = self.pdf
+        family, size = self.font
+        if pdf.font_family != self._family_key or pdf.font_style != style or pdf.font_size_pt != size:
+            pdf.set_font(family, style, size)
+            self._family_key = pdf.font_family
+
+    def _reserve(self, height: float) -> None:
+        """Start a new page (closing this one) unless the headers and a row of ``height`` fit."""
+        pdf = self.pdf
+        needed = height
+        if self.show_header and not self._header_drawn:
+            needed += self.header_height
+        # On a page the table just started, a row taller than the page is drawn anyway
+        if pdf.get_y() + needed > pdf.page_break_trigger and not self._fresh_page:
+            if self._header_drawn:
+                self.close()
+            pdf.add_page()
+            self._header_drawn = False
+            self._fresh_page = True
+        if not self._header_drawn:
+            self.draw_header()
+
+    def _draw_row(self, lines: List[Sequence[str]], height: float, aligns: Optional[Sequence[str]] = None) -> None:
+        pdf = self.pdf
+        y = pdf.get_y()
+        x = self.x
+        # Rows are only started where they fit, so fpdf must not break inside one
+        auto_break = pdf.auto_page_break
+        pdf.auto_page_break = False
+        try:
+            for index, (column, cell_lines) in enumerate(zip(self.columns, lines)):
+                align = aligns[index] if aligns else column.align
+                middle = (column.valign or self.valign) == "middle"
+                if self.borders == GRID and middle and len(cell_lines) == 1:
+                    # A single centred line is exactly what a bordered cell draws
+                    self._use_font(column.style)
+                    pdf.set_xy(x, y)
+                    pdf.cell(column.width, height, cell_lines[0], 1, 0, align=align)
+                    x += column.width
+                    continue
+                if self.borders == GRID:
+                    pdf.rect(x, y, column.width, height)
+                else:
+                    pdf.line(x, y, x, y + height)
+                if cell_lines:
+                    self._use_font(column.style)
+                    if middle:
+                        text_y = y + (height - len(cell_lines) * self.line_height) / 2
+                    else:
+                        text_y = y + self.padding_top
+                    for line in cell_lines:
+                        pdf.set_xy(x, text_y)
+                        pdf.cell(column.width, self.line_height, line, 0, 0, align=align)
+                        text_y += self.line_height
+                x += column.width
+            if self.borders == COLUMNS:
+                pdf.line(x, y, x, y + height)
+        finally:
+            pdf.auto_page_break = auto_break
+        pdf.set_xy(self.x, y + height)
+        self._fresh_page = False
@@ -0,0 +1,161 @@
+"""Lazy registry of document templates backed by a cached manifest.
+
+The manifest (templates/manifest.json) records, for every document type,
+the module that implements it, its template schema and a digest of the
+module source. Listing types or building forms only reads the manifest; a
+template module is imported the first time its class is actually needed.
+When a template module changes, a rebuilt manifest is kept under
+``generated_docs/.template_cache`` until the tracked one is refreshed with
+``python src/template_registry.py``; the source tree is never written to
+at runtime.
+"""
+import hashlib
+import importlib
+import json
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from output_writer import write_atomic
+
+SRC_DIR = Path(__file__).parent
+TEMPLATES_DIR = SRC_DIR / "templates"
+MANIFEST_PATH = TEMPLATES_DIR / "manifest.json"
+CACHED_MANIFEST_PATH = SRC_DIR.parent / "generated_docs" / ".template_cache" / "manifest.json"
+MANIFEST_VERSION = 1
+
+# Ensure the src directory is importable for "templates.*" modules
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+
+def _template_modules(templates_dir: Path) -> Dict[str, Path]:
+    return {
+        f"templates.{path.stem}": path
+        for path in sorted(templates_dir.glob("*.py"))
+        if path.name not in ("__init__.py", "base_template.py")
+    }
+
+
+def _source_digest(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def build_manifest(templates_dir: Path = TEMPLATES_DIR) -> Dict[str, Any]:
+    """Import every template module once and describe it for the manifest."""
+    templates = {}
+    for module_name, path in _template_modules(templates_dir).items():
+        try:
+            module = importlib.import_module(module_name)
+            template_data = module.get_template_class().get_template()
+        except (ImportError, AttributeError) as e:
+            print(f"Error loading template {path.name}: {e}")
+            continue
+        templates[template_data["type"]] = {
+            "module": module_name,
+            "digest": _source_digest(path),
+            "schema": template_data,
+        }
+    return {"version": MANIFEST_VERSION, "templates": templates}
+
+
+def _is_current(manifest: Dict[str, Any], templates_dir: Path) -> bool:
+    if manifest.get("version") != MANIFEST_VERSION:
+        return False
+    modules = _template_modules(templates_dir)
+    recorded = {entry["module"]: entry["digest"] for entry in manifest.get("templates", {}).values()}
+    if set(recorded) != set(modules):
+        return False
+    return all(recorded[name] == _source_digest(path) for name, path in modules.items())
+
+
+def write_manifest(manifest: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+
+
+def load_manifest(
+    templates_dir: Path = TEMPLATES_DIR,
+    manifest_path: Path = MANIFEST_PATH,
+    cached_path: Path = CACHED_MANIFEST_PATH
+) -> Dict[str, Any]:
+    """Read the tracked manifest, or the cached rebuild when template modules changed since."""
+    for path in (manifest_path, cached_path):
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+            if _is_current(manifest, templates_dir):
+                return manifest
+        except (OSError, ValueError, KeyError):
+            pass
+
+    manifest = build_manifest(templates_dir)
+    try:
+        # Written atomically: worker processes starting together may all rebuild it
+        write_manifest(manifest, cached_path)
+    except OSError as e:
+        print(f"Could not write template manifest: {e}")
+    return manifest
+
+
+class TemplateEntry(dict):
+    """Template schema whose "template_class" is imported on first access."""
+
+    def __init__(self, schema: Dict[str, Any], registry: "TemplateRegistry"):
+        super().__init__(schema)
+        self._registry = registry
+
+    def __missing__(self, key: str) -> Any:
+        if key != "template_class":
+            raise KeyError(key)
+        template_class = self._registry.get_template_class(self["type"])
+        self["template_class"] = template_class
+        return template_class
+
+
+class TemplateRegistry(Mapping):
+    """Read-only mapping of document type to template schema."""
+
+    def __init__(
+        self,
+        templates_dir: Path = TEMPLATES_DIR,
+        manifest_path: Path = MANIFEST_PATH,
+        cached_path: Path = CACHED_MANIFEST_PATH
+    ):
+        manifest = load_manifest(templates_dir, manifest_path, cached_path)
+        self._manifest: Dict[str, Dict[str, Any]] = manifest["templates"]
+        self._entries = {
+            doc_type: TemplateEntry(info["schema"], self)
+            for doc_type, info in self._manifest.items()
+        }
+        self._instances: Dict[str, Any] = {}
+
+    def __getitem__(self, doc_type: str) -> TemplateEntry:
+        return self._entries[doc_type]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def module_name(self, doc_type: str) -> str:
+        return self._manifest[doc_type]["module"]
+
+    def digest(self, doc_type: str) -> str:
+        """Digest of the template module source, usable as a template version."""
+        return self._manifest[doc_type]["digest"]
+
+    def get_template_class(self, doc_type: str) -> Optional[Any]:
+        """Import the template module for ``doc_type`` if needed and return its template."""
+        if doc_type not in self._manifest:
+            return None
+        if doc_type not in self._instances:
+            module = importlib.import_module(self.module_name(doc_type))
+            self._instances[doc_type] = module.get_template_class()
+        return self._instances[doc_type]
+
+
+if __name__ == "__main__":
+    write_manifest(build_manifest(), MANIFEST_PATH)
+    print(f"Wrote {MANIFEST_PATH}")
@@ -24,4 +24,8 @@ class BaseTemplate(ABC):
     @abstractmethod
     def generate_pdf_content(self, pdf_generator: 'PDFGenerator', data: Dict[str, Any]) -> None:
         """Generate the PDF content for this template."""
-        pass
\ No newline at end of file
+        pass
+
+    def summarize(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Facts recorded in the document index: number, party, date, total and tax."""
+        return {"date": data.get("Date")}
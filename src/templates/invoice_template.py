@@ -1,8 +1,10 @@
 from fpdf import FPDF
 from .base_template import BaseTemplate
 from typing import Dict, Any, List
-from num2words import num2words
-import locale
+from amount_words import amount_in_words
+from formatting import format_amount, parse_amount
+from table_layout import COLUMNS, Column, Table
+from text_metrics import shared_text_metrics
 
 
 class InvoiceTemplate(BaseTemplate):
@@ -44,10 +46,22 @@ class InvoiceTemplate(BaseTemplate):
         if not isinstance(data["line_items"], list):
             return False
         for item in data["line_items"]:
-            if not all(k in item for k in self.get_template()["line_items"]["columns"]):
+            if not isinstance(item, dict) or not all(k in item for k in self.get_template()["line_items"]["columns"]):
                 return False
         return True
 
+    def summarize(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "number": data.get("Invoice No"),
+            "party": data.get("M/s"),
+            "date": data.get("Date"),
+            "total": self._total(data.get("line_items", [])),
+        }
+
+    @staticmethod
+    def _total(items: List[Dict[str, str]]) -> float:
+        return sum(parse_amount(item.get("Amount", "0")) for item in items)
+
     def generate_pdf_content(self, pdf: FPDF, data: Dict[str, Any]) -> None:
         pdf.set_font("Arial", 'B', 16)
         pdf.cell(0, 10, self.template_type.upper(), 0, 1, 'C')
@@ -66,37 +80,26 @@ class InvoiceTemplate(BaseTemplate):
         y = pdf.get_y()
         right_side_y = y
 
-        pdf.set_font("Arial", '', 10)
-        m_s_text = str(data.get("M/s", ""))
-        m_s_width = 60
-        m_s_lines = pdf.multi_cell(m_s_width, line_height, m_s_text, border=0, split_only=True)
-        m_s_height = max(line_height, len(m_s_lines) * line_height)
-
-        pdf.set_xy(left_x, y)
-        pdf.set_font("Arial", 'B', 10)
-        pdf.cell(30, m_s_height, "M/s:", border=1, align='L')
-        pdf.set_font("Arial", '', 10)
-        pdf.multi_cell(60, line_height, m_s_text, border=1, align='L')
-
-        campaign_text = str(data.get("Campaign", ""))
-        campaign_lines = pdf.multi_cell(m_s_width, line_height, campaign_text, border=0, split_only=True)
-        campaign_height = max(line_height, len(campaign_lines) * line_height)
-
-        pdf.set_xy(left_x, y + m_s_height)
-        pdf.set_font("Arial", 'B', 10)
-        pdf.cell(30, campaign_height, "Campaign:", border=1, align='L')
-        pdf.set_font("Arial", '', 10)
-        pdf.multi_cell(60, line_height, campaign_text, border=1, align='L')
-
-        left_side_height = m_s_height + campaign_height
+        # Labels are centred against values that may wrap over several lines
+        boxes = Table(
+            pdf,
+            [Column("", 30, style='B', valign="middle"), Column("", 60)],
+            x=left_x,
+            line_height=line_height,
+            min_row_height=line_height,
+            show_header=False
+        )
+        boxes.add_row(["M/s:", str(data.get("M/s", ""))])
+        boxes.add_row(["Campaign:", str(data.get("Campaign", ""))])
+        left_side_height = pdf.get_y() - y
 
         def write_underlined_field(label, value):
             pdf.set_font("Arial", 'B', 10)
             label_str = f"{label}:"
-            label_width = pdf.get_string_width(label_str) + 1
+            label_width = shared_text_metrics.string_width(pdf, label_str) + 1
             pdf.set_font("Arial", '', 10)
             value_str = str(value)
-            value_width = pdf.get_string_width(value_str) + 1
+            value_width = shared_text_metrics.string_width(pdf, value_str) + 1
             total_width = label_width + value_width
             start_x = pdf.get_x()
             start_y = pdf.get_y()
@@ -119,25 +122,30 @@ class InvoiceTemplate(BaseTemplate):
         pdf.ln(5)
 
     def _add_line_items(self, pdf: FPDF, items: List[Dict[str, str]]) -> None:
-        headers = ["Sr.", "Description", "Size", "Duration", "Amount"]
-        col_widths = [10, 90, 20, 25, 35]
-        start_x = 10
-        row_min_height = 15
-        top_padding = 2
+        table = Table(
+            pdf,
+            [
+                Column("Sr.", 10, align='C'),
+                Column("Description", 90),
+                Column("Size", 20, align='C'),
+                Column("Duration", 25, align='C'),
+                Column("Amount", 35, align='C', style='B'),
+            ],
+            x=10,
+            font=("Arial", 11),
+            line_height=5,
+            min_row_height=15,
+            padding_top=2,
+            borders=COLUMNS,
+            header_font=("Arial", 'B', 9),
+            header_fill=(240, 240, 240)
+        )
 
         pdf.ln(5)
-        pdf.set_font("Arial", 'B', 9)
-        pdf.set_fill_color(240, 240, 240)
-        pdf.set_x(start_x)
-        for i, header in enumerate(headers):
-            pdf.cell(col_widths[i], 8, header, 1, 0, align='C', fill=True)
-        pdf.ln()
-
-        pdf.set_font("Arial", '', 11)
         for idx, item in enumerate(items, 1):
-            description = item.get("Description", "").strip()
-            start = item.get("Campaign Start Date", "").strip()
-            end = item.get("Campaign End Date", "").strip()
+            description = str(item.get("Description", "")).strip()
+            start = str(item.get("Campaign Start Date", "")).strip()
+            end = str(item.get("Campaign End Date", "")).strip()
             full_desc = description
             if start or end:
                 full_desc += "\n\n"
@@ -145,71 +153,21 @@ class InvoiceTemplate(BaseTemplate):
                 full_desc += f"Campaign Start: {start}"
             if end:
                 full_desc += f"\nCampaign End: {end}"
-            y_start = pdf.get_y()
-            max_y = y_start
-
-            pdf.set_xy(start_x, y_start + top_padding)
-            pdf.multi_cell(col_widths[0], 5, str(idx), border=0, align='C')
-            max_y = max(max_y, pdf.get_y())
-
-            pdf.set_xy(start_x + col_widths[0], y_start + top_padding)
-            pdf.multi_cell(col_widths[1], 5, full_desc, border=0, align='L')
-            max_y = max(max_y, pdf.get_y())
-
-            pdf.set_xy(start_x + col_widths[0] + col_widths[1], y_start + top_padding)
-            pdf.multi_cell(col_widths[2], 5, item.get("Size", ""), border=0, align='C')
-            max_y = max(max_y, pdf.get_y())
-
-            pdf.set_xy(start_x + col_widths[0] + col_widths[1] + col_widths[2], y_start + top_padding)
-            pdf.multi_cell(col_widths[3], 5, item.get("Duration", ""), border=0, align='C')
-            max_y = max(max_y, pdf.get_y())
-
-            amount_val = f"Rs. {item.get('Amount', '')}/-"
-            pdf.set_font("Arial", 'B', 11)
-            pdf.set_xy(start_x + col_widths[0] + col_widths[1] + col_widths[2] + col_widths[3], y_start + top_padding)
-            pdf.multi_cell(col_widths[4], 5, amount_val, border=0, align='C')
-            max_y = max(max_y, pdf.get_y())
-
 
-            pdf.set_font("Arial", '', 11)
+            table.add_row([
+                str(idx),
+                full_desc,
+                str(item.get("Size", "")),
+                str(item.get("Duration", "")),
+                f"Rs. {item.get('Amount', '')}/-",
+            ])
 
-
-
-            final_y = max(max_y, y_start + row_min_height)
-            current_x = start_x
-            for w in col_widths:
-                pdf.line(current_x, y_start, current_x, final_y)
-                current_x += w
-            pdf.line(current_x, y_start, current_x, final_y)
-            pdf.set_y(final_y)
-
-        remaining_rows = max(0, 6 - len(items))
-        for _ in range(remaining_rows):
-            y_start = pdf.get_y()
-            y_end = y_start + row_min_height
-            current_x = start_x
-            for w in col_widths:
-                pdf.line(current_x, y_start, current_x, y_end)
-                current_x += w
-            pdf.line(current_x, y_start, current_x, y_end)
-            pdf.set_y(y_end)
-
-        table_bottom_y = pdf.get_y()
-        pdf.line(start_x, table_bottom_y, start_x + sum(col_widths), table_bottom_y)
+        table.add_blank_rows(max(0, 6 - len(items)))
+        table.close()
 
     def _add_totals_and_footer(self, pdf: FPDF, items: List[Dict[str, str]]) -> None:
-        total = 0
-        for item in items:
-            try:
-                amt = float(item.get("Amount", "0").replace(",", ""))
-                total += amt
-            except:
-                continue
-
-        try:
-            total_str = locale.currency(total, grouping=True, symbol=False)
-        except:
-            total_str = f"{total:,.2f}"
+        total = self._total(items)
+        total_str = format_amount(total)
 
         pdf.set_font("Arial", 'B', 10)
         pdf.set_fill_color(245, 245, 245)
@@ -229,9 +187,9 @@ class InvoiceTemplate(BaseTemplate):
 
         pdf.set_font("Arial", 'IU', 12)
         try:
-            amount_words = num2words(int(round(total)), lang='en_IN').capitalize()
-            words = f"Amount in words: {amount_words} rupees only"
-        except:
+            # Invoices state whole rupees in words; the figure above keeps the paisa
+            words = f"Amount in words: {amount_in_words(int(round(total)))} only"
+        except ValueError:
             words = f"Amount in words: {total} rupees only"
         pdf.set_x(10)
         pdf.multi_cell(0, 6, words, 0, 'L')
@@ -25,7 +25,10 @@ class LetterTemplate(BaseTemplate):
 
     def validate_data(self, data: Dict[str, Any]) -> bool:
         required = ["Date", "To", "Subject", "content"]
-        return all(data.get(field) for field in required)
+        return all(data.get(field) for field in required) and isinstance(data["content"], str)
+
+    def summarize(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {"party": data.get("To"), "date": data.get("Date")}
 
     def generate_pdf_content(self, pdf: FPDF, data: Dict[str, Any]) -> None:
         pdf.set_font("Arial", 'B', 16)
@@ -36,7 +39,7 @@ class LetterTemplate(BaseTemplate):
         for label, _ in self.get_template()["header_fields"]:
             pdf.cell(35, 8, f"{label}:", 0, 0)
             pdf.set_font("Arial", '', 10)
-            pdf.cell(0, 8, data.get(label, ""), 0, 1)
+            pdf.cell(0, 8, str(data.get(label, "")), 0, 1)
             pdf.set_font("Arial", 'B', 10)
         pdf.ln(5)
 
@@ -1,8 +1,9 @@
 from fpdf import FPDF
 from .base_template import BaseTemplate
 from typing import Dict, Any, List
-from num2words import num2words
-import locale
+from amount_words import amount_in_words
+from formatting import format_amount, parse_amount
+from table_layout import Column, Table
 
 class SalaryTemplate(BaseTemplate):
     @property
@@ -63,12 +64,17 @@ class SalaryTemplate(BaseTemplate):
                     return False
         return True
 
-    def generate_pdf_content(self, pdf: FPDF, data: Dict[str, Any]) -> None:
-        try:
-            locale.setlocale(locale.LC_ALL, '')
-        except:
-            pass
+    def summarize(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        earnings = sum(parse_amount(row.get("Amount", "0")) for row in data.get("Earnings", []))
+        deductions = sum(parse_amount(row.get("Amount", "0")) for row in data.get("Deductions", []))
+        return {
+            "number": data.get("Employee No"),
+            "party": data.get("Employee Name"),
+            "date": data.get("Month"),
+            "total": earnings - deductions,
+        }
 
+    def generate_pdf_content(self, pdf: FPDF, data: Dict[str, Any]) -> None:
         pdf.set_font("Arial", 'B', 16)
         pdf.cell(0, 12, self.template_type.upper(), ln=True, align='C')
         pdf.ln(6)
@@ -87,22 +93,21 @@ class SalaryTemplate(BaseTemplate):
             pdf.set_font("Arial", 'B', 11)
             pdf.cell(0, 8, title, ln=True)
 
-            pdf.set_font("Arial", 'B', 10)
-            pdf.cell(120, 8, "Particulars", border=1)
-            pdf.cell(60, 8, "Amount (PKR)", border=1, ln=True, align='R')
+            table = Table(
+                pdf,
+                [Column("Particulars", 120, header_align='L'), Column("Amount (PKR)", 60, align='R', header_align='R')],
+                valign="middle",
+                padding_top=1.5,
+                padding_bottom=1.5
+            )
 
-            pdf.set_font("Arial", '', 10)
             total = 0.0
             for row in items:
-                particular = row.get("Particulars", "")
-                amount_str = row.get("Amount", "0").replace(",", "")
-                try:
-                    amount = float(amount_str)
-                except:
-                    amount = 0.0
+                particular = str(row.get("Particulars", ""))
+                amount = parse_amount(row.get("Amount", "0"))
                 total += amount
-                pdf.cell(120, 8, particular, border=1)
-                pdf.cell(60, 8, f"{amount:,.2f}", border=1, ln=True, align='R')
+                table.add_row([particular, format_amount(amount)])
+            table.close()
             pdf.ln(4)
             return total
 
@@ -116,17 +121,17 @@ class SalaryTemplate(BaseTemplate):
 
         pdf.set_font("Arial", 'B', 11)
         pdf.cell(120, 10, "NET PAY", border=1, align='R')
-        pdf.cell(60, 10, f"{net_pay:,.2f}", border=1, ln=True, align='R')
+        pdf.cell(60, 10, format_amount(net_pay), border=1, ln=True, align='R')
         pdf.ln(5)
 
         # Amount in Words
         try:
-            words = num2words(net_pay, lang='en_IN').capitalize()
-        except:
-            words = f"{net_pay:,.2f}"
+            words = f"{amount_in_words(net_pay)} only"
+        except ValueError:
+            words = f"{format_amount(net_pay)} rupees only"
 
         pdf.set_font("Arial", 'I', 10)
-        pdf.multi_cell(0, 6, f"Amount in words: {words} rupees only", 0, 'L')
+        pdf.multi_cell(0, 6, f"Amount in words: {words}", 0, 'L')
 
 
 def get_template_class():
@@ -1,9 +1,10 @@
 from fpdf import FPDF
 from .base_template import BaseTemplate
-from typing import Dict, Any
-from num2words import num2words
+from typing import Dict, Any, Tuple
+from amount_words import amount_in_words
 from datetime import datetime
-import locale
+from formatting import format_whole_amount, parse_amount
+from table_layout import Column, Table
 
 
 class SalesTaxTemplate(BaseTemplate):
@@ -37,11 +38,27 @@ class SalesTaxTemplate(BaseTemplate):
             return False
         if not isinstance(data.get("line_items"), list):
             return False
-        return True
+        return all(isinstance(item, dict) for item in data["line_items"])
 
-    def generate_pdf_content(self, pdf: FPDF, data: dict) -> None:
-        locale.setlocale(locale.LC_ALL, '')
+    def summarize(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        _, gst_total, grand_total = self._totals(data)
+        return {
+            "number": data.get("Invoice No"),
+            "party": data.get("M/s."),
+            "date": data.get("Date"),
+            "total": grand_total,
+            "tax": gst_total,
+        }
 
+    @staticmethod
+    def _totals(data: Dict[str, Any]) -> Tuple[float, float, float]:
+        """Subtotal, GST (rounded to whole rupees) and grand total."""
+        subtotal = sum(parse_amount(item.get("Amount", "0")) for item in data.get("line_items", []))
+        gst_rate = parse_amount(data.get("GST Percentage", 15), default=15)
+        gst_total = round(subtotal * gst_rate / 100)
+        return subtotal, gst_total, subtotal + gst_total
+
+    def generate_pdf_content(self, pdf: FPDF, data: dict) -> None:
         pdf.set_font("Arial", 'B', 16)
         pdf.cell(0, 12, self.template_type.upper(), ln=True, align='C')
         pdf.ln(5)
@@ -73,7 +90,7 @@ class SalesTaxTemplate(BaseTemplate):
             pdf.set_font("Arial", 'B', 10)
             pdf.cell(35, box_height, f"{field}:", border=1)
             pdf.set_font("Arial", '', 10)
-            pdf.cell(50, box_height, data.get(field, ""), border=1, ln=1)
+            pdf.cell(50, box_height, str(data.get(field, "")), border=1, ln=1)
             y_start += box_height
 
         # Right box
@@ -84,63 +101,62 @@ class SalesTaxTemplate(BaseTemplate):
             pdf.set_font("Arial", 'B', 10)
             pdf.cell(35, box_height, f"{label}:", border=1)
             pdf.set_font("Arial", '', 10)
-            pdf.cell(50, box_height, value, border=1, ln=1)
+            pdf.cell(50, box_height, str(value), border=1, ln=1)
             y_top += box_height
 
         pdf.ln(8)
 
-        # Table header
-        headers = ["Sr", "Description", "Size", "Duration", "Start Date", "End Date", "Amount"]
+        # Line items table
         widths = [8, 60, 15, 18, 23, 23, 30]
-
-        pdf.set_font("Arial", 'B', 9)
-        pdf.set_fill_color(230, 230, 230)
-        for header, width in zip(headers, widths):
-            pdf.cell(width, 8, header, 1, 0, 'C', fill=True)
-        pdf.ln()
+        table = Table(
+            pdf,
+            [Column(header, width) for header, width in zip(
+                ["Sr", "Description", "Size", "Duration", "Start Date", "End Date", "Amount"], widths)],
+            font=("Arial", 9),
+            valign="middle",
+            padding_top=1.5,
+            padding_bottom=1.5,
+            header_font=("Arial", 'B', 9),
+            header_fill=(230, 230, 230)
+        )
 
         # Line items + inside table totals
-        pdf.set_font("Arial", '', 9)
-        subtotal = 0
         for idx, item in enumerate(data.get("line_items", []), 1):
             values = [
                 str(idx),
-                item.get("Description", ""),
-                item.get("Size", ""),
-                item.get("Duration", ""),
-                item.get("Start Date", ""),
-                item.get("End Date", ""),
-                f"{float(item.get('Amount', '0').replace(',', '')):,.0f}"
+                str(item.get("Description", "")),
+                str(item.get("Size", "")),
+                str(item.get("Duration", "")),
+                str(item.get("Start Date", "")),
+                str(item.get("End Date", "")),
+                format_whole_amount(parse_amount(item.get('Amount', '0')))
             ]
-            for val, width in zip(values, widths):
-                align = 'R' if val.replace(',', '').isdigit() else 'L'
-                pdf.cell(width, 8, val, 1, 0, align)
-            pdf.ln()
-            subtotal += float(item.get("Amount", "0").replace(",", ""))
+            table.add_row(values, aligns=['R' if val.replace(',', '').isdigit() else 'L' for val in values])
+        table.close()
 
         # GST row (inside table)
-        gst_rate = float(data.get("GST Percentage", 15))
-        gst_total = round(subtotal * gst_rate / 100)
+        gst_rate = parse_amount(data.get("GST Percentage", 15), default=15)
+        _, gst_total, grand_total = self._totals(data)
+        pdf.set_font("Arial", '', 9)
         pdf.cell(sum(widths[:-1]), 8, f"GST @ {gst_rate:.0f}%", 1, 0, 'L')
         pdf.set_font("Arial", 'B', 9)
-        pdf.cell(widths[-1], 8, f"{gst_total:,.0f}", 1, 1, 'R')
+        pdf.cell(widths[-1], 8, format_whole_amount(gst_total), 1, 1, 'R')
         pdf.set_font("Arial", '', 9)
 
         # Grand total row (full width)
-        grand_total = subtotal + gst_total
         pdf.set_font("Arial", 'B', 10)
         pdf.cell(sum(widths[:-1]), 8, "Total", 1, 0, 'C')
-        pdf.cell(widths[-1], 8, f"{grand_total:,.0f}", 1, 1, 'R')
+        pdf.cell(widths[-1], 8, format_whole_amount(grand_total), 1, 1, 'R')
 
         pdf.ln(6)
 
         # Amount in words
         pdf.set_font("Arial", 'I', 9)
         try:
-            words = num2words(grand_total, lang='en_IN').capitalize()
-        except:
-            words = str(grand_total)
-        pdf.multi_cell(0, 6, f"Rupees in words: {words} Rupees Only/=", border=0)
+            words = amount_in_words(grand_total, rupees="Rupees", paisa="Paisa")
+        except ValueError:
+            words = f"{grand_total} Rupees"
+        pdf.multi_cell(0, 6, f"Rupees in words: {words} Only/=", border=0)
 
 
 def get_template_class():
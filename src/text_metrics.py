@@ -0,0 +1,81 @@
+"""Memoized text measurement for fpdf layout.
+
+String widths and line splits depend only on the font, its size, the
+spacing settings, the text and (for splits) the column width, so the
+results can be shared by every FPDF document in the process. Repeated
+labels ("Date:", "Invoice No:") and descriptions in a large batch are
+measured once instead of once per document.
+"""
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from fpdf import FPDF
+
+DEFAULT_MAX_ENTRIES = 50000
+
+
+class TextMetrics:
+    """Process-wide cache of string widths and wrapped lines.
+
+    Entries are evicted oldest-first once ``max_entries`` is reached. The
+    table and counters are guarded by a lock; text is measured outside it,
+    so two threads may measure the same text once each.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _font_key(pdf: FPDF) -> Tuple:
+        # The font name already includes the style (e.g. "Helvetica-Bold")
+        return (pdf.current_font.get("name"), pdf.font_size_pt, pdf.font_stretching, pdf.char_spacing)
+
+    def _lookup(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self.hits += 1
+            return value
+
+    def _store(self, key: Tuple, value: Any) -> Any:
+        with self._lock:
+            self.misses += 1
+            entries = self._entries
+            if key not in entries:
+                while entries and len(entries) >= self.max_entries:
+                    del entries[next(iter(entries))]
+            entries[key] = value
+        return value
+
+    def string_width(self, pdf: FPDF, text: str) -> float:
+        """Width of ``text`` in the current font, as ``pdf.get_string_width`` returns it."""
+        key = ("w", self._font_key(pdf), text)
+        width = self._lookup(key)
+        if width is not None:
+            return width
+        return self._store(key, pdf.get_string_width(text))
+
+    def split_lines(self, pdf: FPDF, text: str, width: float) -> Tuple[str, ...]:
+        """Lines ``multi_cell(width, ...)`` would print ``text`` on, in the current font."""
+        key = ("l", self._font_key(pdf), pdf.c_margin, width, text)
+        lines = self._lookup(key)
+        if lines is not None:
+            return lines
+        # Most cells are one short line; only real wrapping needs fpdf's line breaker
+        if "\n" not in text and self.string_width(pdf, text) <= width - 2 * pdf.c_margin:
+            lines = (text,)
+        else:
+            lines = tuple(pdf.multi_cell(width, txt=text, dry_run=True, output="LINES"))
+        return self._store(key, lines)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+shared_text_metrics = TextMetrics()
@@ -0,0 +1,123 @@
+import sys
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageCms
+
+# Modules in src/ import each other as top-level modules, as when run from there
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from asset_optimizer import AssetOptimizer, shared_asset_optimizer  # noqa: E402
+from fonts import shared_fonts  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_caches(tmp_path_factory):
+    """Point the process-wide asset and font caches at a scratch directory.
+
+    Session scoped so worker processes forked by server and batch tests
+    inherit it too; nothing is written under the repository's generated_docs.
+    """
+    cache_root = tmp_path_factory.mktemp("caches")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(shared_asset_optimizer, "cache_dir", cache_root / "asset_cache")
+        mp.setattr(shared_asset_optimizer, "_entries", {})
+        mp.setattr(shared_fonts, "cache_dir", cache_root / "font_cache")
+        yield cache_root
+
+
+@pytest.fixture
+def asset_optimizer(tmp_path):
+    """A fresh AssetOptimizer caching into tmp_path, for tests that inspect derivatives."""
+    return AssetOptimizer(cache_dir=tmp_path / "asset_cache")
+
+
+@pytest.fixture
+def stamp(tmp_path):
+    """A stamp image with a transparent border, under tmp_path/images."""
+    path = tmp_path / "images" / "stamp.png"
+    path.parent.mkdir()
+    img = Image.new("RGBA", (300, 300), (0, 0, 0, 0))
+    img.paste((30, 60, 200, 255), (40, 40, 260, 260))
+    img.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def profiled_png(tmp_path):
+    """A small RGB PNG carrying an embedded sRGB ICC profile."""
+    profile = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+    path = tmp_path / "profiled.png"
+    Image.new("RGB", (40, 20), (200, 30, 30)).save(path, icc_profile=profile)
+    return str(path)
+
+
+@pytest.fixture
+def invoice_data():
+    return {
+        "M/s": "ABC Traders", "Campaign": "Summer", "Date": "2025-08-05", "Invoice No": "1043",
+        "Invoice Month": "August 2025",
+        "line_items": [{
+            "Description": "Billboard", "Campaign Start Date": "2025-08-01", "Campaign End Date": "2025-08-31",
+            "Size": "10x20", "Duration": "1 month", "Amount": "150,000.50",
+        }],
+    }
+
+
+@pytest.fixture
+def salary_data():
+    return {
+        "Employee Name": "Ali Raza", "Employee No": "E-7", "Designation": "Engineer", "Department": "IT",
+        "CNIC": "35202-1234567-1", "Month": "August 2025",
+        "Earnings": [{"Particulars": "Basic Salary", "Amount": "50000"}],
+        "Deductions": [{"Particulars": "Income Tax (TDS)", "Amount": "1000"}],
+    }
+
+
+@pytest.fixture
+def sales_tax_data():
+    return {
+        "M/s.": "ABC", "Campaign": "Summer", "PO Number": "P1", "NTN": "1", "STRN": "2",
+        "Date": "2025-08-01", "Invoice No": "9", "Company NTN": "3", "Company STN": "4", "GST Percentage": "15",
+        "line_items": [{
+            "Description": "Billboard", "Size": "10x20", "Duration": "1 month",
+            "Start Date": "2025-08-01", "End Date": "2025-08-31", "Amount": "1,000",
+        }],
+    }
+
+
+def _build_font(path, codepoints):
+    """A minimal TrueType font with a square glyph for each codepoint."""
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    def square():
+        pen = TTGlyphPen(None)
+        pen.moveTo((50, 0))
+        pen.lineTo((50, 600))
+        pen.lineTo((450, 600))
+        pen.lineTo((450, 0))
+        pen.closePath()
+        return pen.glyph()
+
+    names = [".notdef"] + [f"uni{cp:04X}" for cp in codepoints]
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(names)
+    builder.setupCharacterMap({cp: f"uni{cp:04X}" for cp in codepoints})
+    builder.setupGlyf({name: square() for name in names})
+    builder.setupHorizontalMetrics({name: (500, 50) for name in names})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({"familyName": "Test Sans", "styleName": "Regular"})
+    builder.setupOS2(sTypoAscender=800, sTypoDescender=-200, usWinAscent=800, usWinDescent=200)
+    builder.setupPost()
+    builder.save(str(path))
+
+
+@pytest.fixture
+def font_dir(tmp_path):
+    """A font directory with only a regular face, covering ASCII, Latin-1 and Arabic."""
+    directory = tmp_path / "fonts"
+    directory.mkdir()
+    codepoints = list(range(0x20, 0x7F)) + list(range(0xA0, 0x100)) + list(range(0x600, 0x700))
+    _build_font(directory / "TestSans-Regular.ttf", codepoints)
+    return directory
@@ -0,0 +1,51 @@
+import fitz
+import pytest
+
+from amount_words import amount_in_words, amounts_in_words, number_to_words
+from document_manager import DocumentManager
+
+
+@pytest.mark.parametrize("amount, words", [
+    (0, "Zero rupees"),
+    (1, "One rupee"),
+    (1001, "One thousand and one rupees"),
+    (150000.5, "One lakh, fifty thousand rupees and fifty paisa"),
+    (12345678, "One crore, twenty-three lakh, forty-five thousand, six hundred and seventy-eight rupees"),
+    (100000000, "Ten crore rupees"),
+    (0.5, "Fifty paisa"),
+    (-2, "Minus two rupees"),
+])
+def test_amount_in_words(amount, words):
+    assert amount_in_words(amount) == words
+
+
+def test_paisa_round_half_up():
+    assert amount_in_words(1.005) == "One rupee and one paisa"
+
+
+def test_custom_unit_names():
+    assert amount_in_words(1, rupees="Rupees", paisa="Paisa") == "One Rupee"
+    assert amount_in_words(2.25, rupees="Rupees", paisa="Paisa") == "Two Rupees and twenty-five Paisa"
+
+
+def test_rejects_values_that_are_not_amounts():
+    with pytest.raises(ValueError):
+        amount_in_words(float("inf"))
+    with pytest.raises(ValueError):
+        amount_in_words("abc")
+    with pytest.raises(ValueError):
+        number_to_words(-1)
+
+
+def test_amounts_in_words_matches_single_conversions():
+    amounts = [1001, 0.5, 1001, 12345678]
+    assert amounts_in_words(amounts) == [amount_in_words(a) for a in amounts]
+
+
+def test_invoice_words_are_whole_rupees(tmp_path, invoice_data):
+    manager = DocumentManager(use_render_cache=False, use_index=False, output_dir=tmp_path)
+    pdf_bytes = manager.render_document("GoFar Media", "Invoice", invoice_data)  # total 150,000.50
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        text = " ".join(doc[0].get_text().split())
+    assert "Amount in words: One lakh, fifty thousand rupees only" in text
+    assert "paisa" not in text.lower()
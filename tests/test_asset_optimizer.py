@@ -0,0 +1,77 @@
+import random
+
+from PIL import Image
+
+from asset_optimizer import AssetOptimizer
+from pdf_generator import PDFGenerator
+
+
+def _signature(tmp_path, size=(181, 132), border=10):
+    """An RGBA signature: a noisy scanned stroke inside a fully transparent border."""
+    rng = random.Random(0)
+    img = Image.new("RGBA", size, (0, 0, 0, 0))
+    inner = (size[0] - 2 * border, size[1] - 2 * border)
+    ink = Image.frombytes("RGB", inner, bytes(rng.randrange(256) for _ in range(inner[0] * inner[1] * 3)))
+    img.paste(ink, (border, border))
+    path = tmp_path / "signature.png"
+    img.save(path)
+    return str(path)
+
+
+def test_overlay_trims_transparent_border(tmp_path, asset_optimizer):
+    derivative = asset_optimizer.overlay(_signature(tmp_path))
+    assert derivative.size == (181, 132)
+    assert derivative.box == (10, 10, 171, 122)
+    with Image.open(derivative.path) as img:
+        assert img.size == (161, 112)
+
+
+def test_derivatives_are_reused_from_disk(tmp_path):
+    path = _signature(tmp_path)
+    first = AssetOptimizer(cache_dir=tmp_path / "cache").overlay(path)
+    second = AssetOptimizer(cache_dir=tmp_path / "cache").overlay(path)
+    assert first == second
+
+
+def _placed_height(tmp_path, optimizer, path=None):
+    generator = PDFGenerator(assets=optimizer)
+    generator.pdf.add_page()
+    y = generator.pdf.get_y()
+    generator._place_overlay(path or _signature(tmp_path), x=120, w=60)
+    return generator.pdf.get_y() - y
+
+
+def test_overlay_keeps_aspect_ratio_when_optimizing_fails(tmp_path):
+    blocked = tmp_path / "not-a-directory"
+    blocked.write_bytes(b"")
+    unoptimized = AssetOptimizer(cache_dir=blocked)
+    assert unoptimized.overlay(_signature(tmp_path)).size is None
+
+    expected = 60 * 132 / 181
+    assert abs(_placed_height(tmp_path, unoptimized) - expected) < 0.01
+    assert abs(_placed_height(tmp_path, AssetOptimizer(cache_dir=tmp_path / "cache")) - expected) < 0.01
+
+
+def test_compact_overlay_source_is_kept(tmp_path, asset_optimizer):
+    # Already a small palette image with nothing to trim: re-encoding cannot win
+    path = tmp_path / "stamp.png"
+    Image.new("P", (120, 80), 1).save(path, optimize=True)
+    derivative = asset_optimizer.overlay(str(path))
+    assert derivative == (str(path), None, None)
+    assert abs(_placed_height(tmp_path, asset_optimizer, str(path)) - 40) < 0.01
+
+
+def test_letterhead_drops_icc_profile(tmp_path, profiled_png):
+    letterhead = AssetOptimizer(cache_dir=tmp_path / "cache").letterhead(profiled_png)
+    assert letterhead != profiled_png
+    with Image.open(letterhead) as img:
+        assert img.format == "JPEG"
+        assert "icc_profile" not in img.info
+
+
+def test_letterhead_never_upsamples(tmp_path):
+    path = tmp_path / "letterhead.png"
+    Image.new("RGB", (300, 400), "white").save(path)
+    letterhead = AssetOptimizer(cache_dir=tmp_path / "cache").letterhead(str(path))
+    with Image.open(letterhead) as img:
+        assert img.size[0] <= 300 and img.size[1] <= 400
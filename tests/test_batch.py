@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+import batch
+from batch import read_manifest, run_batch
+
+
+def write_jsonl(path, lines):
+    path.write_text("\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n",
+                    encoding="utf-8")
+    return str(path)
+
+
+def test_jsonl_rows_are_normalized(tmp_path, invoice_data):
+    manifest = write_jsonl(tmp_path / "rows.jsonl", [
+        {"company": "GoFar Media", "doc_type": "Invoice", "data": invoice_data},
+        "",
+        # Fields may also sit next to company/doc_type; extras are merged into data
+        {"company": "GoFar Media", "doc_type": "Request Letter", "To": "Bank", "data": {"Subject": "Refund"}},
+    ])
+    rows = list(read_manifest(manifest))
+    assert [row_no for row_no, _ in rows] == [1, 2]
+    assert rows[0][1] == {"company": "GoFar Media", "doc_type": "Invoice", "data": invoice_data}
+    assert rows[1][1]["data"] == {"Subject": "Refund", "To": "Bank"}
+
+
+@pytest.mark.parametrize("line", [
+    "[1, 2]",
+    "{not json",
+    json.dumps({"doc_type": "Invoice", "data": {}}),
+    json.dumps({"company": "GoFar Media", "doc_type": "Invoice", "data": [1]}),
+])
+def test_bad_jsonl_rows_are_reported_not_raised(tmp_path, line):
+    manifest = write_jsonl(tmp_path / "rows.jsonl", [line])
+    [(row_no, error)] = list(read_manifest(manifest))
+    assert row_no == 1
+    assert isinstance(error, ValueError)
+
+
+def test_csv_rows_parse_json_columns(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text(
+        "company,doc_type,Employee Name,Earnings,Deductions\n"
+        'GoFar Media,Salary Slip,Ali,"[{""Particulars"": ""Basic"", ""Amount"": ""100""}]",\n'
+        "GoFar Media,Salary Slip,Sara,[,[]\n"
+        "GoFar Media,Salary Slip,Omar,[],[],extra\n",
+        encoding="utf-8"
+    )
+    rows = list(read_manifest(str(path)))
+    assert rows[0] == (1, {"company": "GoFar Media", "doc_type": "Salary Slip", "data": {
+        "Employee Name": "Ali", "Earnings": [{"Particulars": "Basic", "Amount": "100"}], "Deductions": []}})
+    assert isinstance(rows[1][1], ValueError)
+    assert isinstance(rows[2][1], ValueError)
+
+
+def test_run_batch_reports_every_row(tmp_path, invoice_data, salary_data):
+    manifest = write_jsonl(tmp_path / "rows.jsonl", [
+        {"company": "GoFar Media", "doc_type": "Invoice", "data": invoice_data},
+        {"company": "GoFar Media", "doc_type": "Salary Slip", "data": salary_data},
+        {"company": "GoFar Media", "doc_type": "Invoice", "data": {"M/s": "missing fields"}},
+        "[1, 2]",
+    ])
+    report = tmp_path / "report.jsonl"
+    output_dir = tmp_path / "out"
+
+    counts = run_batch(manifest, str(report), workers=2, output_dir=output_dir)
+
+    assert counts == {"ok": 2, "error": 2}
+    results = sorted((json.loads(line) for line in report.read_text(encoding="utf-8").splitlines()),
+                     key=lambda result: result["row"])
+    assert [result["status"] for result in results] == ["ok", "ok", "error", "error"]
+    assert "InvalidDataError" in results[2]["error"]
+    assert results[3]["error"].startswith("Invalid manifest row")
+    paths = {result["path"] for result in results[:2]}
+    assert len(paths) == 2
+    assert all(path.startswith(str(output_dir)) and path.endswith(".pdf") for path in paths)
+    assert sorted(p.name for p in output_dir.glob("*.pdf")) == sorted(p.rsplit("/", 1)[1] for p in paths)
+
+
+def test_main_exit_status_reflects_failures(tmp_path, invoice_data):
+    report = tmp_path / "report.jsonl"
+    args = ["--report", str(report), "--workers", "1", "--output-dir", str(tmp_path / "out")]
+    good = write_jsonl(tmp_path / "good.jsonl", [{"company": "GoFar Media", "doc_type": "Invoice", "data": invoice_data}])
+    assert batch.main([good] + args) == 0
+    bad = write_jsonl(tmp_path / "bad.jsonl", [{"company": "Nobody", "doc_type": "Invoice", "data": invoice_data}])
+    assert batch.main([bad] + args) == 1
+    assert "FileNotFoundError" in json.loads(report.read_text(encoding="utf-8"))["error"]
@@ -0,0 +1,42 @@
+import os
+
+import fitz
+
+from batch_sign import collect_inputs, output_paths, sign_all
+from signing import save_preset
+
+
+def _pdf(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = fitz.open()
+    doc.new_page()
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_clashing_names_are_numbered(tmp_path):
+    inputs = [str(tmp_path / "a" / "Invoice.pdf"), str(tmp_path / "b" / "Invoice.pdf"),
+              str(tmp_path / "c" / "invoice.pdf"), str(tmp_path / "a" / "Invoice_2.pdf")]
+    names = [os.path.basename(path) for path in output_paths(inputs, "out").values()]
+    assert names == ["Invoice_signed.pdf", "Invoice_2_signed.pdf", "invoice_3_signed.pdf", "Invoice_2_2_signed.pdf"]
+    assert len({name.lower() for name in names}) == len(names)
+
+
+def test_collect_inputs_skips_signed_copies(tmp_path):
+    _pdf(tmp_path / "one.pdf")
+    _pdf(tmp_path / "one_signed.pdf")
+    (tmp_path / "notes.txt").write_text("x")
+    assert collect_inputs([str(tmp_path / "*")]) == [str(tmp_path / "one.pdf")]
+
+
+def test_same_named_inputs_are_all_signed(tmp_path, stamp):
+    preset = tmp_path / "preset.json"
+    save_preset(str(preset), [{"image": stamp, "page": 0, "rect": [10, 10, 60, 60], "rotation": 0}])
+    _pdf(tmp_path / "jan" / "Invoice.pdf")
+    _pdf(tmp_path / "feb" / "Invoice.pdf")
+    inputs = collect_inputs([str(tmp_path / "jan" / "*.pdf"), str(tmp_path / "feb" / "*.pdf")])
+    out_dir = tmp_path / "signed"
+
+    assert sign_all(str(preset), inputs, str(out_dir), workers=1) == {"ok": 2, "error": 0}
+    assert sorted(path.name for path in out_dir.iterdir()) == ["Invoice_2_signed.pdf", "Invoice_signed.pdf"]
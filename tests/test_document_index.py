@@ -0,0 +1,82 @@
+import pytest
+
+from document_index import DocumentIndex, normalize_date
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2025-08-05", "2025-08-05"),
+    ("2025-08-01", "2025-08-01"),
+    ("2025/08/01", "2025-08-01"),
+    ("05/08/2025", "2025-08-05"),
+    ("5-8-2025", "2025-08-05"),
+    ("October 2025", "2025-10-01"),
+    ("", None),
+    (None, None),
+    ("not a date", None),
+])
+def test_normalize_date(text, expected):
+    assert normalize_date(text) == expected
+
+
+@pytest.mark.parametrize("text", ["August", "5 August", "29 Feb"])
+def test_normalize_date_without_year_is_unknown(text):
+    assert normalize_date(text) is None
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = DocumentIndex(tmp_path / "index.sqlite3")
+    yield index
+    index.close()
+
+
+def _add(index, path, number, party, day, total, doc_type="Invoice", tax=None):
+    index.add("GoFar Media", doc_type, path, "0" * 64, 100,
+              [{"number": number, "party": party, "date": day, "total": total, "tax": tax}])
+
+
+def test_search_by_number_party_and_text(index):
+    _add(index, "/a.pdf", "1043", "ABC Traders", "2025-08-05", 100.0)
+    _add(index, "/b.pdf", "2001", "abc_x Ltd", "2025-09-01", 50.0)
+    _add(index, "/c.pdf", "3000", "Zeta", "2025-09-02", 25.0)
+
+    assert [r["path"] for r in index.search(number="1043")] == ["/a.pdf"]
+    assert {r["path"] for r in index.search(party="abc")} == {"/a.pdf", "/b.pdf"}
+    # LIKE wildcards in the query are literal
+    assert [r["path"] for r in index.search(party="abc_")] == ["/b.pdf"]
+    assert [r["path"] for r in index.search(text="00")] == ["/c.pdf", "/b.pdf"]
+    assert [r["doc_date"] for r in index.search(number="1043")] == ["2025-08-05"]
+
+
+def test_date_filters_and_month_totals(index):
+    _add(index, "/a.pdf", "1", "A", "2025-08-05", 100.0, tax=10.0)
+    _add(index, "/b.pdf", "2", "B", "2025-08-31", 50.0)
+    _add(index, "/c.pdf", "3", "C", "2025-09-01", 25.0)
+
+    assert {r["path"] for r in index.search(since="2025-08-01", until="2025-08-31")} == {"/a.pdf", "/b.pdf"}
+    totals = {row["grp"]: (row["documents"], row["total"], row["tax"]) for row in index.totals("month")}
+    assert totals == {"2025-08": (2, 150.0, 10.0), "2025-09": (1, 25.0, 0)}
+    with pytest.raises(ValueError):
+        index.totals("weekday")
+
+
+def test_dates_without_a_year_keep_their_text_only(index):
+    _add(index, "/slip.pdf", "E-7", "Ali", "August", 100.0, doc_type="Salary Slip")
+    [row] = index.search(number="E-7")
+    assert (row["doc_date"], row["date_text"]) == (None, "August")
+    assert index.search(since="2000-01-01") == []
+
+
+def test_bundle_records_and_reindexing(index):
+    index.add("GoFar Media", "Invoice", "/bundle.pdf", "f" * 64, 10, [{"number": "1"}, {"number": "2"}])
+    index.add("GoFar Media", "Invoice", "/bundle.pdf", "f" * 64, 10, [{"number": "1"}, {"number": "2"}])
+    assert sorted(r["record"] for r in index.find_by_hash("f" * 64)) == [0, 1]
+
+
+def test_prune_missing(index, tmp_path):
+    kept = tmp_path / "kept.pdf"
+    kept.write_bytes(b"%PDF")
+    _add(index, str(kept), "1", "A", "2025-08-05", 1.0)
+    _add(index, str(tmp_path / "gone.pdf"), "2", "B", "2025-08-05", 1.0)
+    assert index.prune_missing() == 1
+    assert [r["path"] for r in index.search()] == [str(kept)]
@@ -0,0 +1,54 @@
+from fpdf.enums import XPos, YPos
+
+from fonts import FontLibrary
+from pdf_generator import DocumentPDF
+
+
+def _render(library, lines):
+    pdf = DocumentPDF(fonts=library)
+    pdf.add_page()
+    for style, text in lines:
+        pdf.set_font("Arial", style, 12)
+        pdf.cell(0, 10, text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    return bytes(pdf.output())
+
+
+def _subsets(library):
+    return sorted(library.cache_dir.glob("*.ttf"))
+
+
+def test_arial_is_replaced_by_the_installed_family(tmp_path, font_dir):
+    library = FontLibrary(font_dir, tmp_path / "cache")
+    assert library.text_family() == "TestSans"
+    assert b"/FontFile2" in _render(library, [("", "Hello")])
+
+
+def test_missing_styles_embed_the_regular_face_once(tmp_path, font_dir):
+    library = FontLibrary(font_dir, tmp_path / "cache")
+    pdf_bytes = _render(library, [("", "Regular"), ("B", "Bold"), ("BI", "Bold italic"), ("BU", "Underlined")])
+    assert pdf_bytes.count(b"/FontFile2") == 1
+
+
+def test_documents_in_the_same_blocks_share_a_subset(tmp_path, font_dir):
+    library = FontLibrary(font_dir, tmp_path / "cache")
+    _render(library, [("", "café")])
+    _render(library, [("", "mañana")])
+    assert len(_subsets(library)) == 1
+    _render(library, [("", "روپے")])
+    assert len(_subsets(library)) == 2
+
+
+def test_subsets_are_reused_from_disk_by_a_new_library(tmp_path, font_dir):
+    first = _render(FontLibrary(font_dir, tmp_path / "cache"), [("", "café")])
+    second = _render(FontLibrary(font_dir, tmp_path / "cache"), [("", "café")])
+    assert len(_subsets(FontLibrary(font_dir, tmp_path / "cache"))) == 1
+    assert first.count(b"/FontFile2") == second.count(b"/FontFile2") == 1
+
+
+def test_cache_is_pruned_to_max_bytes(tmp_path, font_dir):
+    library = FontLibrary(font_dir, tmp_path / "cache", max_cache_bytes=1)
+    _render(library, [("", "café")])
+    # Rendering again after the subset was pruned rebuilds it
+    _render(library, [("", "رو")])
+    assert len(_subsets(library)) == 1
+    assert b"/FontFile2" in _render(library, [("", "café")])
@@ -0,0 +1,35 @@
+import pytest
+
+from formatting import INDIAN, AmountFormatter, format_amount, format_whole_amount, parse_amount
+
+
+def test_shared_formatters():
+    assert format_amount(1234567.5) == "1,234,567.50"
+    assert format_whole_amount(1234567.5) == "1,234,568"
+
+
+@pytest.mark.parametrize("amount, text", [
+    (999, "999.00"),
+    (1000, "1,000.00"),
+    (100000, "1,00,000.00"),
+    (-123456789, "-12,34,56,789.00"),
+])
+def test_indian_grouping(amount, text):
+    assert AmountFormatter(INDIAN)(amount) == text
+
+
+def test_prefix_and_suffix():
+    assert AmountFormatter(INDIAN, decimals=0, prefix="Rs. ", suffix="/-")(150000) == "Rs. 1,50,000/-"
+
+
+def test_unknown_grouping_is_rejected():
+    with pytest.raises(ValueError):
+        AmountFormatter("french")
+
+
+def test_parse_amount():
+    assert parse_amount(" 1,50,000.50 ") == 150000.5
+    assert parse_amount(42) == 42.0
+    assert parse_amount("abc") == 0.0
+    assert parse_amount("abc", default=15) == 15
+    assert parse_amount(None) == 0.0
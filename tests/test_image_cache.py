@@ -0,0 +1,39 @@
+from fpdf import FPDF
+
+from image_cache import ImageCache
+
+
+def _render(cache, path):
+    pdf = FPDF()
+    pdf.add_page()
+    cache.image(pdf, path, x=10, y=10, w=40)
+    return bytes(pdf.output())
+
+
+def test_decodes_once_and_reuses(tmp_path, profiled_png):
+    cache = ImageCache()
+    first = _render(cache, profiled_png)
+    second = _render(cache, profiled_png)
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert first.count(b"/XObject") == second.count(b"/XObject")
+
+
+def test_icc_profile_survives_cache_hits(profiled_png):
+    cache = ImageCache()
+    for _ in range(3):
+        assert b"/ICCBased" in _render(cache, profiled_png)
+
+
+def test_changed_file_is_decoded_again(tmp_path, profiled_png):
+    cache = ImageCache()
+    _render(cache, profiled_png)
+    path = tmp_path / "profiled.png"
+    path.write_bytes(path.read_bytes() + b"\0")
+    _render(cache, str(path))
+    assert cache.misses == 2
+
+
+def test_evicts_to_fit_max_bytes(tmp_path, profiled_png):
+    cache = ImageCache(max_bytes=1)
+    _render(cache, profiled_png)
+    assert cache.total_bytes == 0
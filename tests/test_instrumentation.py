@@ -0,0 +1,92 @@
+import io
+import json
+
+from document_manager import DocumentManager
+from instrumentation import PHASES, NullRecorder, Recorder
+
+
+def test_spans_and_counters_accumulate_per_document():
+    recorder = Recorder()
+    with recorder.document(company="A", doc_type="Invoice") as record:
+        with recorder.span("content"):
+            pass
+        with recorder.span("content"):
+            pass
+        with recorder.span("output"):
+            pass
+        recorder.count("pages", 2)
+        recorder.count("pages")
+    assert recorder.records == [record]
+    assert record["company"] == "A" and record["doc_type"] == "Invoice"
+    assert set(record["spans"]) == {"content", "output"}
+    assert record["counters"] == {"pages": 3}
+    assert record["total"] >= sum(record["spans"].values())
+
+
+def test_nested_documents_join_the_open_record():
+    recorder = Recorder()
+    with recorder.document(company="A") as outer:
+        with recorder.document(company="ignored") as inner:
+            with recorder.span("content"):
+                pass
+        with recorder.span("write"):
+            pass
+    assert inner is outer
+    assert len(recorder.records) == 1
+    assert outer["company"] == "A"
+    assert set(outer["spans"]) == {"content", "write"}
+
+
+def test_spans_outside_a_document_are_dropped():
+    recorder = Recorder()
+    with recorder.span("content"):
+        recorder.count("pages")
+    assert recorder.records == []
+
+
+def test_summary_orders_known_phases_first_and_exports_jsonl():
+    recorder = Recorder()
+    for _ in range(3):
+        with recorder.document():
+            for name in ("custom", "output", "letterhead"):
+                with recorder.span(name):
+                    pass
+    summary = recorder.summary()
+    assert list(summary) == ["letterhead", "output", "custom", "total"]
+    assert all(row["documents"] == 3 for row in summary.values())
+    assert recorder.format_table().splitlines()[0].startswith("phase")
+
+    out = io.StringIO()
+    recorder.write_jsonl(out)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == recorder.records
+
+
+def test_null_recorder_records_nothing():
+    recorder = NullRecorder()
+    with recorder.document(company="A") as record:
+        with recorder.span("content"):
+            recorder.count("pages")
+    assert record is None
+    assert not recorder.enabled
+
+
+def test_bundle_records_one_document_with_every_phase(tmp_path, invoice_data):
+    recorder = Recorder()
+    manager = DocumentManager(use_render_cache=False, recorder=recorder, use_index=False, output_dir=tmp_path)
+    manager.render_bundle("GoFar Media", "Invoice", [invoice_data, invoice_data])
+
+    [record] = recorder.records
+    assert (record["company"], record["doc_type"], record["records"]) == ("GoFar Media", "Invoice", 2)
+    assert {"template_import", "letterhead", "content", "signature", "output"} <= set(record["spans"])
+    assert set(record["spans"]) <= set(PHASES)
+    assert record["counters"]["pages"] == 2
+
+
+def test_generate_document_adds_write_and_index_to_the_render_record(tmp_path, invoice_data):
+    recorder = Recorder()
+    manager = DocumentManager(use_render_cache=False, recorder=recorder, output_dir=tmp_path)
+    manager.generate_document("GoFar Media", "Invoice", invoice_data)
+
+    [record] = recorder.records
+    assert {"content", "write", "index"} <= set(record["spans"])
+    assert record["counters"]["output_bytes"] > 0
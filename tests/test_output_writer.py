@@ -0,0 +1,87 @@
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+import output_writer
+from output_writer import OutputWriter, write_atomic
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    class FrozenDatetime:
+        @staticmethod
+        def now():
+            return datetime(2025, 8, 15, 12, 30, 45, 123456)
+
+    monkeypatch.setattr(output_writer, "datetime", FrozenDatetime)
+
+
+@pytest.fixture
+def umask():
+    def set_umask(mask):
+        previous.append(os.umask(mask))
+
+    previous = []
+    yield set_umask
+    if previous:
+        os.umask(previous[0])
+
+
+def _names(directory):
+    return sorted(path.name for path in directory.iterdir())
+
+
+def test_clashing_names_get_a_sequence_suffix(tmp_path, frozen_clock):
+    writer = OutputWriter(tmp_path)
+    paths = [writer.write_bytes("Doc", str(n).encode()) for n in range(3)]
+    assert [p.name for p in paths] == [
+        "Doc_20250815_123045_123456.pdf",
+        "Doc_20250815_123045_123456_1.pdf",
+        "Doc_20250815_123045_123456_2.pdf",
+    ]
+    assert [p.read_bytes() for p in paths] == [b"0", b"1", b"2"]
+    # No temp files are left behind
+    assert _names(tmp_path) == [p.name for p in paths]
+
+
+def test_publishing_without_hard_links_still_never_overwrites(tmp_path, frozen_clock, monkeypatch):
+    def no_links(*args):
+        raise PermissionError("hard links not supported")
+
+    monkeypatch.setattr(os, "link", no_links)
+    writer = OutputWriter(tmp_path)
+    first = writer.write_bytes("Doc", b"first")
+    second = writer.write_bytes("Doc", b"second")
+    assert first != second
+    assert (first.read_bytes(), second.read_bytes()) == (b"first", b"second")
+    assert _names(tmp_path) == sorted([first.name, second.name])
+
+
+def test_concurrent_writes_lose_nothing(tmp_path, frozen_clock):
+    writer = OutputWriter(tmp_path)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        paths = list(pool.map(lambda n: writer.write_bytes("Doc", str(n).encode()), range(200)))
+    assert len(set(paths)) == 200
+    assert sorted(int(p.read_bytes()) for p in paths) == list(range(200))
+    assert len(_names(tmp_path)) == 200
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+@pytest.mark.parametrize("mask, mode", [(0o022, 0o644), (0o077, 0o600)])
+def test_files_get_the_umask_permissions(tmp_path, umask, mask, mode):
+    umask(mask)
+    path = OutputWriter(tmp_path).write_bytes("Doc", b"x")
+    assert stat.S_IMODE(path.stat().st_mode) == mode
+    write_atomic(tmp_path / "cache.bin", b"y")
+    assert stat.S_IMODE((tmp_path / "cache.bin").stat().st_mode) == mode
+
+
+def test_write_atomic_replaces_existing_file(tmp_path):
+    dest = tmp_path / "entry.json"
+    dest.write_bytes(b"old")
+    write_atomic(dest, b"new")
+    assert dest.read_bytes() == b"new"
+    assert _names(tmp_path) == ["entry.json"]
@@ -0,0 +1,39 @@
+import threading
+
+import pytest
+
+from document_manager import DocumentManager
+from preview import PreviewRenderer
+
+
+@pytest.fixture
+def previewer(tmp_path):
+    renderer = PreviewRenderer(DocumentManager(use_render_cache=False, use_index=False, output_dir=tmp_path), zoom=0.2)
+    yield renderer
+    renderer.shutdown()
+
+
+def test_renders_pages_and_skips_unchanged_requests(previewer, invoice_data):
+    future = previewer.request("GoFar Media", "Invoice", invoice_data)
+    pages = future.result(timeout=60)
+    assert len(pages) == 1 and pages[0].width > 0
+    assert previewer.request("GoFar Media", "Invoice", invoice_data) is None
+
+    previewer.invalidate()
+    assert previewer.request("GoFar Media", "Invoice", invoice_data) is not None
+
+
+def test_newer_request_supersedes_older(previewer, invoice_data):
+    # Hold the worker so both requests are queued behind it
+    release = threading.Event()
+    previewer.executor.submit(release.wait)
+    first = previewer.request("GoFar Media", "Invoice", invoice_data)
+    second = previewer.request("GoFar Media", "Invoice", dict(invoice_data, Campaign="Winter"))
+    release.set()
+    assert first.cancelled()
+    assert len(second.result(timeout=60)) == 1
+
+
+def test_previews_write_no_documents(previewer, invoice_data, tmp_path):
+    previewer.request("GoFar Media", "Invoice", invoice_data).result(timeout=60)
+    assert list(tmp_path.iterdir()) == []
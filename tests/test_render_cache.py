@@ -0,0 +1,47 @@
+import os
+
+from render_cache import RenderCache, file_digest
+
+
+def test_key_is_stable_and_input_sensitive():
+    key = RenderCache.key(company="A", data={"x": 1, "y": [1, 2]})
+    assert key == RenderCache.key(data={"y": [1, 2], "x": 1}, company="A")
+    assert key != RenderCache.key(company="A", data={"x": 2, "y": [1, 2]})
+
+
+def test_get_returns_what_put_stored(tmp_path):
+    cache = RenderCache(tmp_path)
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, b"%PDF-1")
+    assert cache.get("ab" * 32) == b"%PDF-1"
+
+
+def test_put_keeps_the_cache_within_max_bytes(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=250)
+    for n in range(10):
+        cache.put(f"{n:02d}" * 32, b"x" * 100)
+    total = sum(path.stat().st_size for path in tmp_path.glob("*/*.pdf"))
+    assert total <= 250
+    # The newest entry survives
+    assert cache.get("09" * 32) == b"x" * 100
+
+
+def test_prune_removes_least_recently_used_first(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=10 ** 6)
+    for n, key in enumerate(("aa" * 32, "bb" * 32, "cc" * 32)):
+        cache.put(key, b"x" * 100)
+        os.utime(cache._path(key), (n, n))
+    cache.get("aa" * 32)  # marks it recently used
+    cache.max_bytes = 200
+    assert cache.prune() == 1
+    assert cache.get("bb" * 32) is None
+    assert cache.get("aa" * 32) and cache.get("cc" * 32)
+
+
+def test_file_digest(tmp_path):
+    path = tmp_path / "f.bin"
+    path.write_bytes(b"one")
+    first = file_digest(str(path))
+    assert file_digest(None) is None and file_digest(str(tmp_path / "missing")) is None
+    path.write_bytes(b"two!")
+    assert file_digest(str(path)) != first
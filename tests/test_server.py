@@ -0,0 +1,122 @@
+import asyncio
+import json
+import os
+from concurrent.futures import Future
+
+import pytest
+
+import server
+from document_manager import InvalidDataError
+from server import GenerationServer
+
+
+@pytest.fixture(scope="module")
+def generation_server(tmp_path_factory):
+    gen_server = GenerationServer(workers=1, max_queue=2, timeout=60, output_dir=tmp_path_factory.mktemp("server"))
+    # Start the worker up front, as GenerationServer.serve does
+    gen_server.pool.submit(os.getpid).result()
+    yield gen_server
+    gen_server.close()
+
+
+def _request(gen_server, method, path, payload=None):
+    """Send one request through GenerationServer.handle and return (status, body)."""
+    async def run():
+        gen_server.loop = asyncio.get_running_loop()
+        tcp = await asyncio.start_server(gen_server.handle, "127.0.0.1", 0)
+        port = tcp.sockets[0].getsockname()[1]
+        async with tcp:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+            writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        return response
+
+    response = asyncio.run(run())
+    assert response, "connection closed without a response"
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), body
+
+
+def test_renders_numeric_amounts(generation_server, sales_tax_data):
+    sales_tax_data["line_items"][0]["Amount"] = 1000
+    status, body = _request(generation_server, "POST", "/render",
+                            {"company": "GoFar Media", "doc_type": "Sales Tax Invoice", "data": sales_tax_data})
+    assert status == 200
+    assert body.startswith(b"%PDF")
+
+
+def test_renders_numeric_header_fields(generation_server, sales_tax_data):
+    sales_tax_data.update({"Invoice No": 9, "NTN": 12345, "GST Percentage": 15})
+    status, body = _request(generation_server, "POST", "/render",
+                            {"company": "GoFar Media", "doc_type": "Sales Tax Invoice", "data": sales_tax_data})
+    assert status == 200
+    assert body.startswith(b"%PDF")
+
+
+def test_unknown_company_gets_422(generation_server, invoice_data):
+    status, body = _request(generation_server, "POST", "/render",
+                            {"company": "Nobody Ltd", "doc_type": "Invoice", "data": invoice_data})
+    assert status == 422
+    assert "letterhead" in json.loads(body)["error"]
+
+
+def test_malformed_line_items_get_422(generation_server, invoice_data):
+    invoice_data["line_items"] = [5]
+    status, body = _request(generation_server, "POST", "/render",
+                            {"company": "GoFar Media", "doc_type": "Invoice", "data": invoice_data})
+    assert status == 422
+    assert "error" in json.loads(body)
+
+
+@pytest.mark.parametrize("payload, status", [
+    ({"company": "GoFar Media", "doc_type": "Nope", "data": {}}, 400),
+    ({"company": "GoFar Media", "doc_type": "Invoice", "data": []}, 400),
+    ([1, 2], 400),
+])
+def test_bad_requests(generation_server, payload, status):
+    assert _request(generation_server, "POST", "/render", payload)[0] == status
+
+
+def test_routes(generation_server):
+    assert _request(generation_server, "GET", "/health")[0] == 200
+    assert _request(generation_server, "GET", "/render")[0] == 405
+    assert _request(generation_server, "GET", "/missing")[0] == 404
+
+
+def test_unexpected_errors_get_500(generation_server, monkeypatch):
+    async def broken_route(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(generation_server, "_route", broken_route)
+    status, body = _request(generation_server, "GET", "/health")
+    assert status == 500
+    assert json.loads(body) == {"error": "Internal server error"}
+
+
+def test_worker_errors_are_mapped():
+    async def run(exc):
+        gen_server = GenerationServer.__new__(GenerationServer)
+        gen_server.templates = {"Invoice": {}}
+        gen_server._validate = lambda *args: None
+        gen_server.capacity, gen_server.in_flight, gen_server.timeout = 1, 0, 5
+        gen_server.loop = asyncio.get_running_loop()
+
+        class FailingPool:
+            def submit(self, *args):
+                future = Future()
+                future.set_exception(exc)
+                return future
+
+        gen_server.pool = FailingPool()
+        try:
+            await gen_server._render(json.dumps({"company": "c", "doc_type": "Invoice", "data": {}}).encode())
+        except server.HTTPError as e:
+            return e.status
+
+    assert asyncio.run(run(InvalidDataError("x"))) == 422
+    # Template bugs are not the client's fault
+    assert asyncio.run(run(AttributeError("x"))) == 500
+    assert asyncio.run(run(ZeroDivisionError())) == 500
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import fitz
+import pytest
+
+from signing import PresetSigner, image_digest, load_preset, save_preset
+
+
+@pytest.fixture
+def unsigned_pdf(tmp_path):
+    path = tmp_path / "unsigned.pdf"
+    doc = fitz.open()
+    for _ in range(3):
+        doc.new_page()
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_preset_round_trip_uses_relative_paths(tmp_path, stamp):
+    preset = tmp_path / "preset.json"
+    save_preset(str(preset), [{"image": stamp, "page": -1, "rect": [1, 2, 3.456, 4], "rotation": 450}])
+    assert "images/stamp.png" in preset.read_text()
+    assert load_preset(str(preset)) == [
+        {"image": str(Path(stamp).resolve()), "page": -1, "rect": [1.0, 2.0, 3.46, 4.0], "rotation": 90}
+    ]
+
+
+def test_load_preset_rejects_bad_files(tmp_path):
+    preset = tmp_path / "preset.json"
+    preset.write_text('{"version": 1, "placements": []}')
+    with pytest.raises(ValueError):
+        load_preset(str(preset))
+    preset.write_text('{"version": 2, "placements": []}')
+    with pytest.raises(ValueError):
+        load_preset(str(preset))
+
+
+def test_sign_embeds_each_image_once_compressed(tmp_path, stamp, unsigned_pdf):
+    placements = [{"image": stamp, "page": page, "rect": [100, 100, 200, 200], "rotation": 0} for page in (0, 1, -1)]
+    signed = tmp_path / "signed.pdf"
+    PresetSigner(placements).sign(unsigned_pdf, str(signed))
+
+    doc = fitz.open(str(signed))
+    xrefs = {image[0] for page in doc for image in page.get_images()}
+    assert len(xrefs) == 1
+    assert all(page.get_images() for page in doc)
+    # The embedded image is Flate-compressed rather than raw samples
+    assert "FlateDecode" in doc.xref_object(next(iter(xrefs)))
+    doc.close()
+    assert signed.stat().st_size < 300 * 300 * 3
+
+
+def test_sign_rejects_pages_out_of_range(tmp_path, stamp, unsigned_pdf):
+    signer = PresetSigner([{"image": stamp, "page": 3, "rect": [0, 0, 10, 10], "rotation": 0}])
+    with pytest.raises(ValueError):
+        signer.sign(unsigned_pdf, str(tmp_path / "signed.pdf"))
+    assert not (tmp_path / "signed.pdf").exists()
+
+
+def test_image_digest_depends_on_content(tmp_path, stamp):
+    copy = tmp_path / "copy.png"
+    copy.write_bytes(open(stamp, "rb").read())
+    assert image_digest(stamp) == image_digest(str(copy))
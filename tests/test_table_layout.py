@@ -0,0 +1,99 @@
+import pytest
+from fpdf import FPDF
+
+from pdf_generator import BOTTOM_MARGIN, PDFGenerator
+from table_layout import Column, Table
+from template_registry import TemplateRegistry
+
+
+class CountingTable(Table):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.header_pages = []
+
+    def draw_header(self):
+        self.header_pages.append(self.pdf.page)
+        super().draw_header()
+
+
+def make_pdf():
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    return pdf
+
+
+def make_table(pdf, **kwargs):
+    return CountingTable(pdf, [Column("Item", 60), Column("Amount", 30, align="R")], font=("Helvetica", 10),
+                         header_font=("Helvetica", "B", 10), **kwargs)
+
+
+def test_row_height_follows_the_tallest_cell():
+    pdf = make_pdf()
+    table = make_table(pdf, line_height=5, min_row_height=8)
+    pdf.set_font("Helvetica", "", 10)
+    assert table.measure(["short", "1"])[1] == 8
+    lines, height = table.measure(["word " * 40, "1"])
+    assert len(lines[0]) > 2
+    assert height == len(lines[0]) * 5
+
+
+def test_rows_paginate_and_repeat_headers():
+    pdf = make_pdf()
+    table = make_table(pdf)
+    for n in range(80):
+        table.add_row([f"Row {n}", str(n)])
+    table.close()
+    assert pdf.page > 1
+    assert table.header_pages == list(range(1, pdf.page + 1))
+    # No row was split by fpdf's own page break
+    assert pdf.get_y() <= pdf.page_break_trigger
+
+
+def test_row_taller_than_a_page_is_drawn_once_on_a_fresh_page():
+    pdf = make_pdf()
+    table = make_table(pdf)
+    table.add_row(["first", "1"])
+    table.add_row(["word " * 2000, "2"])
+    assert pdf.page == 2
+    assert table.header_pages == [1, 2]
+
+
+def test_blank_rows_stop_at_the_page_break():
+    pdf = make_pdf()
+    table = make_table(pdf, min_row_height=10)
+    table.add_blank_rows(100)
+    assert pdf.page == 1
+    assert pdf.get_y() <= pdf.page_break_trigger
+
+
+def test_empty_table_still_shows_headers():
+    pdf = make_pdf()
+    table = make_table(pdf)
+    table.close()
+    assert table.header_pages == [1]
+
+
+@pytest.mark.parametrize("doc_type, data", [
+    ("Invoice", "invoice_data"),
+    ("Salary Slip", "salary_data"),
+])
+def test_long_documents_keep_rows_above_the_letterhead_footer(monkeypatch, request, doc_type, data):
+    data = dict(request.getfixturevalue(data))
+    if doc_type == "Invoice":
+        data["line_items"] = data["line_items"] * 40
+    else:
+        data["Earnings"] = data["Earnings"] * 40
+        data["Deductions"] = data["Deductions"] * 40
+    bottoms = []
+    draw_row = Table._draw_row
+
+    def record(self, lines, height, aligns=None):
+        bottoms.append(self.pdf.get_y() + height)
+        draw_row(self, lines, height, aligns)
+
+    monkeypatch.setattr(Table, "_draw_row", record)
+    generator = PDFGenerator()
+    generator.render("GoFar Media", doc_type, TemplateRegistry()[doc_type], None, data)
+    assert generator.pdf.page > 1
+    assert max(bottoms) <= 297 - BOTTOM_MARGIN
@@ -0,0 +1,36 @@
+import json
+
+from template_registry import MANIFEST_PATH, TemplateRegistry, build_manifest, load_manifest
+
+
+def test_tracked_manifest_is_current(tmp_path):
+    cached = tmp_path / "cache" / "manifest.json"
+    assert load_manifest(cached_path=cached) == json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    assert not cached.exists()
+
+
+def test_stale_manifest_is_rebuilt_into_the_cache_only(tmp_path):
+    tracked = tmp_path / "manifest.json"
+    stale = json.loads(json.dumps(build_manifest()))
+    for info in stale["templates"].values():
+        info["digest"] = "0" * 40
+    tracked.write_text(json.dumps(stale), encoding="utf-8")
+    cached = tmp_path / "cache" / "manifest.json"
+
+    registry = TemplateRegistry(manifest_path=tracked, cached_path=cached)
+    assert "Invoice" in registry
+    assert json.loads(tracked.read_text(encoding="utf-8")) == stale
+    assert json.loads(cached.read_text(encoding="utf-8")) == json.loads(json.dumps(build_manifest()))
+
+    # The next process reads the cached rebuild instead of importing every template again
+    cached_text = cached.read_text(encoding="utf-8")
+    TemplateRegistry(manifest_path=tracked, cached_path=cached)
+    assert cached.read_text(encoding="utf-8") == cached_text
+
+
+def test_registry_lists_schemas_and_loads_classes():
+    registry = TemplateRegistry()
+    assert set(registry) == {"Invoice", "Request Letter", "Salary Slip", "Sales Tax Invoice"}
+    assert ("Invoice No", "text") in [tuple(field) for field in registry["Invoice"]["header_fields"]]
+    assert registry.get_template_class("Invoice").template_type == "Invoice"
+    assert registry.get_template_class("Nope") is None
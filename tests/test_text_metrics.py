@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from fpdf import FPDF
+
+from text_metrics import TextMetrics
+
+
+def make_pdf(style="", size=10):
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", style, size)
+    return pdf
+
+
+def test_hits_and_misses():
+    metrics = TextMetrics()
+    pdf = make_pdf()
+    width = metrics.string_width(pdf, "Invoice No:")
+    assert width == pdf.get_string_width("Invoice No:")
+    assert metrics.string_width(pdf, "Invoice No:") == width
+    assert (metrics.hits, metrics.misses) == (1, 1)
+
+    metrics.clear()
+    assert (metrics.hits, metrics.misses) == (0, 0)
+    metrics.string_width(pdf, "Invoice No:")
+    assert metrics.misses == 1
+
+
+def test_font_style_and_size_are_part_of_the_key():
+    metrics = TextMetrics()
+    text = "Amount in words"
+    regular = metrics.string_width(make_pdf(), text)
+    bold = metrics.string_width(make_pdf("B"), text)
+    large = metrics.string_width(make_pdf(size=14), text)
+    assert bold == make_pdf("B").get_string_width(text) != regular
+    assert large == make_pdf(size=14).get_string_width(text) != regular
+    assert metrics.misses == 3
+
+
+def test_split_lines_match_multi_cell():
+    metrics = TextMetrics()
+    pdf = make_pdf()
+    for text in ["short", "a long description " * 8, "first\nsecond"]:
+        expected = pdf.multi_cell(40, txt=text, dry_run=True, output="LINES")
+        assert list(metrics.split_lines(pdf, text, 40)) == expected
+    # The same text wraps differently in another width
+    assert metrics.split_lines(pdf, "a long description " * 8, 80) != metrics.split_lines(pdf, "a long description " * 8, 40)
+
+
+def test_oldest_entries_are_evicted_first():
+    metrics = TextMetrics(max_entries=2)
+    pdf = make_pdf()
+    for text in ["a", "b", "c"]:
+        metrics.string_width(pdf, text)
+    assert len(metrics._entries) == 2
+    metrics.string_width(pdf, "c")
+    assert metrics.hits == 1
+    metrics.string_width(pdf, "a")
+    assert metrics.misses == 4
+
+
+def test_shared_between_threads_stays_bounded():
+    metrics = TextMetrics(max_entries=50)
+
+    def measure(n):
+        pdf = make_pdf()
+        return [metrics.string_width(pdf, f"label {i}") for i in range(n, n + 200)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(measure, range(0, 400, 10)))
+    assert len(metrics._entries) <= 50
+    assert metrics.hits + metrics.misses == sum(len(widths) for widths in results)